@@ -0,0 +1,50 @@
+"""
+Cold-start benchmark for `tox build`.
+
+Spawns a fresh interpreter per build (like the `test`, `euler` and `examples` runners do)
+and compares loading the shipped lexer/parser tables against regenerating them,
+which is what happens on every build when the tables are missing or not writable.
+
+Usage: python bench/cold_start.py [-n RUNS] [files...]
+"""
+import glob
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BUILD = "import sys; from tox.cli import cli; cli()"
+REGENERATE = "import sys; sys.modules['tox.lexing._lextab'] = None; sys.modules['tox.parsing._parsetab'] = None; " + BUILD
+
+def time_builds(code: str, files, runs: int) -> float:
+    """
+    Return the mean wall time in seconds of one `tox build` process.
+    """
+    out = os.path.join(tempfile.mkdtemp(), "out.vms")
+    start = time.perf_counter()
+    for _ in range(runs):
+        for file in files:
+            subprocess.run([sys.executable, "-c", code, "build", file, "-o", out], cwd=ROOT, check=True, stderr=subprocess.DEVNULL)
+    return (time.perf_counter() - start) / (runs * len(files))
+
+def main():
+    args = sys.argv[1:]
+    runs = 5
+    if "-n" in args:
+        runs = int(args[args.index("-n") + 1])
+        del args[args.index("-n"):args.index("-n") + 2]
+    files = args or sorted(glob.glob(os.path.join(ROOT, "examples", "*.tox")))
+    files = [f for f in files if not open(f).read().startswith("//SKIP")]
+
+    regenerated = time_builds(REGENERATE, files, runs)
+    shipped = time_builds(BUILD, files, runs)
+    print(f"files: {len(files)}  runs: {runs}")
+    print(f"regenerated tables: {regenerated*1000:8.1f} ms/build")
+    print(f"shipped tables:     {shipped*1000:8.1f} ms/build")
+    print(f"speedup:            {regenerated/shipped:8.2f}x")
+
+if __name__ == "__main__":
+    main()
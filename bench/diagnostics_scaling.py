@@ -0,0 +1,38 @@
+"""
+Scaling check for diagnostics.
+
+Compiles synthetic programs of growing size in which every statement produces a warning and a
+note, and reports the time per diagnostic. Locating a diagnostic in the source must not depend
+on the length of the program, so the time per diagnostic must stay roughly flat.
+
+Usage: python bench/diagnostics_scaling.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tox.parsing._compiler import compile_source
+
+SIZES = [1000, 4000, 16000]
+
+def unused_returns(n: int) -> str:
+    calls = "\n".join(f"    f({i})" for i in range(n))
+    return f"func f(a: int) -> int {{\n    return a\n}}\n\nfunc main() {{\n{calls}\n}}\n"
+
+def main():
+    per_diagnostic = []
+    for n in SIZES:
+        source = unused_returns(n)
+        start = time.perf_counter()
+        result = compile_source(source)
+        elapsed = time.perf_counter() - start
+        per_diagnostic.append(elapsed / len(result.diagnostics))
+        print(f"lines: {source.count(chr(10)):6}  diagnostics: {len(result.diagnostics):6}  compile: {elapsed:6.2f} s  per diagnostic: {per_diagnostic[-1]*1e6:7.1f} us")
+    flat = per_diagnostic[-1] < 2 * per_diagnostic[0]
+    print("time per diagnostic is flat" if flat else "time per diagnostic grows with program length")
+    sys.exit(0 if flat else 1)
+
+if __name__ == "__main__":
+    main()
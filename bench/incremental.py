@@ -0,0 +1,47 @@
+"""
+Incremental rebuild benchmark.
+
+Builds a synthetic program with many functions, edits the body of one of them and compares
+recompiling the whole program with an incremental build that reuses the unchanged functions.
+That both builds generate the same code is checked by test/test_incremental.py.
+
+Usage: python bench/incremental.py [-n FUNCTIONS]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tox.parsing._compiler import compile_source
+from tox.parsing._incremental import compile_incremental
+
+def program(n: int, edited: int = -1) -> str:
+    funcs = []
+    for i in range(n):
+        extra = " + 1" if i == edited else ""
+        funcs.append(f"func f{i}(a: int) -> int {{\n    s: int = 0\n    for(j: int = 0; j < a; j = j + 1) {{\n        if j % 2 == 0 {{ s = s + j{extra} }} else {{ s = s - g }}\n    }}\n    return s\n}}")
+    calls = " + ".join(f"f{i}(3)" for i in range(0, n, max(1, n // 10)))
+    return "g: int = 1\n\n" + "\n\n".join(funcs) + f"\n\nfunc main() {{\n    print({calls}, \"\\n\")\n}}\n"
+
+def main():
+    args = sys.argv[1:]
+    n = int(args[args.index("-n") + 1]) if "-n" in args else 500
+
+    _, record = compile_incremental(program(n))
+    edited = program(n, edited=n // 2)
+
+    start = time.perf_counter()
+    compile_source(edited)
+    full_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    incremental, record = compile_incremental(edited, record=record)
+    incremental_time = time.perf_counter() - start
+
+    print(f"{n} functions, one edited")
+    print(f"full rebuild:        {full_time*1000:8.1f} ms")
+    print(f"incremental rebuild: {incremental_time*1000:8.1f} ms  ({record['compiled']} compiled, {record['reused']} reused)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Lexer throughput benchmark.
+
+Reports the tokens per second of the hand written lexer and of the PLY lexer on large synthetic
+sources, and the time both take to skip a large multiline comment. That they produce the same
+tokens is checked by test/test_lexer.py.
+
+Usage: python bench/lexer_throughput.py [-n LINES]
+"""
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from tox.lexing._lexer import get_lexer, get_ply_lexer
+
+def synthetic(lines: int) -> str:
+    chunk = """/* function
+   number {i} */
+func f{i}(a: int, b: float) -> int {{
+    // single line comment {{ with braces }}
+    s: vec<int> = [1 ... 10]
+    if a >= 10 && b != 2.5f || a <= -3 {{ print("a /* not a comment */ {{", a, "\\n") }}
+    x: float = 3.14 * 2f / (float) a
+    while a > 0 {{ a = a - 1 }}
+    return a % 3 == 0
+}}
+"""
+    return "".join(chunk.format(i=i) for i in range(lines // chunk.count("\n") + 1))
+
+def throughput(lexer, source: str):
+    lexer.lineno = 1
+    lexer.input(source)
+    token = lexer.token
+    count = 0
+    start = time.perf_counter()
+    while token() is not None:
+        count += 1
+    return count, time.perf_counter() - start
+
+def main():
+    args = sys.argv[1:]
+    lines = int(args[args.index("-n") + 1]) if "-n" in args else 100000
+
+    source = synthetic(lines)
+    count, ply_time = throughput(get_ply_lexer(), source)
+    _, new_time = throughput(get_lexer(), source)
+    print(f"{source.count(chr(10))} lines, {count} tokens")
+    print(f"PLY lexer:          {count / ply_time / 1e6:6.2f} M tokens/s")
+    print(f"hand written lexer: {count / new_time / 1e6:6.2f} M tokens/s  ({ply_time / new_time:.1f}x)")
+
+    comment = "/*" + "*\n" * 200000 + "*/ x"
+    _, ply_time = throughput(get_ply_lexer(), comment)
+    _, new_time = throughput(get_lexer(), comment)
+    print(f"200000 line comment: PLY {ply_time*1000:.1f} ms, hand written {new_time*1000:.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Scaling check for statement, function and global declaration lists.
+
+Parses synthetic programs of growing size and records the deepest parser stack seen while
+reducing statements, functions and global declarations. The depth must not grow with the
+length of the program.
+
+Usage: python bench/list_scaling.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tox.parsing._compiler import CompilationContext
+
+SIZES = [1000, 10000, 100000]
+
+max_depth = 0
+
+def track_depth(handler):
+    """
+    Wrap a semantic handler so that it records the parser stack depth whenever it is called.
+    """
+    handle = handler.handle
+    def wrapper(p, production):
+        global max_depth
+        max_depth = max(max_depth, len(p.stack))
+        return handle(p, production)
+    handler.handle = wrapper
+
+def statements(n: int) -> str:
+    body = "\n".join(f"    x = x + {i % 10}" for i in range(n))
+    return f"func main() {{\n    x: int = 0\n{body}\n    print(x)\n}}\n"
+
+def functions(n: int) -> str:
+    funcs = "\n".join(f"func f{i}(a: int) -> int {{\n    return a + {i}\n}}" for i in range(n // 10))
+    return f"{funcs}\nfunc main() {{\n    print(f0(1))\n}}\n"
+
+def globals_(n: int) -> str:
+    decls = "\n".join(f"g{i}: int = {i}" for i in range(n // 10))
+    return f"{decls}\nfunc main() {{\n    print(g0)\n}}\n"
+
+def main():
+    global max_depth
+    depths = {}
+    for kind, make in (("statements", statements), ("functions", functions), ("globals", globals_)):
+        for n in SIZES:
+            source = make(n)
+            context = CompilationContext()   # Fresh compiler state for every program
+            for handler in (context.assignment_handler, context.functions_handler, context.declaration_assignment_handler):
+                track_depth(handler)
+            max_depth = 0
+            start = time.perf_counter()
+            context.compile(source)
+            elapsed = time.perf_counter() - start
+            depths.setdefault(kind, []).append(max_depth)
+            print(f"{kind:10} lines: {source.count(chr(10)):7}  max stack depth: {max_depth:3}  parse: {elapsed:6.2f} s")
+    bounded = all(len(set(d)) == 1 for d in depths.values())
+    print("stack depth bounded" if bounded else "stack depth grows with program length")
+    sys.exit(0 if bounded else 1)
+
+if __name__ == "__main__":
+    main()
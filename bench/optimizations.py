@@ -0,0 +1,180 @@
+"""
+Optimization benchmark.
+
+Compiles the example and euler programs with each optimization turned off and with every
+optimization on, and compares the number of generated instructions and the time the VM takes
+to run them. Whether the builds print the right output is checked by test/test_optimizations.py.
+
+For the peephole optimizer it also prints how many times each rule was applied.
+For the dead code elimination it also prints what was removed.
+The tail call elimination is also measured on a few recursions DEPTH calls deep.
+
+Usage: python bench/optimizations.py [-n RUNS] [-d DEPTH] [OPTIMIZATION ...]
+"""
+import glob
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from tox.parsing._compiler import compile_source
+from tox.parsing._options import CompileOptions
+
+VMS = os.path.join(ROOT, "vm", "vms")
+
+OFF = {     # What turns off each optimization
+    "fold_constants": False,
+    "propagate_constants": False,
+    "dead_stores": False,
+    "peephole": False,
+    "dead_code": False,
+    "inline_size": 0,
+    "hoisting": False,
+    "common_subexpressions": False,
+    "tail_calls": False,
+}
+
+# Recursions DEPTH calls deep, every one of them a tail call
+RECURSIONS = {
+    "accumulate": """
+func sum(n: int, acc: int) -> int {
+    if n == 0 {
+        return acc
+    }
+    return sum(n - 1, acc + n % 7)
+}
+
+func main() {
+    print(sum(DEPTH, 0), "\\n")
+}
+""",
+    "countdown": """
+count: int = 0
+
+func countdown(n: int) {
+    if n == 0 {
+        return;
+    }
+    step: int = n % 3
+    match step {
+        0 -> {
+            count = count + 1
+        }
+        default -> {}
+    }
+    countdown(n - 1)
+}
+
+func main() {
+    countdown(DEPTH)
+    print(count, "\\n")
+}
+""",
+    "collatz": """
+func steps(n: int, count: int) -> int {
+    if n == 1 {
+        return count
+    }
+    if n % 2 == 0 {
+        return steps(n / 2, count + 1)
+    }
+    return steps(3 * n + 1, count + 1)
+}
+
+func longest(n: int, best: int, start: int) -> int {
+    if n == 0 {
+        return start
+    }
+    length: int = steps(n, 0)
+    if length > best {
+        return longest(n - 1, length, n)
+    }
+    return longest(n - 1, best, start)
+}
+
+func main() {
+    print(longest(DEPTH / 20, 0, 0), "\\n")
+}
+""",
+}
+
+def run(code: str, runs: int) -> float:
+    """
+    The best of `runs` VM run times.
+    """
+    with tempfile.NamedTemporaryFile("w", suffix=".vms", delete=False) as f:
+        f.write(code)
+    try:
+        best = float("inf")
+        for _ in range(runs):
+            start = time.perf_counter()
+            subprocess.run([VMS, f.name], capture_output=True)
+            best = min(best, time.perf_counter() - start)
+    finally:
+        os.remove(f.name)
+    return best
+
+def programs(depth: int):
+    """
+    Name and source of every program that runs without input.
+    """
+    paths = sorted(glob.glob(os.path.join(ROOT, "examples", "*.tox"))) + sorted(glob.glob(os.path.join(ROOT, "euler", "problem*", "*.tox")))
+    for path in paths:
+        with open(path) as f:
+            source = f.read()
+        if not source.startswith("//SKIP") and os.path.isfile(os.path.splitext(path)[0] + ".ans"):
+            yield os.path.relpath(path, ROOT), source
+    for name, source in RECURSIONS.items():
+        yield name, source.replace("DEPTH", str(depth))
+
+def compare(optimization: str, sources, runs: int):
+    """
+    Print the instructions and run time of every program without and with an optimization.
+    """
+    print(f"{optimization:24} {'instructions':>20} {'run time':>24}")
+    total = {False: 0.0, True: 0.0}
+    hits = Counter()
+    removed = []
+    for name, source in sources:
+        results = {}
+        for on in (False, True):
+            options = CompileOptions(filename=name) if on else CompileOptions(filename=name, **{optimization: OFF[optimization]})
+            result = compile_source(source, options)
+            results[on] = (len(result.program.instructions), run(result.code, runs))
+            total[on] += results[on][1]
+        hits.update(result.peephole_hits)
+        removed.extend(f"{name}: {message}" for message in result.dead_code)
+        print(f"  {os.path.basename(name):22} {results[False][0]:9} -> {results[True][0]:<9}"
+              f" {results[False][1]*1000:9.1f} -> {results[True][1]*1000:6.1f} ms")
+    print(f"  {'total':22} {'':20} {total[False]*1000:9.1f} -> {total[True]*1000:6.1f} ms")
+    if optimization == "peephole":
+        for rule, count in hits.most_common():
+            print(f"  {rule:22} {count:9} hits")
+    if optimization == "dead_code":
+        for message in removed:
+            print(f"  {message}")
+
+def main():
+    args = sys.argv[1:]
+    runs, depth = 3, 50000
+    if "-n" in args:
+        runs = int(args[args.index("-n") + 1])
+        del args[args.index("-n"):args.index("-n") + 2]
+    if "-d" in args:
+        depth = int(args[args.index("-d") + 1])
+        del args[args.index("-d"):args.index("-d") + 2]
+    for optimization in args:
+        if optimization not in OFF:
+            print(f"unknown optimization '{optimization}', expected one of: {', '.join(OFF)}")
+            sys.exit(1)
+    sources = list(programs(depth))
+    for optimization in args or OFF:
+        compare(optimization, sources, runs)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+Benchmarks of the compiler.
+
+Runs one of the benchmarks below with the arguments that follow its name, or lists them. They only
+measure: what the compiler must get right is tested by test/ (python -m pytest test).
+
+Usage: python bench/run.py [BENCHMARK [ARGUMENTS...]]
+"""
+import os
+import runpy
+import sys
+
+BENCH = os.path.dirname(os.path.abspath(__file__))
+
+BENCHMARKS = {  # Name, script and what it measures
+    "cold-start": ("cold_start.py", "cold-start build latency with and without the shipped lexer and parser tables"),
+    "server": ("server_latency.py", "cold build latency against builds through a warm compile server"),
+    "incremental": ("incremental.py", "a full rebuild against an incremental one after editing one function"),
+    "lexer": ("lexer_throughput.py", "the throughput of the hand written lexer against the PLY lexer"),
+    "diagnostics": ("diagnostics_scaling.py", "the time per diagnostic as programs grow, fails if it grows"),
+    "lists": ("list_scaling.py", "the parser stack depth as programs grow, fails if it grows"),
+    "optimizations": ("optimizations.py", "the code size and run time of the programs with each optimization turned off"),
+}
+
+def main():
+    args = sys.argv[1:]
+    if not args or args[0] not in BENCHMARKS:
+        if args:
+            print(f"unknown benchmark '{args[0]}'")
+        print(__doc__.strip().splitlines()[-1])
+        for name, (script, description) in BENCHMARKS.items():
+            print(f"  {name:14} {description} (bench/{script})")
+        sys.exit(1 if args else 0)
+    script = os.path.join(BENCH, BENCHMARKS[args[0]][0])
+    sys.argv = [script] + args[1:]
+    runpy.run_path(script, run_name="__main__")
+
+if __name__ == "__main__":
+    main()
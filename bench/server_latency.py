@@ -0,0 +1,72 @@
+"""
+Latency benchmark for the compile server.
+
+Builds every program in `examples/` and `euler/` with a cold `tox build` process and with
+`tox build --server` against a warm `tox serve`, then reports the per-build latency of both.
+That the server builds the same code is checked by test/test_server.py.
+
+Usage: python bench/server_latency.py [-n RUNS] [files...]
+"""
+import glob
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CLI = "from tox.cli import cli; cli()"
+
+def build_times(files, runs: int, extra_args, out_dir: str):
+    """
+    Return the wall time in seconds of every `tox build` process.
+    """
+    times = []
+    for _ in range(runs):
+        for i, file in enumerate(files):
+            out = os.path.join(out_dir, f"{i}.vms")
+            start = time.perf_counter()
+            subprocess.run([sys.executable, "-c", CLI, "build", file, "-o", out] + extra_args, cwd=ROOT, check=True, stderr=subprocess.DEVNULL)
+            times.append(time.perf_counter() - start)
+    return times
+
+def start_server(socket_path: str, env) -> subprocess.Popen:
+    server = subprocess.Popen([sys.executable, "-c", CLI, "serve"], cwd=ROOT, env=env, stdout=subprocess.PIPE, text=True)
+    server.stdout.readline()    # Wait until it is listening
+    return server
+
+def report(name: str, times):
+    times = sorted(times)
+    print(f"{name:12} mean: {statistics.mean(times)*1000:7.1f} ms  median: {statistics.median(times)*1000:7.1f} ms  p95: {times[int(len(times)*0.95)]*1000:7.1f} ms")
+
+def main():
+    args = sys.argv[1:]
+    runs = 3
+    if "-n" in args:
+        runs = int(args[args.index("-n") + 1])
+        del args[args.index("-n"):args.index("-n") + 2]
+    files = args or sorted(glob.glob(os.path.join(ROOT, "examples", "*.tox")) + glob.glob(os.path.join(ROOT, "euler", "problem*", "*.tox")))
+    files = [f for f in files if not open(f).read().startswith("//SKIP")]
+
+    cold_dir, warm_dir = tempfile.mkdtemp(), tempfile.mkdtemp()
+    socket_path = os.path.join(tempfile.mkdtemp(), "tox.sock")
+    env = dict(os.environ, TOX_SOCKET=socket_path)
+    os.environ["TOX_SOCKET"] = socket_path
+
+    cold = build_times(files, runs, [], cold_dir)
+    server = start_server(socket_path, env)
+    try:
+        warm = build_times(files, runs, ["--server"], warm_dir)
+    finally:
+        server.terminate()
+        server.wait()
+
+    print(f"{len(files)} programs, {runs} runs each")
+    report("cold build", cold)
+    report("server build", warm)
+    print(f"speedup: {statistics.mean(cold) / statistics.mean(warm):.2f}x")
+
+if __name__ == "__main__":
+    main()
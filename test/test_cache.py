@@ -0,0 +1,47 @@
+"""
+Compilation cache tests.
+
+The cache must stay under its size limit, counters included, count hits and misses in files that
+don't grow with the number of builds, and only walk the cache directory when it may be full.
+
+Usage: python -m pytest test/test_cache.py
+"""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from tox.utils.cache import CompilationCache
+
+def fill(cache: CompilationCache, n: int):
+    for i in range(n):
+        key = f"{i:064x}"
+        cache.put(key, "PUSHI 0\n" * 64, [])
+        cache.get(key)
+        cache.get("f" * 64)
+
+def test_size_limit(tmp_path):
+    cache = CompilationCache(str(tmp_path), max_size=20000)
+    fill(cache, 200)
+    stats = cache.stats()
+    assert 0 < stats["size"] <= 20000
+    assert stats["size"] == sum(os.path.getsize(os.path.join(directory, file)) for directory, _, files in os.walk(tmp_path) for file in files)
+    assert cache.get(f"{199:064x}") is not None     # The most recent entries are kept
+
+def test_counters(tmp_path):
+    cache = CompilationCache(str(tmp_path))
+    fill(cache, 50)
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (50, 50)
+    assert os.path.getsize(tmp_path / "hits") == len("50")
+    cache.clear()
+    assert cache.stats() == {"hits": 0, "misses": 0, "functions_compiled": 0, "functions_reused": 0, "entries": 0, "size": 0}
+
+def test_walks(tmp_path):
+    cache = CompilationCache(str(tmp_path), max_size=20000)
+    walks = []
+    entries = cache.entries
+    cache.entries = lambda: walks.append(1) or entries()
+    fill(cache, 200)
+    assert len(walks) < 50  # One walk to measure the empty cache, then one per eviction of a tenth of it
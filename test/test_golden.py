@@ -0,0 +1,64 @@
+"""
+Golden code tests.
+
+Compiles every program in test/, examples/ and euler/ and compares the generated code byte for byte
+with the golden code in test/golden/. Any difference means the typed AST, an optimization or the code
+generator changed the output. When the change is intended, check the programs still print their
+expected output (test/test_optimizations.py, tox examples, tox euler) and rewrite the golden code.
+
+Usage: python -m pytest test/test_golden.py
+       python test/test_golden.py --update
+"""
+import glob
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from tox.parsing._compiler import compile_source
+from tox.parsing._options import CompileOptions
+
+GOLDEN = os.path.join(ROOT, "test", "golden")
+
+def programs():
+    """
+    Relative path of every program, skipping the ones marked with //SKIP.
+    """
+    paths = sorted(glob.glob(os.path.join(ROOT, "test", "*.tox"))) + sorted(glob.glob(os.path.join(ROOT, "examples", "*.tox"))) + sorted(glob.glob(os.path.join(ROOT, "euler", "problem*", "*.tox")))
+    out = []
+    for path in paths:
+        with open(path) as f:
+            if not f.read().startswith("//SKIP"):
+                out.append(os.path.relpath(path, ROOT))
+    return out
+
+def generate(program: str) -> str:
+    with open(os.path.join(ROOT, program)) as f:
+        result = compile_source(f.read(), CompileOptions(filename=program))
+    assert result.ok, "".join(str(diagnostic) for diagnostic in result.diagnostics)
+    return result.code
+
+def golden(program: str) -> str:
+    return os.path.join(GOLDEN, os.path.splitext(program)[0] + ".vms")
+
+@pytest.mark.parametrize("program", programs())
+def test_golden(program):
+    with open(golden(program)) as f:
+        assert generate(program) == f.read(), f"the generated code differs from {os.path.relpath(golden(program), ROOT)}"
+
+def update():
+    count = 0
+    for program in programs():
+        os.makedirs(os.path.dirname(golden(program)), exist_ok=True)
+        with open(golden(program), "w") as f:
+            f.write(generate(program))
+        count += 1
+    print(f"wrote the golden code of {count} programs")
+
+if __name__ == "__main__":
+    if "--update" not in sys.argv[1:]:
+        sys.exit(pytest.main([__file__, "-q"]))
+    update()
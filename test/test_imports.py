@@ -0,0 +1,50 @@
+"""
+Import tests for the tox CLI.
+
+Runs each CLI mode under `python -X importtime` and fails if it imports modules it does not need,
+e.g. the parser for `tox -h` or tqdm for `tox build`. The lazily imported `tox.parser` must still parse.
+
+Usage: python -m pytest test/test_imports.py
+"""
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+CLI = "from tox.cli import cli; cli()"
+COMPILER = ["ply", "tox.lexing._lexer", "tox.parsing._parser", "tox.semantics"]
+
+CASES = [   # (name, cli arguments, whether the program is in the cache, modules that must not be imported)
+    ("help", ["-h"], False, COMPILER + ["tqdm"]),
+    ("skipped build", ["build", "examples/is_prime.tox"], False, COMPILER + ["tqdm"]),
+    ("build", ["build", "examples/hello_world.tox"], False, ["tqdm"]),
+    ("cached build", ["build", "examples/hello_world.tox"], True, COMPILER + ["tqdm"]),
+    ("server build", ["build", "examples/hello_world.tox", "--server"], False, COMPILER + ["tqdm"]),
+]
+
+def imported_modules(args, env):
+    """
+    Every module imported by `tox <args>`.
+    """
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", CLI] + args, cwd=ROOT, env=env, capture_output=True, text=True)
+    return {line.split("|")[-1].strip() for line in proc.stderr.splitlines() if line.startswith("import time:") and "cumulative" not in line}
+
+@pytest.mark.parametrize("name, args, cached, forbidden", CASES, ids=[case[0] for case in CASES])
+def test_imports(name, args, cached, forbidden, tmp_path):
+    env = dict(os.environ, TOX_CACHE_DIR=str(tmp_path / "cache"))  # Start from an empty compilation cache
+    if args[0] == "build":
+        args = args + ["-o", str(tmp_path / "out.vms")]
+    if cached:
+        subprocess.run([sys.executable, "-c", CLI] + args, cwd=ROOT, env=env, capture_output=True, check=True)
+    leaked = sorted(module for module in imported_modules(args, env) if any(module == f or module.startswith(f + ".") for f in forbidden))
+    assert not leaked
+
+def test_parser():
+    import tox
+    tree = tox.parser.parse('func main() {\n    print(1 + 2, "\\n")\n}\n')
+    assert [function.data.name for function in tree.functions] == ["main"]
+    assert tox.parser.parse('func main() {\n    print(3, "\\n")\n}\n') is not None   # Each access is a new compilation
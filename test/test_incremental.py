@@ -0,0 +1,63 @@
+"""
+Incremental build tests.
+
+An incremental build compiles every function on its own, then links the units and leaves out the
+functions and globals main never reaches (see tox.parsing._incremental). It must generate exactly
+the code of the whole program build, whether it reuses the saved units or not.
+
+Usage: python -m pytest test/test_incremental.py
+"""
+import glob
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from tox.parsing._compiler import compile_source
+from tox.parsing._incremental import compile_incremental
+from tox.parsing._options import CompileOptions
+
+def programs():
+    """
+    Relative path of every program, skipping the ones marked with //SKIP.
+    """
+    paths = sorted(glob.glob(os.path.join(ROOT, "test", "*.tox"))) + sorted(glob.glob(os.path.join(ROOT, "examples", "*.tox"))) + sorted(glob.glob(os.path.join(ROOT, "euler", "problem*", "*.tox")))
+    out = []
+    for path in paths:
+        with open(path) as f:
+            if not f.read().startswith("//SKIP"):
+                out.append(os.path.relpath(path, ROOT))
+    return out
+
+def edited(n: int, edit: int = -1) -> str:
+    """
+    A program with `n` functions, the body of the one numbered `edit` changed.
+    """
+    funcs = []
+    for i in range(n):
+        extra = " + 1" if i == edit else ""
+        funcs.append(f"func f{i}(a: int) -> int {{\n    s: int = 0\n    for(j: int = 0; j < a; j = j + 1) {{\n        if j % 2 == 0 {{ s = s + j{extra} }} else {{ s = s - g }}\n    }}\n    return s\n}}")
+    calls = " + ".join(f"f{i}(3)" for i in range(0, n, 2))
+    return "g: int = 1\n\n" + "\n\n".join(funcs) + f"\n\nfunc main() {{\n    print({calls}, \"\\n\")\n}}\n"
+
+@pytest.mark.parametrize("dead_code", [True, False])
+@pytest.mark.parametrize("program", programs())
+def test_same_code(program, dead_code):
+    with open(os.path.join(ROOT, program)) as f:
+        source = f.read()
+    options = CompileOptions(filename=program, dead_code=dead_code)
+    full = compile_source(source, options).code
+    result, record = compile_incremental(source, options)
+    assert result.code == full
+    result, record = compile_incremental(source, options, record)
+    assert result.code == full
+    assert record["compiled"] == 0
+
+def test_edited_function():
+    _, record = compile_incremental(edited(20))
+    result, record = compile_incremental(edited(20, edit=10), record=record)
+    assert result.code == compile_source(edited(20, edit=10)).code
+    assert record["compiled"] == 2     # The function and main, which inlines it
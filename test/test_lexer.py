@@ -0,0 +1,55 @@
+"""
+Lexer tests.
+
+The hand written lexer must produce exactly the tokens and line numbers of the PLY lexer on every
+program in the repository and on synthetic sources.
+
+Usage: python -m pytest test/test_lexer.py
+"""
+import glob
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from tox.lexing._lexer import get_lexer, get_ply_lexer
+
+CHUNK = """/* function
+   number {i} */
+func f{i}(a: int, b: float) -> int {{
+    // single line comment {{ with braces }}
+    s: vec<int> = [1 ... 10]
+    if a >= 10 && b != 2.5f || a <= -3 {{ print("a /* not a comment */ {{", a, "\\n") }}
+    x: float = 3.14 * 2f / (float) a
+    while a > 0 {{ a = a - 1 }}
+    return a % 3 == 0
+}}
+"""
+
+SOURCES = {os.path.relpath(path, ROOT): open(path).read() for path in sorted(glob.glob(os.path.join(ROOT, "test", "*.tox")) + glob.glob(os.path.join(ROOT, "examples", "*.tox")) + glob.glob(os.path.join(ROOT, "euler", "problem*", "*.tox")))}
+SOURCES.update({
+    "synthetic": "".join(CHUNK.format(i=i) for i in range(100)),
+    "unclosed comment": "a /* never closed\nb",
+    "numbers": "x: float = 1f 2.0 3.5f 12foo printer",
+})
+
+def tokens(lexer, source: str):
+    """
+    Every token as (type, value, lineno, lexpos, lexer lineno after the token).
+    """
+    lexer.lineno = 1
+    lexer.input(source)
+    out = []
+    while True:
+        tok = lexer.token()
+        if tok is None:
+            out.append(("$end", None, None, None, lexer.lineno))
+            return out
+        out.append((tok.type, tok.value, tok.lineno, tok.lexpos, lexer.lineno))
+
+@pytest.mark.parametrize("name", list(SOURCES))
+def test_same_tokens(name):
+    assert tokens(get_lexer(), SOURCES[name]) == tokens(get_ply_lexer(), SOURCES[name])
@@ -0,0 +1,84 @@
+"""
+Behavioral tests of the optimizations.
+
+Every program with an expected output (the .ans file next to it) in test/, examples/ and euler/ is
+compiled with all the optimizations, with each one turned off and with all of them turned off, run
+in the VM and checked against that output. The known_values_* and match_* programs cover what the
+constant propagation and the dead store elimination have to get right: matches on known subjects
+and on variable cases, branches, loops with break and continue, and variables written through
+pointers. Builds that generate the same code are only run once.
+
+Usage: python -m pytest test
+"""
+import glob
+import os
+import subprocess
+import sys
+import tempfile
+from functools import lru_cache
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from tox.parsing._compiler import compile_source
+from tox.parsing._options import CompileOptions
+
+VMS = os.path.join(ROOT, "vm", "vms")
+
+OFF = {     # What turns off each optimization
+    "fold_constants": False,
+    "propagate_constants": False,
+    "dead_stores": False,
+    "peephole": False,
+    "dead_code": False,
+    "inline_size": 0,
+    "hoisting": False,
+    "common_subexpressions": False,
+    "tail_calls": False,
+}
+
+PROGRAMS = [
+    os.path.relpath(path, ROOT)[:-len(".tox")]
+    for path in sorted(glob.glob(os.path.join(ROOT, "test", "*.tox"))) + sorted(glob.glob(os.path.join(ROOT, "examples", "*.tox"))) + sorted(glob.glob(os.path.join(ROOT, "euler", "problem*", "*.tox")))
+    if os.path.isfile(path[:-len(".tox")] + ".ans") and not open(path).read().startswith("//SKIP")
+]
+
+@lru_cache(maxsize=None)
+def run(code: str) -> str:
+    """
+    What the VM prints when it runs `code`.
+    """
+    with tempfile.NamedTemporaryFile("w", suffix=".vms", delete=False) as f:
+        f.write(code)
+    try:
+        return subprocess.run([VMS, f.name], capture_output=True, text=True, stdin=subprocess.DEVNULL, timeout=120).stdout
+    finally:
+        os.remove(f.name)
+
+def output(program: str, off: tuple) -> str:
+    """
+    What a program prints when compiled with the optimizations in `off` turned off.
+    """
+    with open(os.path.join(ROOT, program + ".tox")) as f:
+        result = compile_source(f.read(), CompileOptions(filename=program + ".tox", **{name: OFF[name] for name in off}))
+    assert result.ok, "".join(str(diagnostic) for diagnostic in result.diagnostics)
+    return run(result.code)
+
+def expected(program: str) -> str:
+    with open(os.path.join(ROOT, program + ".ans")) as f:
+        return f.read()
+
+@pytest.mark.parametrize("program", PROGRAMS)
+def test_optimized(program):
+    assert output(program, ()) == expected(program)
+
+@pytest.mark.parametrize("program", PROGRAMS)
+def test_unoptimized(program):
+    assert output(program, tuple(OFF)) == expected(program)
+
+@pytest.mark.parametrize("optimization", list(OFF))
+@pytest.mark.parametrize("program", PROGRAMS)
+def test_optimization_off(program, optimization):
+    assert output(program, (optimization,)) == expected(program)
@@ -0,0 +1,52 @@
+"""
+Compile server tests.
+
+A build through the compile server must generate the code of a build in the CLI process itself,
+with the same options: the client caches it under the key of its own options.
+
+Usage: python -m pytest test/test_server.py
+"""
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from tox.parsing._compiler import compile_source
+from tox.parsing._options import CompileOptions
+from tox.server import handle_request
+
+CLI = "from tox.cli import cli; cli()"
+PROGRAMS = ["examples/qsort.tox", "examples/matrix_inversion.tox", "test/known_values_pointers.tox"]
+
+def source(program: str) -> str:
+    with open(os.path.join(ROOT, program)) as f:
+        return f.read()
+
+@pytest.mark.parametrize("options", [CompileOptions(), CompileOptions(peephole=False, inline_size=0), CompileOptions(max_errors=1, dead_code=False)], ids=["default", "no peephole, no inlining", "no dead code"])
+@pytest.mark.parametrize("program", PROGRAMS)
+def test_request(program, options):
+    response = handle_request({"op": "build", "source": source(program), "filename": program, "options": options.settings()})
+    assert response["ok"]
+    assert response["code"] == compile_source(source(program), options).code
+
+@pytest.fixture(scope="module")
+def server(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("server")
+    env = dict(os.environ, TOX_SOCKET=str(directory / "tox.sock"), TOX_CACHE_DIR=str(directory / "cache"))
+    process = subprocess.Popen([sys.executable, "-c", CLI, "serve"], cwd=ROOT, env=env, stdout=subprocess.PIPE, text=True)
+    process.stdout.readline()   # Wait until it is listening
+    yield env
+    process.terminate()
+    process.wait()
+
+@pytest.mark.parametrize("flags", [[], ["-O0"], ["--no-peephole", "--inline-size", "0"]], ids=["default", "-O0", "--no-peephole --inline-size 0"])
+def test_cli(server, flags, tmp_path):
+    output = tmp_path / "out.vms"
+    subprocess.run([sys.executable, "-c", CLI, "build", "examples/qsort.tox", "-o", str(output), "--server"] + flags, cwd=ROOT, env=server, check=True)
+    local = tmp_path / "local.vms"
+    subprocess.run([sys.executable, "-c", CLI, "build", "examples/qsort.tox", "-o", str(local), "--no-cache"] + flags, cwd=ROOT, env=server, check=True)
+    assert output.read_text() == local.read_text()
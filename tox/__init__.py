@@ -1,26 +1,70 @@
+from importlib import import_module
+
 from tox.utils.colors import *
-from tox.utils.errors import compiler_warning, compiler_error, compiler_note, syntax_error, find_column, std_message, lex_error
-from tox.semantics._scopes import Scope, MetaData
-from tox.semantics._type_check import TypeCheck
-from tox.semantics._functions import Functions, FunctionData
-from tox.semantics._expression import (
-    Primary,
-    Unary,
-    Factor,
-    Term,
-    Comparison,
-    Condition,
-    SubExpression,
-    Expression,
-)
-from tox.semantics._statement import (
-    IO,
-    Assignment,
-    Declaration,
-    DeclarationAssignment,
-    If,
-    Match,
-    Loop,
-    BreakContinue,
-)
-from tox.parsing._parser import parser
\ No newline at end of file
+
+# Everything else is imported on first access so that each CLI mode only loads what it needs
+_lazy_attributes = {
+    "compiler_warning": "tox.utils.errors",
+    "compiler_error": "tox.utils.errors",
+    "compiler_note": "tox.utils.errors",
+    "syntax_error": "tox.utils.errors",
+    "find_column": "tox.utils.errors",
+    "std_message": "tox.utils.errors",
+    "lex_error": "tox.utils.errors",
+    "Source": "tox.utils.source",
+    "Scope": "tox.semantics._scopes",
+    "MetaData": "tox.semantics._scopes",
+    "TypeCheck": "tox.semantics._type_check",
+    "Functions": "tox.semantics._functions",
+    "FunctionData": "tox.semantics._functions",
+    "Primary": "tox.semantics._expression",
+    "Unary": "tox.semantics._expression",
+    "Factor": "tox.semantics._expression",
+    "Term": "tox.semantics._expression",
+    "Comparison": "tox.semantics._expression",
+    "Condition": "tox.semantics._expression",
+    "SubExpression": "tox.semantics._expression",
+    "Expression": "tox.semantics._expression",
+    "IO": "tox.semantics._statement",
+    "Assignment": "tox.semantics._statement",
+    "Declaration": "tox.semantics._statement",
+    "DeclarationAssignment": "tox.semantics._statement",
+    "If": "tox.semantics._statement",
+    "Match": "tox.semantics._statement",
+    "Loop": "tox.semantics._statement",
+    "BreakContinue": "tox.semantics._statement",
+    "parser": "tox.parsing._compiler",
+    "Instruction": "tox.codegen._program",
+    "Code": "tox.codegen._program",
+    "Program": "tox.codegen._program",
+    "CodeGenerator": "tox.codegen._generator",
+    "ConstantFolder": "tox.codegen._folding",
+    "ConstantPropagator": "tox.codegen._propagation",
+    "DeadStoreEliminator": "tox.codegen._dead_stores",
+    "PeepholeOptimizer": "tox.codegen._peephole",
+    "DeadCodeEliminator": "tox.codegen._dead_code",
+    "Inliner": "tox.codegen._inlining",
+    "LoopInvariantHoister": "tox.codegen._hoisting",
+    "CommonSubexpressionEliminator": "tox.codegen._value_numbering",
+    "TailCallEliminator": "tox.codegen._tail_calls",
+    "Diagnostic": "tox.utils.errors",
+    "CompilationError": "tox.utils.errors",
+    "SemanticError": "tox.utils.errors",
+    "Diagnostics": "tox.utils.errors",
+    "CompileOptions": "tox.parsing._options",
+    "CompilationResult": "tox.parsing._compiler",
+    "CompilationContext": "tox.parsing._compiler",
+    "compile_source": "tox.parsing._compiler",
+    "compile_batch": "tox.parsing._compiler",
+    "compile_incremental": "tox.parsing._incremental",
+}
+
+def __getattr__(name: str):
+    if name not in _lazy_attributes:
+        raise AttributeError(f"module 'tox' has no attribute '{name}'")
+    module = import_module(_lazy_attributes[name])
+    if name == "parser":    # A new compilation every time, a context only compiles one program
+        return module.CompilationContext()
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
@@ -5,14 +5,23 @@ import sys
 import glob
 import subprocess
 
-from tqdm import tqdm
-
 from tox.utils.colors import *
 
 OptArgs = Dict[str, str]
 ReqArgs = Dict[str, Union[str, bool]]
-possible_exec_modes = ["run", "build", "test", "euler", "examples"]
-possible_opt_args = ["-o","--output", "-v", "--verbose", "-rec", "--record", "-clc", "--clean-up"]
+possible_exec_modes = ["run", "build", "test", "euler", "examples", "serve"]
+# Flags that turn off one optimization, the CompileOptions field each one clears and what it turns off
+optimization_flags = {
+    "--no-fold-constants": ("fold_constants", "constant folding"),
+    "--no-propagate-constants": ("propagate_constants", "constant propagation"),
+    "--no-dead-stores": ("dead_stores", "dead store elimination"),
+    "--no-peephole": ("peephole", "peephole optimizer"),
+    "--no-dead-code": ("dead_code", "dead code elimination"),
+    "--no-hoisting": ("hoisting", "loop invariant code motion"),
+    "--no-common-subexpressions": ("common_subexpressions", "common subexpression elimination"),
+    "--no-tail-calls": ("tail_calls", "tail call elimination"),
+}
+possible_opt_args = ["-o","--output", "-v", "--verbose", "-rec", "--record", "-clc", "--clean-up", "--server", "--no-cache", "--cache-stats", "--max-errors", "-O0", "--inline-size"] + list(optimization_flags)
 recognized_args = possible_exec_modes + possible_opt_args
 
 def print_help():
@@ -27,6 +36,7 @@ def print_help():
     print(f"  {COLOR_GREEN}euler{RESET_COLOR}      Check the solutions of the Euler problems.")
     print(f"  {COLOR_GREEN}test{RESET_COLOR}       Compile and run the test programs. Compare the outputs with the expected outputs.")
     print(f"  {COLOR_GREEN}examples{RESET_COLOR}   Compile and run the example programs. Compare the outputs with the expected outputs.")
+    print(f"  {COLOR_GREEN}serve{RESET_COLOR}      Start a compile server that keeps the compiler loaded between builds.")
     print()
     print(f"{COLOR_BLUE}OPTIONS{RESET_COLOR}:")
     print(f"  {COLOR_GREEN}-h{RESET_COLOR}     Show this help message and exit.")
@@ -34,6 +44,14 @@ def print_help():
     print(f"  {COLOR_GREEN}-rec{RESET_COLOR}   Record the output of the executed programs.")
     print(f"  {COLOR_GREEN}-clc{RESET_COLOR}   Clear the output of the executed programs.")
     print(f"  {COLOR_GREEN}-v{RESET_COLOR}     Show verbose output.")
+    print(f"  {COLOR_GREEN}--server{RESET_COLOR} Compile through the compile server (see serve). The socket can be set with TOX_SOCKET.")
+    print(f"  {COLOR_GREEN}--no-cache{RESET_COLOR}    Always recompile, ignoring the compilation cache (TOX_CACHE_DIR, TOX_CACHE_SIZE).")
+    print(f"  {COLOR_GREEN}--cache-stats{RESET_COLOR} Show the compilation cache hits and misses.")
+    print(f"  {COLOR_GREEN}--max-errors{RESET_COLOR}  Stop compiling after this many errors (default 20, 0 for no limit).")
+    print(f"  {COLOR_GREEN}-O0{RESET_COLOR}    Turn off every optimization.")
+    print(f"  {COLOR_GREEN}--inline-size{RESET_COLOR} Largest function body inlined at its calls, in syntax tree nodes (default 64, 0 for none).")
+    for flag, (_, description) in optimization_flags.items():
+        print(f"  {COLOR_GREEN}{flag}{RESET_COLOR} Turn off the {description}.")
 
 def error(msg: str, verbose: bool = False):
     print(f"{COLOR_RED}[ERROR]{RESET_COLOR}", msg)
@@ -53,6 +71,13 @@ def echo_cmd(cmd: str, verbose: bool = False) -> Tuple[bool, str]:
             return 2, "The program was skipped."
     return 0, ""
 
+def build_flags(opt_args: OptArgs) -> str:
+    flags = "".join(f" {flag}" for flag in ["--server", "--no-cache", "-O0"] + list(optimization_flags) if opt_args[flag])
+    for flag in ("--max-errors", "--inline-size"):
+        if opt_args[flag] is not None:
+            flags += f" {flag} {opt_args[flag]}"
+    return flags
+
 def warn_cmd(msg: str, verbose: bool = False):
     if verbose: print(f"{COLOR_YELLOW}[WARN]{RESET_COLOR} {msg}")
 
@@ -71,16 +96,35 @@ def prepare_cmd_args() -> Tuple[OptArgs, ReqArgs]:
         if arg not in recognized_args:
             if "-o" in sys.argv and sys.argv.index("-o") == sys.argv.index(arg) - 1:
                 continue
+            if "--max-errors" in sys.argv and sys.argv.index("--max-errors") == sys.argv.index(arg) - 1:
+                continue
+            if "--inline-size" in sys.argv and sys.argv.index("--inline-size") == sys.argv.index(arg) - 1:
+                continue
             error(f"Unrecognized argument: {arg}. Use -h or --help to see the help message.")
 
     output_file = sys.argv[sys.argv.index("-o") + 1] if "-o" in sys.argv else None
     rec = True if "-rec" in sys.argv else False
     clc = True if "-clc" in sys.argv else False
     verbose = True if "-v" in sys.argv else False #TODO: Implement verbose output
+    server = True if "--server" in sys.argv else False
+    no_cache = True if "--no-cache" in sys.argv else False
+    cache_stats = True if "--cache-stats" in sys.argv else False
+    max_errors = None
+    if "--max-errors" in sys.argv:
+        value = sys.argv[sys.argv.index("--max-errors") + 1:][:1]
+        if not value or not value[0].isdigit(): error("--max-errors expects a number.")
+        max_errors = int(value[0])
+    inline_size = None
+    if "--inline-size" in sys.argv:
+        value = sys.argv[sys.argv.index("--inline-size") + 1:][:1]
+        if not value or not value[0].isdigit(): error("--inline-size expects a number.")
+        inline_size = int(value[0])
+    no_opt = True if "-O0" in sys.argv else False
 
     if verbose: warn_cmd("Verbose output is not implemented yet.")
 
-    opt_args = {"-o": output_file, "-v": verbose, "-rec": rec, "-clc": clc}
+    opt_args = {"-o": output_file, "-v": verbose, "-rec": rec, "-clc": clc, "--server": server, "--no-cache": no_cache, "--cache-stats": cache_stats, "--max-errors": max_errors, "-O0": no_opt, "--inline-size": inline_size}
+    opt_args.update({flag: flag in sys.argv for flag in optimization_flags})
 
     # Handle Required Arguments
     run   = True if "run"   in sys.argv else False 
@@ -88,11 +132,12 @@ def prepare_cmd_args() -> Tuple[OptArgs, ReqArgs]:
     test  = True if "test"  in sys.argv else False 
     euler = True if "euler" in sys.argv else False 
     examples = True if "examples" in sys.argv else False 
-    modes = [run, build, test, euler, examples]
-    if len(list(filter(bool, modes))) == 0: error(f"No execution mode specified. (run, build, test, euler, examples)")
+    serve = True if "serve" in sys.argv else False
+    modes = [run, build, test, euler, examples, serve]
+    if len(list(filter(bool, modes))) == 0: error(f"No execution mode specified. (run, build, test, euler, examples, serve)")
     if len(list(filter(bool, modes))) >  1: error("Multiple execution modes specified.")
 
-    req_args = {"input": input_file, "run": run, "build": build, "test": test, "euler": euler, "examples": examples}
+    req_args = {"input": input_file, "run": run, "build": build, "test": test, "euler": euler, "examples": examples, "serve": serve}
 
     return opt_args, req_args
 
@@ -108,22 +153,89 @@ def run_execute(req_args: ReqArgs, opt_args: OptArgs):
         sys.exit(1)
 
 def build_execute(req_args: ReqArgs, opt_args: OptArgs):
-    from tox import parser
-
     if not req_args["input"]: error("No input file specified.")
     with open(req_args["input"], "r") as f:
         info_cmd(f"Compiling {req_args['input']}", verbose=opt_args["-v"])
         content = f.read()
         if content.startswith("//SKIP"):
             sys.exit(2)
-        parser.input = content
-        output = parser.parse(content)
+        ok, code, diagnostics = cached_compile(content, req_args["input"], opt_args)
+        for diagnostic in diagnostics:
+            sys.stderr.write(diagnostic)
+        if not ok:
+            sys.exit(1)
         if not opt_args["-o"]:
             opt_args["-o"] = os.path.splitext(req_args['input'])[0] + ".vms"
+        if os.path.isfile(opt_args["-o"]):
+            with open(opt_args["-o"], "r") as f:
+                if f.read() == code:
+                    return  # Up to date, leave it untouched
         with open(opt_args["-o"], "w") as f:
-            f.write(output)
+            f.write(code)
+
+def compile_options(filename: str, opt_args: OptArgs):
+    """
+    The options of a build, the defaults changed by the command line flags.
+    """
+    from tox.parsing._options import CompileOptions
+    options = CompileOptions(filename=filename)
+    if opt_args["--max-errors"] is not None:
+        options.max_errors = opt_args["--max-errors"]
+    for flag, (name, _) in optimization_flags.items():
+        if opt_args[flag] or opt_args["-O0"]:
+            setattr(options, name, False)
+    if opt_args["-O0"]:
+        options.inline_size = 0
+    elif opt_args["--inline-size"] is not None:
+        options.inline_size = opt_args["--inline-size"]
+    return options
+
+def cached_compile(content: str, filename: str, opt_args: OptArgs) -> Tuple[bool, str, list]:
+    options = compile_options(filename, opt_args)
+    if opt_args["--no-cache"]:
+        return compile_content(content, options, opt_args)
+    from tox.utils.cache import CompilationCache
+    cache = CompilationCache()
+    key = cache.key(content, options)
+    entry = cache.get(key)
+    if entry is not None:
+        return True, entry[0], entry[1]
+    if opt_args["--server"]:
+        ok, code, diagnostics = server_compile(content, options)
+    else:   # Only recompile the functions that changed since the last build of this file
+        from tox.parsing._incremental import compile_incremental
+        result, record = compile_incremental(content, options, cache.get_record(filename, options))
+        ok, code, diagnostics = result.ok, result.code, [str(diagnostic) for diagnostic in result.diagnostics]
+        if record is not None:
+            cache.put_record(filename, options, record)
+            cache.count("functions_compiled", record["compiled"])
+            cache.count("functions_reused", record["reused"])
+    if ok:
+        cache.put(key, code, diagnostics)
+    return ok, code, diagnostics
+
+def compile_content(content: str, options, opt_args: OptArgs) -> Tuple[bool, str, list]:
+    if opt_args["--server"]:
+        return server_compile(content, options)
+    from tox.parsing._compiler import compile_source  # Only pay for the compiler when there is something to compile
+    result = compile_source(content, options)
+    return result.ok, result.code, [str(diagnostic) for diagnostic in result.diagnostics]
+
+def server_compile(content: str, options) -> Tuple[bool, str, list]:
+    from tox.server import request, default_socket_path
+    try:
+        response = request(default_socket_path(), {"op": "build", "source": content, "filename": options.filename, "options": options.settings()})
+    except OSError:
+        error(f"Could not reach the compile server at {default_socket_path()}. Start it with 'tox serve'.")
+    return response["ok"], response["code"], response["diagnostics"]
+
+def serve_execute(req_args: ReqArgs, opt_args: OptArgs):
+    from tox.server import serve
+    serve()
 
 def test_execute(req_args: ReqArgs, opt_args: OptArgs):
+    from tqdm import tqdm
+
     input_files = glob.glob("test/*.tox")
     output_files = [os.path.splitext(input_file)[0]+".vms" for input_file in input_files]
     num_tests = len(input_files)
@@ -134,7 +246,7 @@ def test_execute(req_args: ReqArgs, opt_args: OptArgs):
     if opt_args["-rec"]:
         for input_file, output_file in iterable:
             if opt_args['-v']: print(COLOR_GREEN + "-"*80 + RESET_COLOR)
-            ret = echo_cmd(f"tox build {input_file} -o {output_file}", verbose=opt_args['-v'])
+            ret = echo_cmd(f"tox build {input_file} -o {output_file}{build_flags(opt_args)}", verbose=opt_args['-v'])
             if ret[0] == 2:
                 info_cmd(f"Skipped {input_file}", verbose=opt_args['-v'])
                 num_tests -= 1
@@ -144,7 +256,7 @@ def test_execute(req_args: ReqArgs, opt_args: OptArgs):
     else:
         for input_file, output_file in iterable:
             if opt_args['-v']: print(COLOR_GREEN + "-"*80 + RESET_COLOR)
-            ret = echo_cmd(f"tox build {input_file} -o {output_file}", verbose=opt_args['-v'])
+            ret = echo_cmd(f"tox build {input_file} -o {output_file}{build_flags(opt_args)}", verbose=opt_args['-v'])
             if ret[0] == 1:
                 num_tests -= 1
                 failed_tests.append((input_file, ret[1]))
@@ -182,6 +294,8 @@ def test_execute(req_args: ReqArgs, opt_args: OptArgs):
     print(f"{COLOR_YELLOW}Skipped: {len(skipped_tests)}.{RESET_COLOR}")
 
 def euler_execute(req_args: ReqArgs, opt_args: OptArgs):
+    from tqdm import tqdm
+
     input_files = glob.glob("euler/problem*/*.tox")
     output_files = [os.path.splitext(input_file)[0]+".vms" for input_file in input_files]
     num_tests = len(input_files)
@@ -191,7 +305,7 @@ def euler_execute(req_args: ReqArgs, opt_args: OptArgs):
     iterable = tqdm(zip(input_files, output_files), total=len(input_files), desc="Testing", colour="green") if not opt_args["-v"] else zip(input_files, output_files)
     for input_file, output_file in iterable:
         if opt_args['-v']: print(COLOR_GREEN + "-"*80 + RESET_COLOR)
-        ret = echo_cmd(f"tox build {input_file} -o {output_file}", verbose=opt_args['-v'])
+        ret = echo_cmd(f"tox build {input_file} -o {output_file}{build_flags(opt_args)}", verbose=opt_args['-v'])
         if ret[0] == 1:
             num_tests -= 1
             failed_tests.append((input_file, ret[1]))
@@ -226,6 +340,8 @@ def euler_execute(req_args: ReqArgs, opt_args: OptArgs):
     print(f"{COLOR_YELLOW}Skipped: {len(skipped_tests)}.{RESET_COLOR}")
 
 def examples_execute(req_args: ReqArgs, opt_args: OptArgs):
+    from tqdm import tqdm
+
     input_files = glob.glob("examples/*.tox")
     output_files = [os.path.splitext(input_file)[0]+".vms" for input_file in input_files]
     num_tests = len(input_files)
@@ -236,7 +352,7 @@ def examples_execute(req_args: ReqArgs, opt_args: OptArgs):
     if opt_args["-rec"]:
         for input_file, output_file in iterable:
             if opt_args['-v']: print(COLOR_GREEN + "-"*80 + RESET_COLOR)
-            ret = echo_cmd(f"tox build {input_file} -o {output_file}", verbose=opt_args['-v'])
+            ret = echo_cmd(f"tox build {input_file} -o {output_file}{build_flags(opt_args)}", verbose=opt_args['-v'])
             if ret[0] == 2:
                 info_cmd(f"Skipped {input_file}", verbose=opt_args['-v'])
                 num_tests -= 1
@@ -246,7 +362,7 @@ def examples_execute(req_args: ReqArgs, opt_args: OptArgs):
     else:
         for input_file, output_file in iterable:
             if opt_args['-v']: print(COLOR_GREEN + "-"*80 + RESET_COLOR)
-            ret = echo_cmd(f"tox build {input_file} -o {output_file}", verbose=opt_args['-v'])
+            ret = echo_cmd(f"tox build {input_file} -o {output_file}{build_flags(opt_args)}", verbose=opt_args['-v'])
             if ret[0] == 1:
                 num_tests -= 1
                 failed_tests.append((input_file, ret[1]))
@@ -280,12 +396,34 @@ def examples_execute(req_args: ReqArgs, opt_args: OptArgs):
     print(f"{COLOR_RED}Failed: {len(failed_tests)}.{RESET_COLOR}", end=" ")
     print(f"{COLOR_YELLOW}Skipped: {len(skipped_tests)}.{RESET_COLOR}")
 
+def print_cache_stats(before: Dict[str, int], after: Dict[str, int]):
+    hits, misses = after["hits"] - before["hits"], after["misses"] - before["misses"]
+    rate = 100 * hits / (hits + misses) if hits + misses else 0
+    print(f"{COLOR_BLUE}[CACHE]{RESET_COLOR} {COLOR_GREEN}Hits: {hits}.{RESET_COLOR} {COLOR_YELLOW}Misses: {misses}.{RESET_COLOR} Hit rate: {rate:.0f}%.", end=" ")
+    print(f"Entries: {after['entries']} ({after['size'] / 1024:.0f} KiB). Total hits: {after['hits']}. Total misses: {after['misses']}.")
+    compiled, reused = after["functions_compiled"] - before["functions_compiled"], after["functions_reused"] - before["functions_reused"]
+    if compiled + reused:
+        print(f"{COLOR_BLUE}[CACHE]{RESET_COLOR} Functions recompiled: {compiled}. Functions reused: {reused}.")
+
 def execute(opt_args: OptArgs, req_args: ReqArgs):
+    if opt_args["--cache-stats"]:
+        from tox.utils.cache import CompilationCache
+        cache = CompilationCache()
+        before = cache.stats()
+        try:
+            execute_mode(opt_args, req_args)
+        finally:
+            print_cache_stats(before, cache.stats())
+    else:
+        execute_mode(opt_args, req_args)
+
+def execute_mode(opt_args: OptArgs, req_args: ReqArgs):
     if req_args["run"]  : run_execute(req_args, opt_args)
     if req_args["build"]: build_execute(req_args, opt_args)
     if req_args["test"] : test_execute(req_args, opt_args)
     if req_args["euler"]: euler_execute(req_args, opt_args)
     if req_args["examples"]: examples_execute(req_args, opt_args)
+    if req_args["serve"]: serve_execute(req_args, opt_args)
 
 def cli():
     opt_args, req_args = prepare_cmd_args()
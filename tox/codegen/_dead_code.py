@@ -0,0 +1,253 @@
+from dataclasses import fields
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from tox.semantics import _ast as ast
+from tox.codegen._folding import ConstantFolder
+
+_FIELDS: Dict[type, Tuple[str, ...]] = {}  # Names of the fields of each node class
+
+class References(NamedTuple):
+    """
+    Class that represents what a tree refers to outside of itself.
+    """
+    calls: Set[str]     # Functions it calls
+    uses: Set[str]      # Global variables it uses
+    addresses: bool     # Takes the address of a global, pointer arithmetic from it can reach any other global
+    reads: bool         # Reads stdin
+
+def references(node) -> References:
+    """
+    What a tree refers to, found in a single walk over it.
+    """
+    calls, uses = set(), set()
+    addresses = reads = False
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, (list, tuple)):
+            stack.extend(node)
+            continue
+        kind = type(node)
+        if kind is ast.Const or kind.__module__ != ast.__name__:    # Literals are most of the nodes of big array initializers
+            continue
+        if kind is ast.Symbol:
+            if not node.local:
+                uses.add(node.name)
+            continue
+        if kind is ast.Call:
+            calls.add(node.function.name)
+        elif kind is ast.Read:
+            reads = True
+        elif kind is ast.Address:
+            addresses = addresses or not node.var.local
+        elif kind is ast.Index:     # Fewer indices than dimensions is the address of a row
+            var = node.var
+            addresses = addresses or (not var.local and not var.meta.type.startswith("&") and len(node.indices) < len(var.meta.array_shape))
+        elif kind is ast.Declare:   # An uninitialized pointer points to itself
+            addresses = addresses or (not node.var.local and node.var.meta.type.startswith("&"))
+        names = _FIELDS.get(kind)
+        if names is None:
+            names = _FIELDS[kind] = tuple(field.name for field in fields(node))
+        stack.extend(getattr(node, name) for name in names)
+    return References(calls, uses, addresses, reads)
+
+def reachable(roots: Iterable[str], graph: Dict[str, Set[str]]) -> Set[str]:
+    """
+    Names reachable from `roots` through the edges of `graph`, the functions a program calls or the globals it uses.
+    """
+    seen = set()
+    stack = list(roots)
+    while stack:
+        name = stack.pop()
+        if name in seen:
+            continue
+        seen.add(name)
+        stack.extend(graph.get(name, ()))
+    return seen
+
+class GlobalDeclaration(NamedTuple):
+    """
+    Class that represents what the elimination of unused globals needs to know about a global declaration.
+    """
+    name: str
+    cells: int
+    uses: Set[str]      # Globals its initial value uses
+    addresses: bool     # Takes the address of a global
+    reads: bool         # Its initial value reads stdin, so it must run
+
+    @classmethod
+    def of(cls, stmt) -> "GlobalDeclaration":
+        refs = references(stmt)
+        return cls(stmt.var.name, stmt.var.meta.size_in_cells, refs.uses - {stmt.var.name}, refs.addresses, refs.reads)
+
+def unused_globals(declarations: List[GlobalDeclaration], used: Set[str], addressed: bool) -> Dict[str, Optional[int]]:
+    """
+    Global variables that can be left out, given every declaration in order, the globals used by the
+    functions that are kept and whether they take the address of one.
+
+    Maps each unused global to the cells to reserve in its place, so that the globals after it keep their
+    address, or None if nothing after it is kept and it can simply be dropped.
+    """
+    graph = {declaration.name: declaration.uses for declaration in declarations}
+    used = reachable(used | {declaration.name for declaration in declarations if declaration.reads}, graph)
+    if addressed or any(declaration.addresses for declaration in declarations if declaration.name in used):
+        return {}
+    unused = {}
+    trailing = True
+    for declaration in reversed(declarations):
+        if declaration.name in used:
+            trailing = False
+        else:
+            unused[declaration.name] = None if trailing else declaration.cells
+    return unused
+
+class DeadCodeEliminator:
+    """
+    Class that removes the code a program can never run from a typed AST.
+
+    Inside every function it drops the statements after a return, break or continue (or after an
+    if or match all of whose branches end in one), the if branches whose condition is a false literal,
+    the branches after one whose condition is a true literal, the cases of a match on a literal
+    other than the one it takes, and the while loops that never run.
+    Across the program it drops the functions that are not reachable from main and the global
+    variables no reachable code uses. What was removed is described in `removed`.
+
+    A partial program (a unit of an incremental build) is only pruned inside its functions,
+    tox.parsing._incremental removes the functions and globals when it links the units.
+    """
+    def __init__(self):
+        self.removed: List[str] = []
+        self.reports: Dict[ast.Function, List[str]] = {}   # What was pruned in each function
+        self.function = ""      # Name of the function being pruned, for the report
+
+    def prune(self, tree: ast.Program) -> ast.Program:
+        """
+        Remove the unreachable code inside every function, the first half of `eliminate`.
+        Passes that need the pruned functions (see tox.codegen._inlining) run between the two.
+        """
+        for function in tree.functions:
+            if function.body is not None and function not in self.reports:
+                self.removed = []
+                self.function = function.data.name
+                function.body.stmts = self.stmts(function.body.stmts)
+                self.reports[function] = self.removed
+        self.removed = []
+        return tree
+
+    def eliminate(self, tree: ast.Program, partial: bool = False) -> ast.Program:
+        self.prune(tree)
+        if partial:
+            for function in tree.functions:
+                self.removed.extend(self.reports.get(function, []))
+            return tree
+
+        refs = {function: references(function.body) for function in tree.functions if function.body is not None}
+        live = reachable({"main"}, {function.data.name: ref.calls for function, ref in refs.items()})   # Globals are declared before every function, so they call none
+        functions = []
+        used = set()
+        addressed = False
+        for function in tree.functions:
+            if function.body is None:
+                continue    # A declaration, p_prog made sure the function is defined too
+            if function.data.name not in live:
+                self.removed.append(f"function '{function.data.name}' is never called")
+                continue
+            self.removed.extend(self.reports[function])
+            functions.append(function)
+            used |= refs[function].uses
+            addressed = addressed or refs[function].addresses
+        tree.functions = functions
+
+        unused = unused_globals([GlobalDeclaration.of(stmt) for stmt in tree.globals], used, addressed)
+        declarations = []
+        for stmt in tree.globals:
+            if stmt.var.name in unused:
+                self.removed.append(f"global '{stmt.var.name}' is never used")
+                if unused[stmt.var.name] is None:
+                    continue
+                if declarations and isinstance(declarations[-1], ast.Reserve):
+                    declarations[-1].size += unused[stmt.var.name]
+                else:
+                    declarations.append(ast.Reserve(unused[stmt.var.name]))
+                continue
+            declarations.append(stmt)
+        tree.globals = declarations
+        return tree
+
+    def stmts(self, stmts: List) -> List:
+        """
+        Prune a list of statements, and everything nested in them.
+        """
+        out = []
+        for i, stmt in enumerate(stmts):
+            stmt = self.stmt(stmt)
+            if stmt is None:
+                continue
+            out.append(stmt)
+            if self.terminates(stmt):
+                dropped = [rest for rest in stmts[i+1:] if not (isinstance(rest, ast.Print) and not rest.values)]
+                if dropped:
+                    self.removed.append(f"{len(dropped)} unreachable statement{'s' if len(dropped) > 1 else ''} in '{self.function}'")
+                break
+        return out
+
+    def stmt(self, stmt):
+        """
+        Prune a statement. Returns what replaces it, None to drop it.
+        """
+        if isinstance(stmt, ast.If):
+            return self._if(stmt)
+        if isinstance(stmt, ast.While) and ConstantFolder.value(stmt.cond) == 0 and stmt.cond.type == "int":
+            self.removed.append(f"while loop that never runs in '{self.function}'")
+            return None
+        if isinstance(stmt, ast.Match):
+            value = ConstantFolder.value(stmt.subject) if stmt.subject.type == "int" else None
+            cases = [ConstantFolder.value(case) if case.type == "int" else None for case, _ in stmt.cases]
+            if value is not None and None not in cases:     # Only one case can run
+                self.removed.append(f"match cases that are never taken in '{self.function}'")
+                body = self.block(next((body for case, (_, body) in zip(cases, stmt.cases) if case == value), stmt.default))
+                return ast.Block([ast.Reserve(1)] + body.stmts, body.size + 1)     # The cell of the subject, the variables of the case are after it
+            stmt.cases = [(value, self.block(body)) for value, body in stmt.cases]
+            stmt.default = self.block(stmt.default)
+        elif isinstance(stmt, (ast.While, ast.DoWhile, ast.For)):
+            stmt.body = self.block(stmt.body)
+        elif isinstance(stmt, ast.Block):
+            return self.block(stmt)
+        return stmt
+
+    def block(self, block: ast.Block) -> ast.Block:
+        block.stmts = self.stmts(block.stmts)
+        return block
+
+    def _if(self, node: ast.If):
+        branches = []
+        orelse = node.orelse
+        for i, (cond, body) in enumerate(node.branches):
+            value = ConstantFolder.value(cond) if cond.type == "int" else None
+            if value == 0:
+                self.removed.append(f"if branch that is never taken in '{self.function}'")
+                continue
+            if value is not None:   # Always taken, it is the last branch that can run
+                if i + 1 < len(node.branches) or orelse is not None:
+                    self.removed.append(f"branches after an if branch that is always taken in '{self.function}'")
+                orelse = body
+                break
+            branches.append((cond, self.block(body)))
+        orelse = self.block(orelse) if orelse is not None else None
+        if not branches:
+            return orelse
+        return ast.If(branches, orelse)
+
+    def terminates(self, stmt) -> bool:
+        """
+        Whether the statement never continues to the next one.
+        """
+        if isinstance(stmt, (ast.Return, ast.TailCall, ast.Break, ast.Continue)):
+            return True
+        if isinstance(stmt, ast.Block):
+            return any(self.terminates(inner) for inner in stmt.stmts)
+        if isinstance(stmt, ast.If):
+            return stmt.orelse is not None and self.terminates(stmt.orelse) and all(self.terminates(body) for _, body in stmt.branches)
+        if isinstance(stmt, ast.Match):
+            return self.terminates(stmt.default) and all(self.terminates(body) for _, body in stmt.cases)
+        return False
@@ -0,0 +1,161 @@
+from typing import List, Set, Tuple
+
+from tox.semantics import _ast as ast
+from tox.codegen._folding import ConstantFolder
+from tox.codegen._hoisting import Key, key
+
+class DeadStoreEliminator:
+    """
+    Class that removes the assignments to local variables whose value is never read.
+
+    A variable is live at a point if some path from there reads it before assigning it again. The
+    liveness of every variable is computed backwards over the statements of each function, running
+    loops until the variables live at their start stop changing. An assignment to a variable that is
+    not live after it is dropped, and a declaration with such a value only reserves the cell of the
+    variable. Values that have an effect or may fail at runtime (calls, reads, array elements, the
+    divisions by a variable, the conversions of strings) are still computed.
+
+    A variable whose address is taken may be read through a pointer, and the globals by any call or
+    any other function, so their assignments are left alone. Constant propagation (tox.codegen._propagation)
+    leaves many dead assignments behind, the ones whose value was replaced at every read.
+    """
+    def __init__(self):
+        self.dropped = 0    # Assignments removed
+
+    def eliminate(self, tree: ast.Program) -> ast.Program:
+        for function in tree.functions:
+            if function.body is not None:
+                self._function(function)
+        return tree
+
+    def _function(self, function: ast.Function):
+        self.addressed: Set[Key] = set()    # Variables a pointer can reach
+        for node in ast.walk(function.body):
+            kind = type(node)
+            if kind is ast.Address or (kind is ast.Index and not node.var.meta.type.startswith("&") and len(node.indices) < len(node.var.meta.array_shape)):
+                self.addressed.add(key(node.var))
+        self.needed: Set[object] = set()    # Assignments read on some path
+        self.loops: List[Tuple[Set[Key], Set[Key]]] = []   # What is live after the enclosing loops and where their continues go
+        self.stmts(function.body.stmts, set())
+        self.remove(function.body.stmts)
+
+    def tracked(self, var: ast.Symbol) -> bool:
+        return var.local and var.meta.type in ("int", "float", "string") and key(var) not in self.addressed
+
+    def uses(self, node) -> Set[Key]:
+        return {key(inner.var) for inner in ast.walk(node) if isinstance(inner, ast.Load) and self.tracked(inner.var)}
+
+    @staticmethod
+    def pure(node: ast.Expr) -> bool:
+        """
+        Whether a value can be left uncomputed: it has no effect and can't fail.
+        """
+        for inner in ast.walk(node):
+            kind = type(inner)
+            if kind is ast.Call or kind is ast.Read or kind is ast.Index:
+                return False
+            if kind is ast.Binary and inner.op in ("div", "mod") and ConstantFolder.value(inner.right) in (None, 0, -1):
+                return False
+            if kind is ast.Cast and "string" in (inner.type, inner.operand.type):
+                return False
+        return True
+
+    ######################
+    ##     LIVENESS     ##
+    ######################
+
+    def stmts(self, stmts: List, live: Set[Key]) -> Set[Key]:
+        """
+        The variables live before a list of statements, given the ones live after it.
+        """
+        for stmt in reversed(stmts):
+            live = self.stmt(stmt, live)
+        return live
+
+    def stmt(self, stmt, live: Set[Key]) -> Set[Key]:
+        kind = type(stmt)
+        if kind is ast.Assign or kind is ast.Init:
+            if not self.tracked(stmt.var):
+                return live | self.uses(stmt.value)
+            name = key(stmt.var)
+            if name not in live and self.pure(stmt.value):
+                return live - {name}
+            self.needed.add(stmt)
+            return (live - {name}) | self.uses(stmt.value)
+        if kind is ast.Declare:
+            return live - {key(stmt.var)}
+        if kind is ast.If:
+            out = self.stmts(stmt.orelse.stmts, live) if stmt.orelse is not None else live
+            for cond, body in reversed(stmt.branches):
+                out = self.uses(cond) | self.stmts(body.stmts, live) | out
+            return out
+        if kind is ast.Match:
+            out = self.uses(stmt.subject) | self.stmts(stmt.default.stmts, live)
+            for case, body in stmt.cases:   # A case can be any expression, compared before any body runs
+                out |= self.uses(case) | self.stmts(body.stmts, live)
+            return out
+        if kind is ast.While or kind is ast.DoWhile or kind is ast.For:
+            return self.loop(stmt, live)
+        if kind is ast.Block:
+            return self.stmts(stmt.stmts, live)
+        if kind is ast.Break:
+            return self.loops[-1][0]
+        if kind is ast.Continue:
+            return self.loops[-1][1]
+        if kind is ast.Return:
+            return self.uses(stmt.value) if stmt.value is not None else set()
+        return live | self.uses(stmt)   # Prints, array stores and calls only read
+
+    def loop(self, node, live: Set[Key]) -> Set[Key]:
+        """
+        The variables live before a loop, running it backwards until the ones live at its start stop changing.
+        """
+        start: Set[Key] = set()
+        while True:
+            if isinstance(node, ast.DoWhile):
+                cond = self.uses(node.cond) | live | start
+                self.loops.append((live, cond))
+                head = self.stmts(node.body.stmts, cond)
+            else:
+                updates = self.stmts(node.updates, start) if isinstance(node, ast.For) else start
+                self.loops.append((live, updates))
+                head = self.uses(node.cond) | live | self.stmts(node.body.stmts, updates)
+            self.loops.pop()
+            if head == start:
+                return self.stmts(node.inits, head) if isinstance(node, ast.For) else head
+            start = head
+
+    ######################
+    ##    REWRITING     ##
+    ######################
+
+    def remove(self, stmts: List):
+        """
+        Drop the dead assignments of a list of statements, and of the ones nested in them.
+        """
+        out = []
+        for stmt in stmts:
+            kind = type(stmt)
+            if (kind is ast.Assign or (kind is ast.Init and not isinstance(stmt.value, ast.Const))) and self.tracked(stmt.var) and stmt not in self.needed:
+                self.dropped += 1
+                if kind is ast.Init:    # The variable still takes its cell
+                    out.append(ast.Declare(stmt.var))
+                continue
+            if kind is ast.If:
+                for _, body in stmt.branches:
+                    self.remove(body.stmts)
+                if stmt.orelse is not None:
+                    self.remove(stmt.orelse.stmts)
+            elif kind is ast.Match:
+                for _, body in stmt.cases:
+                    self.remove(body.stmts)
+                self.remove(stmt.default.stmts)
+            elif kind is ast.While or kind is ast.DoWhile or kind is ast.For:
+                if kind is ast.For:
+                    self.remove(stmt.inits)
+                    self.remove(stmt.updates)
+                self.remove(stmt.body.stmts)
+            elif kind is ast.Block:
+                self.remove(stmt.stmts)
+            out.append(stmt)
+        stmts[:] = out
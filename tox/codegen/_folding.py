@@ -0,0 +1,211 @@
+import math
+import re
+import struct
+from dataclasses import fields, is_dataclass
+from decimal import Decimal
+from typing import Optional
+
+from tox.semantics import _ast as ast
+
+# The VM keeps ints in a C int and floats in a C float, and the arithmetic wraps and rounds like C does.
+# Folded values must be the ones the VM would have computed, so both are emulated here.
+INT_MIN = -2**31
+INT_MAX = 2**31 - 1
+
+INT_LITERAL = re.compile(r"-?\d+")
+FLOAT_LITERAL = re.compile(r"-?\d+(\.\d+)?")
+
+def wrap(value: int) -> int:
+    """
+    Two's complement wrap of an integer to a C int.
+    """
+    return (value - INT_MIN) % 2**32 + INT_MIN
+
+def single(value: float) -> Optional[float]:
+    """
+    Round a float to a C float. None if it does not fit one.
+    """
+    try:
+        value = struct.unpack("f", struct.pack("f", value))[0]
+    except OverflowError:
+        return None
+    return value if math.isfinite(value) else None
+
+def float_literal(value: float) -> str:
+    """
+    Shortest literal the VM reads back as the C float `value`. The VM only reads plain decimals, without an exponent.
+    """
+    for digits in range(1, 18):
+        text = f"{value:.{digits}g}"
+        if single(float(text)) == value:
+            break
+    if "e" in text:
+        text = format(Decimal(text), "f")
+    if "." not in text:
+        text += ".0"
+    return text
+
+def c_div(left: int, right: int) -> int:
+    """
+    C integer division, which truncates towards zero.
+    """
+    quotient = abs(left) // abs(right)
+    return quotient if (left < 0) == (right < 0) else -quotient
+
+class ConstantFolder:
+    """
+    Class that evaluates the operations on literals of a typed AST at compile time.
+
+    An operation is only folded if the VM would compute the same value. Anything that
+    would fail at runtime (a division by zero, an int literal the VM can't read) is kept.
+    """
+    def __init__(self):
+        self.folders = {
+            ast.Unary: self._unary,
+            ast.Binary: self._binary,
+            ast.Cast: self._cast,
+        }
+
+    def fold(self, tree: ast.Program) -> ast.Program:
+        return self.visit(tree)
+
+    def visit(self, node):
+        """
+        Fold the children of a node before the node itself, so folding works from the leaves up.
+        """
+        if isinstance(node, list):
+            return [self.visit(item) for item in node]
+        if isinstance(node, tuple):
+            return tuple(self.visit(item) for item in node)
+        if not is_dataclass(node) or type(node).__module__ != ast.__name__ or isinstance(node, ast.Symbol):
+            return node
+        for field in fields(node):
+            setattr(node, field.name, self.visit(getattr(node, field.name)))
+        folder = self.folders.get(type(node))
+        return folder(node) if folder is not None else node
+
+    @staticmethod
+    def value(node: ast.Expr):
+        """
+        Value of a literal as the VM holds it, or None if the node is not a literal the VM can read.
+        """
+        if not isinstance(node, ast.Const):
+            return None
+        if node.type == "int":
+            value = int(node.value)
+            return value if INT_MIN <= value <= INT_MAX else None
+        if node.type == "float":
+            return single(float(node.value))
+        return node.value[1:-1]     # The text between the quotes, escape sequences included
+
+    @staticmethod
+    def const(type: str, value) -> ast.Const:
+        if type == "int":
+            return ast.Const("int", str(value))
+        if type == "float":
+            return ast.Const("float", float_literal(value))
+        return ast.Const("string", f'"{value}"')
+
+    def _unary(self, node: ast.Unary) -> ast.Expr:
+        operand = self.value(node.operand)
+        if operand is None:
+            return node
+        if node.op == "neg":
+            return self.const(node.type, wrap(-operand) if node.type == "int" else -operand)
+        if node.type == "int":  # 'not' of a float leaves an int on the stack, which has no literal of the expression type
+            return self.const("int", int(operand == 0))
+        return node
+
+    def _binary(self, node: ast.Binary) -> ast.Expr:
+        left, right = self.value(node.left), self.value(node.right)
+        kind = node.left.type
+        if left is None or right is None:
+            if kind == node.right.type == "int":
+                return self._identity(node, left, right)
+            return node
+        if kind == "string":    # Only 'add' is defined on strings
+            if left.endswith("\\"):     # The backslash would escape the first character of the right operand
+                return node
+            return self.const("string", left + right)
+        if node.op in ("lt", "gt", "lte", "gte", "eq", "neq"):
+            return self.const("int", int({
+                "lt": left < right,
+                "gt": left > right,
+                "lte": left <= right,
+                "gte": left >= right,
+                "eq": left == right,
+                "neq": left != right,
+            }[node.op]))
+        if kind == "int":
+            if node.op in ("div", "mod") and (right == 0 or (left == INT_MIN and right == -1)):
+                return node     # Traps at runtime
+            result = {
+                "add": lambda: left + right,
+                "sub": lambda: left - right,
+                "mul": lambda: left * right,
+                "div": lambda: c_div(left, right),
+                "mod": lambda: left - right * c_div(left, right),
+                "and": lambda: int(left != 0 and right != 0),
+                "or": lambda: int(left != 0 or right != 0),
+            }[node.op]()
+            return self.const("int", wrap(result))
+        if node.op == "div" and right == 0:
+            return node
+        result = single({
+            "add": lambda: left + right,
+            "sub": lambda: left - right,
+            "mul": lambda: left * right,
+            "div": lambda: left / right,
+        }[node.op]())
+        return node if result is None else self.const("float", result)
+
+    def _identity(self, node: ast.Binary, left: Optional[int], right: Optional[int]) -> ast.Expr:
+        """
+        Drop the int operations that leave the other operand unchanged, 'x * 1' and 'x + 0'.
+        The other operand is still evaluated, so nothing it does is lost.
+        """
+        if (node.op == "mul" and right == 1) or (node.op in ("add", "sub") and right == 0):
+            return node.left
+        if (node.op == "mul" and left == 1) or (node.op == "add" and left == 0):
+            return node.right
+        if node.op in ("add", "sub"):
+            return self._offset(node)
+        return node
+
+    def _offset(self, node: ast.Binary) -> ast.Expr:
+        """
+        Merge the literals of a chain of int additions and subtractions, 'i + 1 - 2' is 'i - 1'.
+        Ints wrap, so this is exact whatever the value of 'i'.
+        """
+        inner = node.left
+        if not (isinstance(inner, ast.Binary) and inner.op in ("add", "sub") and inner.left.type == inner.right.type == "int"):
+            return node
+        first, second = self.value(inner.right), self.value(node.right)
+        if first is None or second is None:
+            return node
+        offset = wrap((first if inner.op == "add" else -first) + (second if node.op == "add" else -second))
+        if offset == 0:
+            return inner.left
+        if offset < 0 and offset != INT_MIN:
+            return ast.Binary("int", "sub", inner.left, self.const("int", -offset))
+        return ast.Binary("int", "add", inner.left, self.const("int", offset))
+
+    def _cast(self, node: ast.Cast) -> ast.Expr:
+        operand = self.value(node.operand)
+        source = node.operand.type
+        if operand is None:
+            return node
+        if source == "int":
+            return self.const("float", single(float(operand))) if node.type == "float" else self.const("string", str(operand))
+        if source == "float":
+            if node.type == "string":
+                return self.const("string", ("%f" % operand)[:14])    # The VM formats it in a 15 byte buffer
+            result = int(operand)   # C truncates towards zero
+            return self.const("int", result) if INT_MIN <= result <= INT_MAX else node
+        if node.type == "int" and INT_LITERAL.fullmatch(operand):
+            result = int(operand)
+            return self.const("int", result) if INT_MIN <= result <= INT_MAX else node
+        if node.type == "float" and FLOAT_LITERAL.fullmatch(operand):
+            result = single(float(operand))
+            return node if result is None else self.const("float", result)
+        return node
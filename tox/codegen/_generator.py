@@ -0,0 +1,583 @@
+from typing import Dict, List, Optional, Tuple
+
+from tox.semantics import _ast as ast
+from tox.codegen._program import LABEL, Instruction, Program
+from tox.codegen._folding import INT_MIN, INT_MAX
+
+# Instructions of the binary operations on (int, float) operands. Pointers use the int ones.
+BINARY = {
+    "mul": (["MUL"], ["FMUL"]),
+    "div": (["DIV"], ["FDIV"]),
+    "mod": (["MOD"], None),
+    "add": (["ADD"], ["FADD"]),
+    "sub": (["SUB"], ["FSUB"]),
+    "lt": (["INF"], ["FINF", "FTOI"]),
+    "gt": (["SUP"], ["FSUP", "FTOI"]),
+    "lte": (["INFEQ"], ["FINFEQ", "FTOI"]),
+    "gte": (["SUPEQ"], ["FSUPEQ", "FTOI"]),
+    "eq": (["EQUAL"], ["EQUAL"]),
+    "neq": (["EQUAL", "NOT"], ["EQUAL", "NOT"]),
+    "and": (["AND"], None),
+    "or": (["OR"], None),
+}
+
+CAST_FROM = {"int": "ITO", "float": "FTO", "string": "ATO"}
+CAST_TO = {"int": "I", "float": "F", "string": "A"}
+WRITE = {"int": "WRITEI", "float": "WRITEF", "string": "WRITES"}
+
+class CodeGenerator:
+    """
+    Class that generates the EWVM code of a typed AST (see tox.semantics._ast).
+
+    Labels are local to each function: they are prefixed with its name and numbered from 0 in
+    every function, so the code of a function does not depend on the ones before it.
+    """
+    def __init__(self):
+        self.code: List[Instruction] = []
+        self.function: Optional[ast.Function] = None
+        self.prefix = ""            # Name of the function whose labels are being generated
+        self.labels: Dict = {}      # Numbers of the labels of every if, match and loop of the function
+        self.loops: List[Tuple[int, int, int]] = []     # Numbers of the enclosing loops and the depths break and continue jump to
+        self.matches = 0            # Enclosing matches, whose subject is on the stack
+        self.depth = 0              # Cells of the frame taken by variables and match subjects, for tail calls
+        self.params = 0             # Parameters of the function being generated, which stay below its frame
+        self.inlines = 0            # Inlined calls generated so far in the function, for their labels
+        self.inline: Optional[Tuple[ast.Inline, int]] = None    # Inlined call being generated and the matches around it
+        self.fence = 0              # Code before it is never merged with what follows, see zeros
+        self.emitters = {
+            ast.Const: self._const,
+            ast.Load: self._load,
+            ast.Address: self._address,
+            ast.Index: self._index,
+            ast.Unary: self._unary,
+            ast.Binary: self._binary,
+            ast.Cast: self._cast,
+            ast.Call: self._call,
+            ast.Inline: self._inline,
+            ast.Cache: self._cache,
+            ast.TailCall: self._tail_call,
+            ast.Read: self._read,
+            ast.Print: self._print,
+            ast.Declare: self._declare,
+            ast.Init: self._init,
+            ast.ArrayInit: self._array_init,
+            ast.RangeInit: self._range_init,
+            ast.Reserve: self._reserve,
+            ast.Assign: self._assign,
+            ast.IndexAssign: self._index_assign,
+            ast.If: self._if,
+            ast.Match: self._match,
+            ast.While: self._while,
+            ast.DoWhile: self._do_while,
+            ast.For: self._for,
+            ast.Break: self._break,
+            ast.Continue: self._continue,
+            ast.Return: self._return,
+            ast.Block: self.block,
+        }
+
+    def generate(self, tree: ast.Program, partial: bool = False) -> Program:
+        """
+        Generate the code of a program. A partial program (a unit of an incremental build) has no entry point.
+        """
+        for stmt in tree.globals:   # An incremental build generates each global declaration on its own
+            self.fence = len(self.code)
+            self.emit(stmt)
+        if not partial:
+            self.op("start")
+            self.op("PUSHA", "main")
+            self.op("CALL")
+            self.op("stop")
+        for function in tree.functions:
+            self._function(function)
+        return Program(self.code)
+
+    def emit(self, node):
+        self.emitters[type(node)](node)
+
+    def op(self, op: str, arg=None):
+        self.code.append(Instruction(op, arg))
+
+    def zeros(self, n: int):
+        """
+        Push the int zeros of `n` new cells. The cells of consecutive declarations, reserves and
+        zero array items are taken by a single PUSHN.
+        """
+        last = self.code[-1] if len(self.code) > self.fence else None
+        if last is not None and (last.op == "PUSHN" or (last.op == "PUSHI" and str(last.arg) == "0")):
+            self.code.pop()
+            n += int(last.arg) if last.op == "PUSHN" else 1
+        if n == 1:
+            self.op("PUSHI", 0)
+        else:
+            self.op("PUSHN", n)
+
+    def label(self, name: str):
+        self.code.append(Instruction(LABEL, f"{self.prefix}{name}"))
+
+    def block(self, block: ast.Block):
+        """
+        The statements of a scope, then drop its variables.
+        """
+        depth = self.depth
+        for stmt in block.stmts:
+            self.emit(stmt)
+        self.op("POP", block.size)
+        self.depth = depth
+
+    def _function(self, function: ast.Function):
+        self.function = function
+        self.prefix = function.data.name.replace('_', '')
+        self.code.append(Instruction(LABEL, self.prefix))
+        if function.body is None:
+            return
+        self.params = len(function.params)
+        self.depth = 0
+        if any(isinstance(node, ast.TailCall) for node in ast.walk(function.body)):
+            self.label("START")     # Where tail calls jump back to
+
+        self.labels = {}
+        self.inlines = 0
+        self._number(function.body.stmts, {"if": 0, "rel_if": 0, "match": 0, "rel_match": 0, "loop": 0})
+        for stmt in function.body.stmts:
+            self.emit(stmt)
+        if function.data.output_type is None and not ast.ends_with_return(function.body.stmts):
+            self.op("RETURN")
+
+    def _number(self, stmts: List, counts: Dict[str, int]):
+        """
+        Number the labels of the ifs, matches and loops of a function in post order, inner constructs first.
+        """
+        for stmt in stmts:
+            kind = type(stmt)
+            if kind is ast.If:
+                for _, body in stmt.branches:
+                    self._number(body.stmts, counts)
+                if stmt.orelse is not None:
+                    self._number(stmt.orelse.stmts, counts)
+                counts["rel_if"] += 1
+                first = counts["if"]
+                counts["if"] += len(stmt.branches)
+                self.labels[stmt] = (counts["rel_if"], [first + len(stmt.branches) - 1 - i for i in range(len(stmt.branches))])   # The last branch is numbered first
+            elif kind is ast.Match:
+                for _, body in stmt.cases:
+                    self._number(body.stmts, counts)
+                self._number(stmt.default.stmts, counts)
+                counts["rel_match"] += 1
+                first = counts["match"]
+                counts["match"] += len(stmt.cases) + 1
+                self.labels[stmt] = (counts["rel_match"], [first + len(stmt.cases) - 1 - i for i in range(len(stmt.cases))])
+            elif kind is ast.While or kind is ast.DoWhile or kind is ast.For:
+                self._number(stmt.body.stmts, counts)
+                self.labels[stmt] = counts["loop"]
+                counts["loop"] += 1
+            elif kind is ast.Block:
+                self._number(stmt.stmts, counts)
+
+    ######################
+    ##    STATEMENTS    ##
+    ######################
+
+    def _print(self, node: ast.Print):
+        for value in node.values:
+            self.emit(value)
+            self.op(WRITE[value.type])
+
+    def _declare(self, node: ast.Declare):
+        type, size = node.var.meta.type, node.var.meta.size_in_cells
+        if type == "int":
+            self.zeros(1)
+        elif type == "float":
+            self.op("PUSHF", "0.0")
+        elif type == "string":
+            self.op("PUSHS", '""')
+        elif type.startswith("&"):  # Uninitialized pointers point to themselves
+            self.address(node.var)
+        elif type == "vec<int>":
+            self.zeros(size)
+        elif type == "vec<float>":
+            for _ in range(size):
+                self.op("PUSHF", "0.0")
+        elif type == "vec<string>":
+            for _ in range(size):
+                self.op("PUSHS", "''")
+
+        self.depth += node.var.meta.size_in_cells
+
+    def _init(self, node: ast.Init):
+        self.emit(node.value)
+        self.depth += node.var.meta.size_in_cells
+
+    def _array_init(self, node: ast.ArrayInit):
+        for item in node.items:
+            if item.type == "int" and self.literal(item) == 0:
+                self.zeros(1)
+            else:
+                self.emit(item)
+        self.depth += node.var.meta.size_in_cells
+
+    def _range_init(self, node: ast.RangeInit):
+        for i in range(node.start, node.end + 1):
+            if i == 0:
+                self.zeros(1)
+            else:
+                self.op("PUSHI", i)
+        self.depth += node.var.meta.size_in_cells
+
+    def _reserve(self, node: ast.Reserve):
+        self.zeros(node.size)
+        self.depth += node.size
+
+    def _assign(self, node: ast.Assign):
+        self.emit(node.value)
+        self.op("STOREL" if node.var.local else "STOREG", self.slot(node.var))
+
+    def _index_assign(self, node: ast.IndexAssign):
+        offset = self._offset(node.var, node.indices)
+        if offset is not None:  # A cell known at compile time, stored like a variable
+            self.emit(node.value)
+            self.op("STOREL" if node.var.local else "STOREG", self.slot(node.var) + offset)
+            return
+        offset = self._element(node.var, node.indices)
+        self.emit(node.value)
+        self.op("STORE", offset)
+
+    def _if(self, node: ast.If):
+        finish, numbers = self.labels[node]
+        for i, (cond, body) in enumerate(node.branches):
+            end = f"{'IFLABEL' if i == 0 else 'ELSEIFLABEL'}{numbers[i]}END"
+            self.emit(cond)
+            self.op("JZ", f"{self.prefix}{end}")       # Skip the branch if the condition is false
+            self.block(body)
+            self.op("JUMP", f"{self.prefix}FINISHIF{finish}")  # Skip the other branches
+            self.label(end)
+        if node.orelse is not None:
+            self.block(node.orelse)
+        self.label(f"FINISHIF{finish}")
+
+    def _match(self, node: ast.Match):
+        finish, numbers = self.labels[node]
+        self.emit(node.subject)     # Stays on the stack while the cases are compared to it
+        self.matches += 1
+        self.depth += 1
+        for i, (case, body) in enumerate(node.cases):
+            self.op("DUP", 1)
+            self.emit(case)
+            self.op("EQUAL")
+            self.op("JZ", f"{self.prefix}matchLABEL{numbers[i]}END")
+            self.block(body)
+            self.op("JUMP", f"{self.prefix}FINISHmatch{finish}")
+            self.label(f"matchLABEL{numbers[i]}END")
+        self.block(node.default)
+        self.matches -= 1
+        self.depth -= 1
+        self.label(f"FINISHmatch{finish}")
+        self.op("POP", 1)
+
+    def _while(self, node: ast.While):
+        n = self.labels[node]
+        self.label(f"LOOP{n}START")
+        self.emit(node.cond)
+        self.op("JZ", f"{self.prefix}LOOP{n}END")
+        depth = self.depth
+        self.loops.append((n, depth, depth + node.body.size))
+        for stmt in node.body.stmts:
+            self.emit(stmt)
+        self.depth = depth
+        self.loops.pop()
+        self.label(f"NEXTLOOP{n}")
+        self.op("POP", node.body.size)
+        self.op("JUMP", f"{self.prefix}LOOP{n}START")
+        self.label(f"LOOP{n}END")
+
+    def _do_while(self, node: ast.DoWhile):
+        n = self.labels[node]
+        self.label(f"LOOP{n}START")
+        depth = self.depth
+        self.loops.append((n, depth, depth + node.body.size))
+        for stmt in node.body.stmts:
+            self.emit(stmt)
+        self.depth = depth
+        self.loops.pop()
+        self.label(f"NEXTLOOP{n}")
+        self.op("POP", node.body.size)
+        self.emit(node.cond)
+        self.op("JZ", f"{self.prefix}LOOP{n}END")
+        self.op("JUMP", f"{self.prefix}LOOP{n}START")
+        self.label(f"LOOP{n}END")
+
+    def _for(self, node: ast.For):
+        n = self.labels[node]
+        depth = self.depth
+        for init in node.inits:
+            self.emit(init)
+        self.label(f"LOOP{n}START")
+        self.emit(node.cond)
+        self.op("JZ", f"{self.prefix}LOOP{n}END")
+        body = self.depth
+        self.loops.append((n, body, body + node.body.size))
+        for stmt in node.body.stmts:
+            self.emit(stmt)
+        self.depth = body
+        self.loops.pop()
+        self.label(f"NEXTLOOP{n}")      # Continue statements jump here
+        for update in node.updates:
+            self.emit(update)
+        self.op("POP", node.body.size)
+        self.op("JUMP", f"{self.prefix}LOOP{n}START")
+        self.label(f"LOOP{n}END")
+        self.op("POP", node.size)       # The variables of the initialization
+        self.depth = depth
+
+    def unwind(self, depth: int):
+        """
+        Bring the stack to `depth` cells before a jump, the depth the code at the target expects.
+        """
+        if self.depth > depth:
+            self.op("POP", self.depth - depth)
+        elif self.depth < depth:    # A continue before some variables of the loop body are declared
+            self.op("PUSHN", depth - self.depth)
+
+    def _break(self, node: ast.Break):
+        n, depth, _ = self.loops[-1]
+        self.unwind(depth)
+        self.op("JUMP", f"{self.prefix}LOOP{n}END")
+
+    def _continue(self, node: ast.Continue):
+        n, _, depth = self.loops[-1]
+        self.unwind(depth)
+        self.op("JUMP", f"{self.prefix}NEXTLOOP{n}")
+
+    def _tail_call(self, node: ast.TailCall):
+        """
+        Set the parameters to the arguments, drop the rest of the frame and start the function again.
+        """
+        for arg in reversed(node.args):     # Every argument is computed before any parameter changes
+            self.emit(arg)
+        for k in range(len(node.args)):
+            self.op("STOREL", -k-1)
+        self.unwind(0)
+        self.op("JUMP", f"{self.prefix}START")
+
+    def _return(self, node: ast.Return):
+        if self.inline is not None:     # Leave the copy of the body instead of the function
+            inline, matches = self.inline
+            if node.value is not None:
+                self.emit(node.value)
+                self.op("STOREL", self.slot(inline.result))
+            if self.matches > matches:
+                self.op("POP", self.matches - matches)
+            self.op("JUMP", f"{self.prefix}END")
+            return
+        if node.value is not None:
+            self.emit(node.value)
+            self.op("STOREL", -max(self.params, 1))  # The cell of the last argument, or the one pushed by the caller
+        self.op("RETURN")
+
+    ######################
+    ##   EXPRESSIONS    ##
+    ######################
+
+    def _const(self, node: ast.Const):
+        self.op({"int": "PUSHI", "float": "PUSHF", "string": "PUSHS"}[node.type], node.value)
+
+    def _load(self, node: ast.Load):
+        self.value(node.var)
+
+    def _address(self, node: ast.Address):
+        self.address(node.var)
+
+    def value(self, var: ast.Symbol, offset: int = 0):
+        """
+        The value of a variable, or of the cell `offset` cells after it.
+        """
+        self.op("PUSHL" if var.local else "PUSHG", self.slot(var) + offset)
+
+    def address(self, var: ast.Symbol):
+        self.op("PUSHFP" if var.local else "PUSHGP")
+        if self.slot(var) != 0:
+            self.op("PUSHI", self.slot(var))
+            self.op("PADD")
+
+    def load(self, offset: int):
+        """
+        Load the cell `offset` cells after the address on the stack. An index just added to the
+        address is loaded with it by a single LOADN.
+        """
+        if offset == 0 and self.code[-1].op == "PADD":
+            self.code[-1] = Instruction("LOADN")
+        else:
+            self.op("LOAD", offset)
+
+    def slot(self, var: ast.Symbol) -> int:
+        """
+        Offset of a variable from the frame pointer, or from the start of the globals.
+
+        The arguments are pushed by the caller in reverse, right below the frame, and the
+        parameters are used where they are: the one in slot k is k+1 cells below the frame.
+        The variables take the frame from its first cell.
+        """
+        if not var.local:
+            return var.slot
+        if var.slot < self.params:
+            return -var.slot - 1
+        return var.slot - self.params
+
+    @staticmethod
+    def literal(node: ast.Expr) -> Optional[int]:
+        """
+        Value of an int literal the VM can read, None for anything else.
+        """
+        if isinstance(node, ast.Const) and node.type == "int" and INT_MIN < int(node.value) <= INT_MAX:
+            return int(node.value)
+        return None
+
+    @staticmethod
+    def strides(var: ast.Symbol) -> List[int]:
+        """
+        Cells taken by one step in each dimension of an array, computed from its shape.
+        """
+        strides = [1]
+        for dim in reversed(var.meta.array_shape[1:]):
+            strides.append(strides[-1] * dim)
+        return strides[::-1]
+
+    def _offset(self, var: ast.Symbol, indices: List[ast.Expr]) -> Optional[int]:
+        """
+        Cells between an array and the element at `indices`, if every index is a literal.
+        """
+        if var.meta.type.startswith("&"):
+            return None
+        offset = 0
+        for index, stride in zip(indices, self.strides(var)):
+            if self.literal(index) is None:
+                return None
+            offset += self.literal(index) * stride
+        return offset if INT_MIN <= self.slot(var) + offset <= INT_MAX else None
+
+    def _element(self, var: ast.Symbol, indices: List[ast.Expr]) -> int:
+        """
+        Push a base address of an element of an array or pointer and return the offset of the element from it.
+
+        Literal indices only add to the offset, which the LOAD or STORE of the element applies for free.
+        Only the other indices are computed at runtime.
+        """
+        if var.meta.type.startswith("&"):
+            self.value(var)
+            if self.literal(indices[0]) is not None:
+                return self.literal(indices[0])
+            self.emit(indices[0])
+            self.op("PADD")
+            return 0
+        self.op("PUSHFP" if var.local else "PUSHGP")
+        offset = self.slot(var)
+        for index, stride in zip(indices, self.strides(var)):
+            if self.literal(index) is not None and INT_MIN <= offset + self.literal(index) * stride <= INT_MAX:
+                offset += self.literal(index) * stride
+                continue
+            self.emit(index)
+            if stride != 1:
+                self.op("PUSHI", stride)
+                self.op("MUL")
+            self.op("PADD")
+        return offset
+
+    def _index(self, node: ast.Index):
+        if node.var.meta.type.startswith("&") or len(node.indices) == len(node.var.meta.array_shape):
+            offset = self._offset(node.var, node.indices)
+            if offset is not None:
+                self.value(node.var, offset)
+                return
+            self.load(self._element(node.var, node.indices))
+            return
+        offset = self._element(node.var, node.indices)  # A row of an array, its address
+        if offset != 0:
+            self.op("PUSHI", offset)
+            self.op("PADD")
+
+    def _unary(self, node: ast.Unary):
+        self.emit(node.operand)
+        if node.op == "not":
+            self.op("NOT")
+        elif node.type == "int":
+            self.op("PUSHI", -1)
+            self.op("MUL")
+        else:
+            self.op("PUSHF", "-1.0")
+            self.op("FMUL")
+
+    def _binary(self, node: ast.Binary):
+        left = node.left.type
+        if left == "string":    # Only 'add' is defined on strings
+            self.emit(node.right)
+            self.emit(node.left)
+            self.op("CONCAT")
+            return
+        self.emit(node.left)
+        if left.startswith("&") and node.op == "sub" and self.literal(node.right) is not None:
+            self.op("PUSHI", -self.literal(node.right))
+            self.op("PADD")
+            return
+        self.emit(node.right)
+        if left.startswith("&") and node.op == "add":
+            self.op("PADD")
+        elif left.startswith("&") and node.op == "sub" and node.right.type == "int":
+            self.op("PUSHI", -1)
+            self.op("MUL")
+            self.op("PADD")
+        else:
+            for op in BINARY[node.op][left == "float"]:
+                self.op(op)
+
+    def _cast(self, node: ast.Cast):
+        self.emit(node.operand)
+        self.op(CAST_FROM[node.operand.type] + CAST_TO[node.type])
+
+    def _call(self, node: ast.Call):
+        params = len(node.function.input_types)
+        if node.type is not None and params == 0:
+            self.op("PUSHI", 0)     # Cell for the return value, a function with parameters leaves it in the cell of its last argument
+        for arg in reversed(node.args):
+            self.emit(arg)
+        self.op("PUSHA", node.function.name.replace('_', ''))
+        self.op("CALL")
+        if node.type is not None:
+            params -= 1
+        if params > 0:
+            self.op("POP", params)
+
+    def _inline(self, node: ast.Inline):
+        """
+        A copy of the body of a function instead of a call to it. Its labels get a prefix of their own.
+        """
+        for arg in reversed(node.args):     # Pushed like the arguments of a call, then moved to the parameters
+            self.emit(arg)
+        for param in node.params:
+            self.op("STOREL", self.slot(param))
+        prefix, loops = self.prefix, self.loops
+        self.prefix, self.loops = f"{prefix}INLINE{self.inlines}", []
+        self.inlines += 1
+        self._number(node.body.stmts, {"if": 0, "rel_if": 0, "match": 0, "rel_match": 0, "loop": 0})
+        self.inline = (node, self.matches)
+        for stmt in node.body.stmts:
+            self.emit(stmt)
+        self.inline = None
+        self.label("END")
+        self.prefix, self.loops = prefix, loops
+        if node.result is not None:
+            self.value(node.result)
+
+    def _cache(self, node: ast.Cache):
+        self.emit(node.value)
+        self.op("DUP", 1)
+        self.op("STOREL", self.slot(node.cell))
+
+    def _read(self, node: ast.Read):
+        for value in node.prompt:
+            self.emit(value)
+            self.op(WRITE[value.type])
+        self.op("READ")
+        if node.type == "int":
+            self.op("ATOI")
+        elif node.type == "float":
+            self.op("ATOF")
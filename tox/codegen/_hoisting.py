@@ -0,0 +1,237 @@
+from dataclasses import fields, is_dataclass
+from typing import Dict, List, Set, Union
+
+from tox.semantics import _ast as ast
+from tox.semantics._scopes import MetaData
+from tox.codegen._folding import ConstantFolder
+
+LOOPS = (ast.While, ast.DoWhile, ast.For)
+
+Key = Union[int, str]   # A local variable by its metadata, a global by its name
+
+def key(var: ast.Symbol) -> Key:
+    return id(var.meta) if var.local else var.name
+
+class LoopInvariantHoister:
+    """
+    Class that computes the expressions whose value can't change while a loop runs once, before the loop.
+
+    An expression is invariant in a loop if the loop writes none of the variables it reads. A loop
+    that calls a function or stores through a pointer may write any global, array or variable whose
+    address is taken, so the expressions reading those are not. Only the expressions that can't fail
+    are moved, since the loop may not run them at all: no division by a variable, no read of an array
+    element at an index computed at runtime, no conversion of a string. The address of a row of an
+    array (`gen[c][...]` with `c` invariant) is moved too, and the accesses to the row go through it.
+
+    The values live in cells reserved at the start of the frame, right after the parameters, like the
+    ones of tox.codegen._inlining. The loops of a loop can reuse the cells of its siblings.
+    """
+    def __init__(self):
+        self.hoisted = 0    # Expressions moved out of a loop
+
+    def hoist(self, tree: ast.Program) -> ast.Program:
+        for function in tree.functions:
+            if function.body is not None:
+                self._function(function)
+        return tree
+
+    def _function(self, function: ast.Function):
+        self.base = len(function.params)    # First cell after the parameters
+        frame = {id(symbol.meta): symbol.meta for symbol in ast.walk(function.body) if isinstance(symbol, ast.Symbol) and symbol.local}
+        self.addressed: Set[Key] = set()    # Variables a pointer can reach
+        for node in ast.walk(function.body):
+            kind = type(node)
+            if kind is ast.Address or (kind is ast.Index and not node.var.meta.type.startswith("&") and len(node.indices) < len(node.var.meta.array_shape)) or \
+                    (kind is ast.Declare and node.var.meta.type.startswith("&")):   # An uninitialized pointer points to itself
+                self.addressed.add(key(node.var))
+        self.reserved = 0   # Cells taken by the hoisted values
+        self.stmts(function.body.stmts, 0)
+        if not self.reserved:
+            return
+        reserved = self.reserved
+        for meta in frame.values():
+            if meta.stack_position[0] >= self.base:
+                meta.stack_position = (meta.stack_position[0] + reserved, meta.stack_position[1] + reserved)
+        if function.body.stmts and isinstance(function.body.stmts[0], ast.Reserve):    # The cells of inlined calls
+            function.body.stmts[0].size += reserved
+        else:
+            function.body.stmts.insert(0, ast.Reserve(reserved))
+
+    def stmts(self, stmts: List, live: int):
+        """
+        Hoist out of the loops of a list of statements, and of the loops nested in them.
+        `live` cells are taken by the values hoisted out of the enclosing loops.
+        """
+        i = 0
+        while i < len(stmts):
+            stmt = stmts[i]
+            if isinstance(stmt, LOOPS):
+                before = self.loop(stmt, live)
+                stmts[i:i] = before
+                i += len(before)
+                inner = live + len(before)
+                self.inlines([stmt.inits, stmt.cond, stmt.updates] if isinstance(stmt, ast.For) else stmt.cond, inner)
+                self.stmts(stmt.body.stmts, inner)
+            else:
+                self.inlines(stmt, live)
+                if isinstance(stmt, ast.If):
+                    for _, body in stmt.branches:
+                        self.stmts(body.stmts, live)
+                    if stmt.orelse is not None:
+                        self.stmts(stmt.orelse.stmts, live)
+                elif isinstance(stmt, ast.Match):
+                    for _, body in stmt.cases:
+                        self.stmts(body.stmts, live)
+                    self.stmts(stmt.default.stmts, live)
+                elif isinstance(stmt, ast.Block):
+                    self.stmts(stmt.stmts, live)
+            i += 1
+
+    def inlines(self, node, live: int):
+        """
+        Hoist out of the loops of the inlined calls in a tree, without entering its blocks.
+        """
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, (list, tuple)):
+                stack.extend(node)
+            elif isinstance(node, ast.Inline):
+                stack.extend(node.args)
+                self.stmts(node.body.stmts, live)
+            elif is_dataclass(node) and type(node).__module__ == ast.__name__ and not isinstance(node, (ast.Symbol, ast.Block)):
+                stack.extend(getattr(node, field.name) for field in fields(node))
+
+    def loop(self, loop, live: int) -> List:
+        """
+        Replace the invariant expressions of a loop by the cells they are computed into. Returns the assignments to put before it.
+        """
+        self.written: Set[Key] = set()
+        self.memory = False     # Stores to memory a pointer can reach
+        for node in ast.walk(loop):
+            kind = type(node)
+            if kind is ast.Assign or kind is ast.Declare or kind is ast.Init or kind is ast.ArrayInit or kind is ast.RangeInit:
+                self.written.add(key(node.var))
+            elif kind is ast.IndexAssign:
+                if node.var.meta.type.startswith("&"):
+                    self.memory = True
+                self.written.add(key(node.var))
+            elif kind is ast.Call:
+                self.memory = True
+            elif kind is ast.Inline:
+                self.written.update(key(param) for param in node.params)
+                if node.result is not None:
+                    self.written.add(key(node.result))
+        self.invariants: Dict[ast.Expr, bool] = {}
+        self.values: Dict[tuple, ast.Symbol] = {}
+        self.before: List = []
+        self.live = live
+        loop.cond = self.visit(loop.cond)
+        if isinstance(loop, ast.For):     # Not the initialization, it runs once anyway
+            loop.updates = self.visit(loop.updates)
+        loop.body = self.visit(loop.body)
+        return self.before
+
+    def invariant(self, node) -> bool:
+        """
+        Whether an expression has the same value in every iteration and can be computed even if the loop never runs it.
+        """
+        found = self.invariants.get(node)
+        if found is not None:
+            return found
+        kind = type(node)
+        if kind is ast.Const:
+            found = True
+        elif kind is ast.Load:
+            found = self.readable(node.var)
+        elif kind is ast.Address:
+            found = True
+        elif kind is ast.Index:
+            var = node.var
+            if var.meta.type.startswith("&"):
+                found = False
+            elif len(node.indices) < len(var.meta.array_shape):    # An address, nothing is read
+                found = all(self.invariant(index) for index in node.indices)
+            else:
+                found = all(ConstantFolder.value(index) is not None and index.type == "int" for index in node.indices) and \
+                    self.readable(var) and not self.memory
+        elif kind is ast.Unary:
+            found = self.invariant(node.operand)
+        elif kind is ast.Cast:
+            found = "string" not in (node.type, node.operand.type) and self.invariant(node.operand)
+        elif kind is ast.Binary:
+            found = self.invariant(node.left) and self.invariant(node.right)
+            if node.op in ("div", "mod"):   # Only by a literal that can't trap
+                found = found and ConstantFolder.value(node.right) not in (None, 0, -1)
+        else:
+            found = False
+        self.invariants[node] = found
+        return found
+
+    def readable(self, var: ast.Symbol) -> bool:
+        """
+        Whether the loop can't change the variable.
+        """
+        if key(var) in self.written:
+            return False
+        return not (self.memory and (not var.local or key(var) in self.addressed))
+
+    def visit(self, node):
+        if isinstance(node, list):
+            return [self.visit(item) for item in node]
+        if isinstance(node, tuple):
+            return tuple(self.visit(item) for item in node)
+        if not is_dataclass(node) or type(node).__module__ != ast.__name__ or isinstance(node, ast.Symbol):
+            return node
+        kind = type(node)
+        if kind in (ast.Binary, ast.Unary, ast.Cast, ast.Address, ast.Index) and self.invariant(node) and \
+                (kind is not ast.Index or len(node.indices) < len(node.var.meta.array_shape)):  # A single element is a single load already
+            return ast.Load(node.type, self.cell(node))
+        if kind in (ast.Index, ast.IndexAssign) and self.row(node):
+            var = node.var
+            row = self.cell(ast.Index("&" + var.meta.type[4:-1], var, node.indices[:-1]))
+            node.var, node.indices = row, node.indices[-1:]
+        for field in fields(node):
+            setattr(node, field.name, self.visit(getattr(node, field.name)))
+        return node
+
+    def row(self, node) -> bool:
+        """
+        Whether the element of an array is in a row whose address is invariant and not known at compile time.
+        """
+        var = node.var
+        if var.meta.type.startswith("&") or len(node.indices) < 2 or len(node.indices) != len(var.meta.array_shape):
+            return False
+        rows = node.indices[:-1]
+        return all(self.invariant(index) for index in rows) and any(ConstantFolder.value(index) is None for index in rows)
+
+    def cell(self, node: ast.Expr) -> ast.Symbol:
+        """
+        The cell the value of an invariant expression is computed into before the loop.
+        """
+        signature = self.signature(node)
+        symbol = self.values.get(signature)
+        if symbol is None:
+            n = self.live + len(self.before)
+            self.reserved = max(self.reserved, n + 1)
+            symbol = self.values[signature] = ast.Symbol(f"invariant{n}", MetaData(node.type, (self.base + n, self.base + n)), True)
+            self.before.append(ast.Assign(symbol, node))
+            self.hoisted += 1
+        return symbol
+
+    def signature(self, node) -> tuple:
+        """
+        What an invariant expression computes, equal for the expressions with the same value.
+        """
+        kind = type(node)
+        if kind is ast.Const:
+            return ("const", node.type, node.value)
+        if kind is ast.Load or kind is ast.Address:
+            return (kind.__name__, key(node.var))
+        if kind is ast.Index:
+            return ("index", key(node.var), tuple(self.signature(index) for index in node.indices))
+        if kind is ast.Unary:
+            return ("unary", node.op, node.type, self.signature(node.operand))
+        if kind is ast.Cast:
+            return ("cast", node.type, self.signature(node.operand))
+        return ("binary", node.op, node.type, self.signature(node.left), self.signature(node.right))
@@ -0,0 +1,139 @@
+from dataclasses import fields, is_dataclass
+from typing import Callable, Dict, Optional
+
+from tox.semantics import _ast as ast
+from tox.semantics._scopes import MetaData
+
+ZERO = {"int": "0", "float": "0.0", "string": '""'}    # What a declaration without a value stores in a variable
+
+Lookup = Callable[[str], Optional[ast.Function]]
+
+class Inliner:
+    """
+    Class that replaces the calls to small leaf functions with a copy of their body.
+
+    A function is inlined if it calls no other function (so it can't be recursive), declares no
+    array and its body has at most `max_size` nodes. Only the functions defined before the caller
+    are inlined: the units of an incremental build only know the functions before them, and
+    must inline the same calls as the whole program.
+
+    The parameters and variables of every copy share cells reserved at the start of the frame of the
+    caller, right after its parameters, and the variables of the caller are moved up to make room.
+    The calls inside the arguments of a call are inlined first, and every argument is evaluated
+    before any parameter is set, so nested copies never overwrite each other's cells.
+    Inlined functions that are no longer called are removed by tox.codegen._dead_code.
+    """
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.checked: Dict[ast.Function, bool] = {}     # Whether each function seen so far can be inlined
+
+    def inline(self, tree: ast.Program, earlier: Optional[Lookup] = None) -> ast.Program:
+        """
+        Inline the calls of every function. `earlier` finds the functions defined before the program,
+        for a unit of an incremental build.
+        """
+        defined: Dict[str, ast.Function] = {}
+        def lookup(name: str) -> Optional[ast.Function]:
+            if name in defined:
+                return defined[name]
+            return earlier(name) if earlier is not None else None
+
+        for function in tree.functions:
+            if function.body is not None:
+                self._function(function, lookup)
+                defined[function.data.name] = function
+        return tree
+
+    def inlinable(self, function: ast.Function) -> bool:
+        if function.body is None:
+            return False
+        if function not in self.checked:
+            size = 0
+            for node in ast.walk(function.body):
+                size += 1
+                if size > self.max_size or isinstance(node, (ast.Call, ast.Inline, ast.TailCall, ast.Reserve)) or \
+                        (isinstance(node, (ast.Declare, ast.ArrayInit, ast.RangeInit)) and node.var.meta.type.startswith("vec")):
+                    self.checked[function] = False
+                    break
+            else:
+                self.checked[function] = True
+        return self.checked[function]
+
+    def _function(self, function: ast.Function, lookup: Lookup):
+        base = len(function.params)     # First cell after the parameters
+        frame = {id(symbol.meta): symbol.meta for symbol in ast.walk(function.body) if isinstance(symbol, ast.Symbol) and symbol.local}
+        self.base, self.lookup, self.reserved = base, lookup, 0
+        function.body.stmts = self.visit(function.body.stmts)
+        if not self.reserved:
+            return
+        for meta in frame.values():
+            if meta.stack_position[0] >= base:
+                meta.stack_position = (meta.stack_position[0] + self.reserved, meta.stack_position[1] + self.reserved)
+        function.body.stmts.insert(0, ast.Reserve(self.reserved))
+
+    def visit(self, node):
+        """
+        Inline the calls of a tree, the ones in the arguments of a call before the call itself.
+        """
+        if isinstance(node, list):
+            return [self.visit(item) for item in node]
+        if isinstance(node, tuple):
+            return tuple(self.visit(item) for item in node)
+        if not is_dataclass(node) or type(node).__module__ != ast.__name__ or isinstance(node, ast.Symbol):
+            return node
+        for field in fields(node):
+            setattr(node, field.name, self.visit(getattr(node, field.name)))
+        if isinstance(node, ast.Call):
+            callee = self.lookup(node.function.name)
+            if callee is not None and self.inlinable(callee):
+                return self._inline(node, callee)
+        return node
+
+    def _inline(self, call: ast.Call, callee: ast.Function) -> ast.Inline:
+        self.metas: Dict[int, MetaData] = {}    # Cells of the variables of the callee in the frame of the caller
+        params = [self.copy(param) for param in callee.params]
+        body = self.copy(callee.body)
+        cells = max((meta.stack_position[1] + 1 - self.base for meta in self.metas.values()), default=0)
+        result = None
+        if callee.data.output_type is not None:
+            result = ast.Symbol("return", MetaData(callee.data.output_type, (self.base + cells, self.base + cells)), True)
+            cells += 1
+        self.reserved = max(self.reserved, cells)
+        return ast.Inline(call.type, call.function, params, call.args, body, result)
+
+    def copy(self, node):
+        """
+        Copy a tree of the callee, moving its variables to the cells reserved in the caller.
+
+        Its declarations become assignments, since the cells are already there, and its scopes have nothing to drop.
+        """
+        if isinstance(node, list):
+            return [self.copy(item) for item in node]
+        if isinstance(node, tuple):
+            return tuple(self.copy(item) for item in node)
+        if not is_dataclass(node) or type(node).__module__ != ast.__name__:
+            return node
+        kind = type(node)
+        if kind is ast.Symbol:
+            return self._symbol(node)
+        if kind is ast.Declare and node.var.local:
+            var = self._symbol(node.var)
+            if var.meta.type.startswith("&"):   # Uninitialized pointers point to themselves
+                return ast.Assign(var, ast.Address(f"&{var.meta.type}", var))
+            return ast.Assign(var, ast.Const(var.meta.type, ZERO[var.meta.type]))
+        if kind is ast.Init and node.var.local:
+            return ast.Assign(self._symbol(node.var), self.copy(node.value))
+        if kind is ast.Block:
+            return ast.Block(self.copy(node.stmts), 0)
+        if kind is ast.For:
+            return ast.For(self.copy(node.inits), self.copy(node.cond), self.copy(node.updates), self.copy(node.body), 0)
+        return kind(*(self.copy(getattr(node, field.name)) for field in fields(node)))
+
+    def _symbol(self, symbol: ast.Symbol) -> ast.Symbol:
+        if not symbol.local:
+            return symbol
+        meta = self.metas.get(id(symbol.meta))
+        if meta is None:
+            old = symbol.meta
+            meta = self.metas[id(old)] = MetaData(old.type, (old.stack_position[0] + self.base, old.stack_position[1] + self.base), old.array_shape, old.p_init)
+        return ast.Symbol(symbol.name, meta, True)
@@ -0,0 +1,161 @@
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+from tox.codegen._program import LABEL, Instruction, Program
+from tox.codegen._folding import INT_MIN, INT_MAX, wrap
+
+Window = List[Instruction]
+
+class Rule(NamedTuple):
+    """
+    Class that represents a peephole rule.
+
+    `pattern` holds the operations of the window the rule looks at, one per instruction: an operation,
+    a tuple of operations or None for any instruction. `rewrite` gets the matching window and returns
+    what replaces it, or None to leave it alone. A rewrite must make the code shorter, so the
+    optimizer always reaches a fixed point.
+    """
+    name: str
+    pattern: Tuple[Union[str, Tuple[str, ...], None], ...]
+    rewrite: Callable[[Window], Optional[Window]]
+
+def _arg(instruction: Instruction) -> int:
+    return int(instruction.arg)
+
+def _int(instruction: Instruction) -> Optional[int]:
+    """
+    Value of an int operand, None if the VM can't read it as written (it does not fit a C int).
+    """
+    value = int(instruction.arg)
+    return value if INT_MIN <= value <= INT_MAX else None
+
+def _pop_zero(w: Window) -> Optional[Window]:
+    return [] if _arg(w[0]) == 0 else None
+
+def _pop_merge(w: Window) -> Optional[Window]:
+    return [Instruction("POP", _arg(w[0]) + _arg(w[1]))]
+
+def _push_local(w: Window) -> Optional[Window]:
+    return [Instruction("PUSHL", _arg(w[1]))]
+
+def _push_global(w: Window) -> Optional[Window]:
+    return [Instruction("PUSHG", _arg(w[1]))]
+
+def _load_offset(w: Window) -> Optional[Window]:
+    if _int(w[0]) is None:
+        return None
+    return [Instruction("LOAD", _arg(w[0]) + _arg(w[2]))]
+
+def _padd_merge(w: Window) -> Optional[Window]:
+    if _int(w[0]) is None or _int(w[2]) is None:
+        return None
+    return [Instruction("PUSHI", wrap(_arg(w[0]) + _arg(w[2]))), w[1]]
+
+def _neutral(value: int) -> Callable[[Window], Optional[Window]]:
+    """
+    Drop the push of an operand that leaves the other one unchanged.
+    """
+    return lambda w: [] if _arg(w[0]) == value else None
+
+def _const_arith(w: Window) -> Optional[Window]:
+    left, right = _int(w[0]), _int(w[1])
+    if left is None or right is None:
+        return None
+    result = {"ADD": left + right, "SUB": left - right, "MUL": left * right}[w[2].op]
+    return [Instruction("PUSHI", wrap(result))]
+
+def _const_jz(w: Window) -> Optional[Window]:
+    if _int(w[0]) is None:
+        return None
+    return [Instruction("JUMP", w[1].arg)] if _arg(w[0]) == 0 else []
+
+def _nonzero_jz(w: Window) -> Optional[Window]:
+    return [w[3]] if _arg(w[0]) == 0 else None
+
+def _not_compare(w: Window) -> Optional[Window]:
+    return [Instruction({"INF": "SUPEQ", "SUP": "INFEQ", "INFEQ": "SUP", "SUPEQ": "INF"}[w[0].op])]
+
+def _jump_next(w: Window) -> Optional[Window]:
+    return w[1:] if any(label.arg == w[0].arg for label in w[1:]) else None
+
+def _unreachable(w: Window) -> Optional[Window]:
+    return None if w[1].is_label else [w[0]]
+
+# Every rule preserves what the VM computes for any input. The int rules are only applied to int
+# instructions (the float ones have their own opcodes), and the arithmetic wraps like the VM does.
+RULES: List[Rule] = [
+    Rule("pop-zero", ("POP",), _pop_zero),                                  # Scopes without variables
+    Rule("pop-merge", ("POP", "POP"), _pop_merge),                          # Nested scopes ending together
+    Rule("push-local", ("PUSHFP", "LOAD"), _push_local),
+    Rule("push-global", ("PUSHGP", "LOAD"), _push_global),
+    Rule("load-offset", ("PUSHI", "PADD", "LOAD"), _load_offset),           # Elements at a known offset
+    Rule("padd-merge", ("PUSHI", "PADD", "PUSHI", "PADD"), _padd_merge),
+    Rule("padd-zero", ("PUSHI", "PADD"), _neutral(0)),
+    Rule("add-zero", ("PUSHI", ("ADD", "SUB")), _neutral(0)),
+    Rule("mul-one", ("PUSHI", "MUL"), _neutral(1)),
+    Rule("const-arith", ("PUSHI", "PUSHI", ("ADD", "SUB", "MUL")), _const_arith),   # Pointer minus a literal
+    Rule("const-jz", ("PUSHI", "JZ"), _const_jz),
+    Rule("nonzero-jz", ("PUSHI", "EQUAL", "NOT", "JZ"), _nonzero_jz),       # 'x != 0' only needs 'x' to jump
+    Rule("not-not-jz", ("NOT", "NOT", "JZ"), lambda w: [w[2]]),
+    Rule("not-compare", (("INF", "SUP", "INFEQ", "SUPEQ"), "NOT"), _not_compare),
+    Rule("jump-next", ("JUMP", LABEL), _jump_next),
+    Rule("jump-next", ("JUMP", LABEL, LABEL), _jump_next),                  # An if without an else
+    Rule("unreachable", (("JUMP", "RETURN"), None), _unreachable),
+]
+
+class PeepholeOptimizer:
+    """
+    Class that rewrites short redundant instruction sequences of the generated code.
+
+    The rules are tried on the end of the optimized code every time an instruction is added to it.
+    What a rule produces is read again, so a rewrite can enable the next one. The code is scanned
+    until no rule applies. `hits` counts how many times each rule was applied.
+
+    Rules only look inside the code of one function (labels are local to it, and functions end
+    with a RETURN), so optimizing the units of an incremental build gives the same code.
+    """
+    def __init__(self, rules: Optional[Iterable[Rule]] = None):
+        self.rules: Dict[str, List[Tuple[int, Tuple, Rule]]] = {}  # Size, pattern and rule of the rules that can end at an operation
+        self.any_op: List[Tuple[int, Tuple, Rule]] = []             # Rules that can end at any operation
+        for rule in (RULES if rules is None else rules):
+            pattern = tuple(ops if ops is None or isinstance(ops, tuple) else (ops,) for ops in rule.pattern)
+            entry = (len(pattern), pattern, rule)
+            if pattern[-1] is None:
+                self.any_op.append(entry)
+                for entries in self.rules.values():
+                    entries.append(entry)
+                continue
+            for op in pattern[-1]:
+                self.rules.setdefault(op, list(self.any_op)).append(entry)
+        self.hits: Counter = Counter()
+
+    def optimize(self, program: Program) -> Program:
+        code = program.instructions
+        while True:
+            before = len(code)
+            code = self._pass(code)
+            if len(code) == before:
+                return Program(code)
+
+    def _pass(self, code: List[Instruction]) -> List[Instruction]:
+        out: List[Instruction] = []
+        pending = list(reversed(code))
+        while pending:
+            instruction = pending.pop()
+            out.append(instruction)
+            for size, pattern, rule in self.rules.get(instruction.op, self.any_op):
+                if size > len(out):
+                    continue
+                window = out[-size:]
+                for ops, part in zip(pattern, window):
+                    if ops is not None and part.op not in ops:
+                        break
+                else:
+                    replacement = rule.rewrite(window)
+                    if replacement is None:
+                        continue
+                    self.hits[rule.name] += 1
+                    del out[-size:]
+                    pending.extend(reversed(replacement))   # Read again, it may complete another pattern
+                    break
+        return out
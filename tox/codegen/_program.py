@@ -0,0 +1,97 @@
+from __future__ import annotations
+from typing import Optional, List, Union, Iterator, NamedTuple
+from dataclasses import dataclass, field
+
+LABEL = "LABEL" # Pseudo operation used for labels
+
+class Instruction(NamedTuple):
+    """
+    Class that represents a single EWVM instruction or label.
+    """
+    op: str
+    arg: Optional[Union[int, float, str]] = None
+
+    @property
+    def is_label(self) -> bool:
+        return self.op == LABEL
+
+    @staticmethod
+    def parse(line: str) -> Instruction:
+        """
+        Build an instruction from its textual form, e.g. 'PUSHI 1' or 'LOOP0START:'.
+        """
+        if line.endswith(":"):
+            return Instruction(LABEL, line[:-1])
+        op, _, arg = line.partition(" ")
+        return Instruction(op, arg if arg else None)
+
+    def __str__(self) -> str:
+        if self.is_label:
+            return f"{self.arg}:"
+        if self.arg is None:
+            return self.op
+        return f"{self.op} {self.arg}"
+
+
+class Code:
+    """
+    Class that represents a fragment of generated code.
+
+    Fragments are only linked together when added, so building a program out of many small
+    fragments is linear. The instructions are collected once, when the fragment is flattened.
+    """
+    __slots__ = ("parts",)
+
+    def __init__(self, parts: Optional[List[Union[Instruction, Code]]] = None):
+        self.parts = parts if parts is not None else []
+
+    def __add__(self, other: Code) -> Code:
+        if not isinstance(other, Code):
+            return NotImplemented
+        return Code([self, other])
+
+    def __iter__(self) -> Iterator[Instruction]:
+        return iter(self.flatten())
+
+    def last(self) -> Optional[Instruction]:
+        """
+        Return the last instruction of the fragment, if any.
+        """
+        stack = [self]
+        while stack:
+            part = stack.pop()
+            if isinstance(part, Instruction):
+                return part
+            stack.extend(part.parts)
+        return None
+
+    def flatten(self) -> List[Instruction]:
+        """
+        Return the instructions of the fragment in order.
+        """
+        out = []
+        stack = [self]
+        while stack:
+            part = stack.pop()
+            if type(part) is Code:
+                stack.extend(reversed(part.parts))
+            else:
+                out.append(part)
+        return out
+
+
+@dataclass
+class Program:
+    """
+    Class that represents a compiled tox program as a flat list of EWVM instructions.
+    """
+    instructions: List[Instruction] = field(default_factory=list)
+
+    def serialize(self) -> str:
+        """
+        Return the program in the textual format read by the EWVM.
+        """
+        return "".join(f"{instruction}\n" for instruction in self.instructions)
+
+    def __str__(self) -> str:
+        return self.serialize()
@@ -0,0 +1,231 @@
+from dataclasses import fields, is_dataclass
+from typing import Dict, List, Optional, Set, Tuple
+
+from tox.semantics import _ast as ast
+from tox.codegen._folding import ConstantFolder
+from tox.codegen._hoisting import Key, key
+
+Value = Optional[Tuple[str, str]]   # Type and literal of a known value, None for a value only known at runtime
+Env = Optional[Dict[Key, Value]]    # Values of the variables at a point of a function, None where it can't be reached
+
+def join(*envs: Env) -> Env:
+    """
+    What is known at a point reached from several others. A variable not there yet takes the value it has where it is.
+    """
+    out = None
+    for env in envs:
+        if env is None:
+            continue
+        if out is None:
+            out = dict(env)
+            continue
+        for name, value in env.items():
+            if name not in out:
+                out[name] = value
+            elif out[name] != value:
+                out[name] = None
+    return out
+
+class ConstantPropagator:
+    """
+    Class that replaces the reads of local variables whose value is known at compile time by that value.
+
+    Each function is interpreted on values known at compile time, like sparse conditional constant
+    propagation does on a control flow graph: a variable has a value at a point if every path that
+    can reach it assigns it the same literal. A branch whose condition is known is the only one
+    followed, so a value assigned in a branch that can't be taken does not spoil the others, and
+    loops are followed until what is known at their start stops changing. The reads are then
+    replaced by literals and folded (tox.codegen._folding), which leaves literal conditions behind
+    for tox.codegen._dead_code to drop the branches that are never taken.
+
+    Only int and float variables are tracked. A variable whose address is taken may be written through
+    a pointer, and the globals by any call, so their reads are left alone.
+    """
+    def __init__(self):
+        self.propagated = 0     # Reads replaced by a literal
+        self.folder = ConstantFolder()
+
+    def propagate(self, tree: ast.Program) -> ast.Program:
+        for function in tree.functions:
+            if function.body is not None:
+                self._function(function)
+        return tree
+
+    def _function(self, function: ast.Function):
+        self.addressed: Set[Key] = set()    # Variables a pointer can reach
+        for node in ast.walk(function.body):
+            kind = type(node)
+            if kind is ast.Address or (kind is ast.Index and not node.var.meta.type.startswith("&") and len(node.indices) < len(node.var.meta.array_shape)):
+                self.addressed.add(key(node.var))
+        self.known: Dict[ast.Load, Value] = {}  # Value of every read the function can run, on every path to it
+        self.loops: List[Tuple[List[Env], List[Env]]] = []  # What the breaks and the continues of the enclosing loops leave
+        self.stmts(function.body.stmts, {key(param): None for param in function.params})
+        if any(value is not None for value in self.known.values()):
+            function.body = self.folder.visit(self.replace(function.body))
+
+    def tracked(self, var: ast.Symbol) -> bool:
+        return var.local and var.meta.type in ("int", "float") and key(var) not in self.addressed
+
+    ######################
+    ##  INTERPRETATION  ##
+    ######################
+
+    def stmts(self, stmts: List, env: Env) -> Env:
+        for stmt in stmts:
+            if env is None:
+                break
+            env = self.stmt(stmt, env)
+        return env
+
+    def stmt(self, stmt, env: Dict[Key, Value]) -> Env:
+        """
+        What is known after a statement runs, given what is known before.
+        """
+        kind = type(stmt)
+        if kind is ast.Declare:
+            if self.tracked(stmt.var):
+                env[key(stmt.var)] = (stmt.var.meta.type, "0" if stmt.var.meta.type == "int" else "0.0")
+        elif kind is ast.Init or kind is ast.Assign:
+            value = self.expr(stmt.value, env)
+            if self.tracked(stmt.var):
+                env[key(stmt.var)] = value
+        elif kind is ast.If:
+            return self._if(stmt, env)
+        elif kind is ast.Match:
+            return self._match(stmt, env)
+        elif kind is ast.While or kind is ast.DoWhile or kind is ast.For:
+            return self.loop(stmt, env)
+        elif kind is ast.Block:
+            return self.stmts(stmt.stmts, env)
+        elif kind is ast.Break or kind is ast.Continue:
+            self.loops[-1][kind is ast.Continue].append(env)
+            return None
+        elif kind is ast.Return:
+            if stmt.value is not None:
+                self.expr(stmt.value, env)
+            return None
+        else:   # Prints, array stores and calls only read
+            self.exprs(stmt, env)
+        return env
+
+    def _if(self, node: ast.If, env: Dict[Key, Value]) -> Env:
+        out = None
+        for cond, body in node.branches:
+            value = self.condition(cond, env)
+            if value == 0:
+                continue
+            out = join(out, self.stmts(body.stmts, dict(env)))
+            if value is not None:   # Always taken, the next branches can't run
+                return out
+        return join(out, self.stmts(node.orelse.stmts, dict(env)) if node.orelse is not None else env)
+
+    def _match(self, node: ast.Match, env: Dict[Key, Value]) -> Env:
+        subject = self.expr(node.subject, env)
+        cases = [(self.expr(case, env), body) for case, body in node.cases]
+        if node.subject.type == "int" and subject is not None and all(case is not None and case[0] == "int" for case, _ in cases):
+            body = next((body for case, body in cases if int(case[1]) == int(subject[1])), node.default)     # The first case equal to the subject
+            return self.stmts(body.stmts, dict(env))
+        return join(*(self.stmts(body.stmts, dict(env)) for body in [body for _, body in node.cases] + [node.default]))
+
+    def loop(self, node, env: Dict[Key, Value]) -> Env:
+        """
+        What is known after a loop, running its body until what is known at its start no longer changes.
+        """
+        if isinstance(node, ast.For):
+            env = self.stmts(node.inits, dict(env))
+        start = env
+        while True:
+            breaks, continues = frame = ([], [])
+            self.loops.append(frame)
+            if isinstance(node, ast.DoWhile):
+                end = join(self.stmts(node.body.stmts, dict(start)), *continues)
+                value = self.condition(node.cond, end) if end is not None else None
+                done = end if value != 1 else None
+                back = end if value != 0 else None
+            else:
+                value = self.condition(node.cond, start)
+                done = start if value != 1 else None
+                back = None
+                if value != 0:
+                    back = join(self.stmts(node.body.stmts, dict(start)), *continues)
+                    if isinstance(node, ast.For) and back is not None:
+                        back = self.stmts(node.updates, back)
+            self.loops.pop()
+            head = join(env, back)
+            if head == start:
+                return join(done, *breaks)
+            start = head
+
+    def condition(self, cond: ast.Expr, env: Dict[Key, Value]) -> Optional[int]:
+        """
+        Whether a condition is known to be false (0) or true (1), None if it is only known at runtime.
+        """
+        value = self.expr(cond, env)
+        if value is None or cond.type != "int":
+            return None
+        return int(int(value[1]) != 0)
+
+    def expr(self, node: ast.Expr, env: Dict[Key, Value]) -> Value:
+        """
+        Value of an expression, remembering the values of the reads in it.
+        """
+        kind = type(node)
+        if kind is ast.Const:
+            return (node.type, node.value) if ConstantFolder.value(node) is not None else None
+        if kind is ast.Load:
+            if not self.tracked(node.var):
+                return None
+            value = env.get(key(node.var))
+            self.known[node] = value if self.known.get(node, value) == value else None
+            return value
+        if kind is ast.Unary or kind is ast.Cast:
+            operand = self.expr(node.operand, env)
+            if operand is None:
+                return None
+            folded = self.folder.folders[kind](kind(**{**vars(node), "operand": ast.Const(*operand)}))
+        elif kind is ast.Binary:
+            if node.left.type == "string":  # The right operand runs first
+                right, left = self.expr(node.right, env), self.expr(node.left, env)
+            else:
+                left, right = self.expr(node.left, env), self.expr(node.right, env)
+            if left is None or right is None:
+                return None
+            folded = self.folder.folders[kind](ast.Binary(node.type, node.op, ast.Const(*left), ast.Const(*right)))
+        else:
+            self.exprs(node, env)
+            return None
+        return (folded.type, folded.value) if isinstance(folded, ast.Const) else None
+
+    def exprs(self, node, env: Dict[Key, Value]):
+        """
+        Remember the values of the reads in the expressions of a node.
+        """
+        for field in fields(node):
+            value = getattr(node, field.name)
+            for item in value if isinstance(value, list) else [value]:
+                if isinstance(item, ast.Expr):
+                    self.expr(item, env)
+
+    ######################
+    ##    REWRITING     ##
+    ######################
+
+    def replace(self, node):
+        """
+        Replace the reads of known values by literals.
+        """
+        if isinstance(node, list):
+            return [self.replace(item) for item in node]
+        if isinstance(node, tuple):
+            return tuple(self.replace(item) for item in node)
+        if isinstance(node, ast.Load):
+            value = self.known.get(node)
+            if value is None:
+                return node
+            self.propagated += 1
+            return ast.Const(*value)
+        if not is_dataclass(node) or type(node).__module__ != ast.__name__ or isinstance(node, ast.Symbol):
+            return node
+        for field in fields(node):
+            setattr(node, field.name, self.replace(getattr(node, field.name)))
+        return node
@@ -0,0 +1,87 @@
+from typing import List
+
+from tox.semantics import _ast as ast
+
+class TailCallEliminator:
+    """
+    Class that turns the calls of a function to itself in tail position into jumps back to its start.
+
+    The calls rewritten are the ones whose value is returned right away (`return f(...)`) and, in
+    functions without a return value, the ones that are the last statement of the function or are
+    followed by a bare return. The generated code sets the parameters to the arguments, drops the
+    variables of the frame and jumps to the start of the function, so the recursion runs in constant
+    stack space (see CodeGenerator._tail_call).
+
+    A function is left alone if it takes the address of one of its own variables, since the cells
+    would be reused while the pointer may still be in use, or if it calls a function with a return
+    value as a statement, since the value stays on the stack and the size of the frame is unknown.
+    """
+    def __init__(self):
+        self.rewritten = 0      # Calls turned into jumps
+
+    def eliminate(self, tree: ast.Program) -> ast.Program:
+        for function in tree.functions:
+            if function.body is not None and self.eligible(function):
+                self.function = function
+                self.stmts(function.body.stmts, function.data.output_type is None)
+        return tree
+
+    @staticmethod
+    def eligible(function: ast.Function) -> bool:
+        for node in ast.walk(function.body):
+            kind = type(node)
+            if kind is ast.Address and node.var.local:
+                return False
+            if kind is ast.Index and node.var.local and not node.var.meta.type.startswith("&") and len(node.indices) < len(node.var.meta.array_shape):
+                return False    # The address of a row of a local array
+            if kind is ast.Declare and node.var.local and node.var.meta.type.startswith("&"):
+                return False    # An uninitialized pointer points to itself
+            if kind is ast.Block and any(isinstance(stmt, (ast.Call, ast.Inline)) and stmt.type is not None for stmt in node.stmts):
+                return False
+            if kind is ast.For and any(isinstance(stmt, (ast.Call, ast.Inline)) and stmt.type is not None for stmt in node.inits + node.updates):
+                return False
+        return True
+
+    def own(self, node) -> bool:
+        """
+        Whether the node is a call of the function to itself.
+        """
+        return isinstance(node, ast.Call) and node.function.name == self.function.data.name
+
+    def stmts(self, stmts: List, tail: bool):
+        """
+        Rewrite the tail calls of a list of statements. `tail` tells whether nothing runs after the
+        list but the end of a function without a return value.
+        """
+        last = len(stmts) - 1
+        while last >= 0 and isinstance(stmts[last], ast.Print) and not stmts[last].values:
+            last -= 1
+        i = 0
+        while i < len(stmts):
+            stmt = stmts[i]
+            if isinstance(stmt, ast.Return) and self.own(stmt.value):
+                stmts[i] = ast.TailCall(stmt.value.args)
+                self.rewritten += 1
+            elif self.own(stmt) and (tail and i == last or i + 1 < len(stmts) and isinstance(stmts[i+1], ast.Return) and stmts[i+1].value is None):
+                stmts[i] = ast.TailCall(stmt.args)
+                self.rewritten += 1
+                if i + 1 < len(stmts) and isinstance(stmts[i+1], ast.Return):
+                    del stmts[i+1]
+            else:
+                self.stmt(stmt, tail and i == last)
+            i += 1
+
+    def stmt(self, stmt, tail: bool):
+        if isinstance(stmt, ast.If):
+            for _, body in stmt.branches:
+                self.stmts(body.stmts, tail)
+            if stmt.orelse is not None:
+                self.stmts(stmt.orelse.stmts, tail)
+        elif isinstance(stmt, ast.Match):
+            for _, body in stmt.cases:
+                self.stmts(body.stmts, tail)
+            self.stmts(stmt.default.stmts, tail)
+        elif isinstance(stmt, (ast.While, ast.DoWhile, ast.For)):
+            self.stmts(stmt.body.stmts, False)
+        elif isinstance(stmt, ast.Block):
+            self.stmts(stmt.stmts, tail)
@@ -0,0 +1,322 @@
+from dataclasses import fields, is_dataclass
+from typing import Dict, List, Optional, Set, Tuple
+
+from tox.semantics import _ast as ast
+from tox.semantics._scopes import MetaData
+from tox.codegen._hoisting import Key, key
+
+# Statements that run straight after the previous one, and the ones that end a basic block after evaluating their expressions
+STRAIGHT = (ast.Print, ast.Declare, ast.Init, ast.ArrayInit, ast.RangeInit, ast.Reserve, ast.Assign, ast.IndexAssign, ast.Call, ast.Inline, ast.Read)
+ENDS = (ast.If, ast.Match, ast.Return, ast.TailCall)
+
+class CommonSubexpressionEliminator:
+    """
+    Class that computes each value once in every basic block of a function.
+
+    The expressions of a run of statements without control flow are numbered in the order the
+    generated code evaluates them: two expressions get the same number if they compute the same
+    operation on the same values, the variables they read not having been written in between.
+    The first expression of each number that is computed more than once keeps its value in a cell
+    (ast.Cache) and the later ones load it. The elements of an array read or written more than once
+    in the same row (`gen[c][j - 1]`, `gen[c][j]`) go through the address of the row, computed once
+    before the statement of the first one.
+
+    A store through a pointer or a call may write any global, array element or variable whose
+    address is taken, so the values read from those are numbered again after one. The bodies of
+    inlined calls are left alone. The cells are reserved at the start of the frame, right after
+    the parameters, and every basic block reuses them.
+    """
+    def __init__(self):
+        self.reused = 0     # Expressions replaced by the load of a cell
+
+    def eliminate(self, tree: ast.Program) -> ast.Program:
+        for function in tree.functions:
+            if function.body is not None:
+                self._function(function)
+        return tree
+
+    def _function(self, function: ast.Function):
+        self.base = len(function.params)    # First cell after the parameters
+        frame = {id(symbol.meta): symbol.meta for symbol in ast.walk(function.body) if isinstance(symbol, ast.Symbol) and symbol.local}
+        self.addressed: Set[Key] = set()    # Variables a pointer can reach
+        for node in ast.walk(function.body):
+            kind = type(node)
+            if kind is ast.Address or (kind is ast.Index and not node.var.meta.type.startswith("&") and len(node.indices) < len(node.var.meta.array_shape)) or \
+                    (kind is ast.Declare and node.var.meta.type.startswith("&")):   # An uninitialized pointer points to itself
+                self.addressed.add(key(node.var))
+        self.reserved = 0   # Cells taken by the values of a basic block
+        self.stmts(function.body.stmts)
+        if not self.reserved:
+            return
+        reserved = self.reserved
+        for meta in frame.values():
+            if meta.stack_position[0] >= self.base:
+                meta.stack_position = (meta.stack_position[0] + reserved, meta.stack_position[1] + reserved)
+        if function.body.stmts and isinstance(function.body.stmts[0], ast.Reserve):    # The cells of the other passes
+            function.body.stmts[0].size += reserved
+        else:
+            function.body.stmts.insert(0, ast.Reserve(reserved))
+
+    def stmts(self, stmts: List):
+        """
+        Number the basic blocks of a list of statements, and of the statements nested in them.
+        """
+        start = i = 0
+        while i < len(stmts):
+            stmt = stmts[i]
+            if isinstance(stmt, STRAIGHT):
+                i += 1
+                continue
+            i += self.block(stmts, start, i + 1 if isinstance(stmt, ENDS) else i)
+            start = i = i + 1
+            if isinstance(stmt, ast.If):
+                for _, body in stmt.branches:
+                    self.stmts(body.stmts)
+                if stmt.orelse is not None:
+                    self.stmts(stmt.orelse.stmts)
+            elif isinstance(stmt, ast.Match):
+                for _, body in stmt.cases:
+                    self.stmts(body.stmts)
+                self.stmts(stmt.default.stmts)
+            elif isinstance(stmt, (ast.While, ast.DoWhile, ast.For)):
+                self.stmts(stmt.body.stmts)
+            elif isinstance(stmt, ast.Block):
+                self.stmts(stmt.stmts)
+        self.block(stmts, start, len(stmts))
+
+    def block(self, stmts: List, start: int, end: int):
+        """
+        Number the expressions of stmts[start:end], the last of which may be an if or a match
+        whose condition or subject ends the block, and reuse the values computed more than once.
+        """
+        if end - start < 1:
+            return 0
+        self.versions: Dict[Key, int] = {}  # Writes to each variable so far
+        self.epoch = 0                      # Stores through pointers and calls so far
+        self.numbers: Dict[ast.Expr, tuple] = {}    # Value of every expression that can be reused
+        self.costs: Dict[tuple, int] = {}           # Instructions that compute each value
+        self.occurrences: Dict[tuple, List[ast.Expr]] = {}  # Expressions computing each value, in the order they run
+        self.rows: Dict[tuple, List[Tuple[int, ast.Expr]]] = {}     # Statements and elements of each row accessed
+        self.changes = 0    # Writes so far, to tell whether a statement wrote anything before an element
+        for self.position in range(start, end):
+            self.started = self.changes
+            self.stmt(stmts[self.position])
+        if not any(len(found) > 1 for found in self.occurrences.values()) and not any(len(found) > 1 for found in self.rows.values()):
+            return 0
+        self.actions: Dict[ast.Expr, object] = {}   # The cache of the first expression of a reused value, the cell for the others
+        self.dead: Set[ast.Expr] = set()            # Expressions inside the ones that are loaded, never evaluated
+        self.cells = 0
+        self.row_cells: Dict[object, ast.Symbol] = {}   # Cell of the row of the elements accessed through one
+        before: Dict[int, List[ast.Assign]] = {}
+        for number, found in self.rows.items():
+            position, first = found[0]
+            if position is None or (len(found) - 1) * (self.costs[number] - 1) <= 4:
+                continue    # Besides the cell, the offset of the element is no longer folded in its load
+            cell = self.cell("&" + first.var.meta.type[4:-1])
+            before.setdefault(position, []).append(ast.Assign(cell, ast.Index(cell.meta.type, first.var, first.indices[:-1])))
+            for _, node in found:
+                self.row_cells[node] = cell
+                self.dead.update(inner for index in node.indices[:-1] for inner in ast.walk(index))
+        out = stmts[:start]
+        for i in range(start, end):
+            stmt = stmts[i]
+            out.extend(before.get(i, ()))
+            if isinstance(stmt, ast.If):
+                cond, body = stmt.branches[0]
+                stmt.branches[0] = (self.rewrite(cond), body)
+            elif isinstance(stmt, ast.Match):
+                stmt.subject = self.rewrite(stmt.subject)
+            else:
+                stmt = self.rewrite(stmt)
+            out.append(stmt)
+        stmts[:end] = out
+        self.reserved = max(self.reserved, self.cells)
+        return len(out) - end
+
+    def cell(self, type: str) -> ast.Symbol:
+        cell = ast.Symbol(f"value{self.cells}", MetaData(type, (self.base + self.cells, self.base + self.cells)), True)
+        self.cells += 1
+        return cell
+
+    ######################
+    ##    NUMBERING     ##
+    ######################
+
+    def stmt(self, stmt):
+        kind = type(stmt)
+        if kind is ast.Print:
+            for value in stmt.values:
+                self.expr(value)
+        elif kind is ast.Init or kind is ast.Assign:
+            self.expr(stmt.value)
+            self.write(stmt.var)
+        elif kind is ast.Declare or kind is ast.RangeInit:
+            self.write(stmt.var)
+        elif kind is ast.ArrayInit:
+            for item in stmt.items:
+                self.expr(item)
+            self.write(stmt.var)
+        elif kind is ast.IndexAssign:
+            if stmt.var.meta.type.startswith("&"):
+                self.read(stmt.var)
+            self.row(stmt, [self.expr(index) for index in stmt.indices])
+            self.expr(stmt.value)
+            self.write(stmt.var, element=True)
+        elif kind is ast.If:
+            self.expr(stmt.branches[0][0])
+        elif kind is ast.Match:
+            self.expr(stmt.subject)
+        elif kind is ast.Return:
+            if stmt.value is not None:
+                self.expr(stmt.value)
+        elif kind is ast.TailCall:
+            for arg in reversed(stmt.args):
+                self.expr(arg)
+        elif kind is not ast.Reserve:  # A call as a statement
+            self.expr(stmt)
+
+    def write(self, var: ast.Symbol, element: bool = False):
+        self.changes += 1
+        name = key(var)
+        self.versions[name] = self.versions.get(name, 0) + 1
+        if element or not var.local or name in self.addressed:   # Memory a pointer can reach
+            self.epoch += 1
+
+    def read(self, var: ast.Symbol, element: bool = False) -> tuple:
+        """
+        The version of a variable or of the elements of an array being read.
+        """
+        name = key(var)
+        if element or not var.local or name in self.addressed:
+            return (name, self.versions.get(name, 0), self.epoch)
+        return (name, self.versions.get(name, 0))
+
+    def expr(self, node) -> Optional[tuple]:
+        """
+        Number an expression and the ones in it, in the order they run. Returns its number, None if it can't be reused.
+        """
+        kind = type(node)
+        number = None
+        cost = 1
+        if kind is ast.Const:
+            number = ("const", node.type, node.value)
+        elif kind is ast.Load:
+            number = ("load", self.read(node.var))
+        elif kind is ast.Address:
+            number = ("address", key(node.var))    # Folded with the constants added to it by the peephole optimizer, not worth a cell
+        elif kind is ast.Index:
+            var = node.var
+            pointer = var.meta.type.startswith("&")
+            base = self.read(var) if pointer else key(var)
+            indices = [self.expr(index) for index in node.indices]
+            self.row(node, indices)
+            if None not in indices:
+                full = pointer or len(node.indices) == len(var.meta.array_shape)
+                element = self.read(var, element=True) if full else None
+                number = ("index", base, element, tuple(indices))
+                cost = 2 + sum(self.costs.get(index, 1) + (0 if index[0] == "const" else 3) for index in indices)
+        elif kind is ast.Unary or kind is ast.Cast:
+            operand = self.expr(node.operand)
+            if operand is not None:
+                number = (kind.__name__, node.type, getattr(node, "op", None), operand)
+                cost = self.costs[operand] + 2
+        elif kind is ast.Binary:
+            if node.left.type == "string":  # The right operand runs first
+                right, left = self.expr(node.right), self.expr(node.left)
+            else:
+                left, right = self.expr(node.left), self.expr(node.right)
+            if left is not None and right is not None:
+                number = ("binary", node.op, node.type, left, right)
+                cost = self.costs[left] + self.costs[right] + 1
+        elif kind is ast.Call:
+            for arg in reversed(node.args):
+                self.expr(arg)
+            self.epoch += 1
+            self.changes += 1
+        elif kind is ast.Inline:
+            for arg in reversed(node.args):
+                self.expr(arg)
+            for written in ast.walk(node):
+                if isinstance(written, (ast.Assign, ast.IndexAssign)):
+                    self.write(written.var)
+            for param in node.params:
+                self.write(param)
+            if node.result is not None:
+                self.write(node.result)
+            self.epoch += 1
+            self.changes += 1
+        elif kind is ast.Read:
+            for value in node.prompt:
+                self.expr(value)
+        if number is None:
+            return None
+        self.costs[number] = cost
+        if kind is not ast.Const and kind is not ast.Load and kind is not ast.Address:
+            self.numbers[node] = number
+            self.occurrences.setdefault(number, []).append(node)
+        return number
+
+    def row(self, node, indices: List[Optional[tuple]]):
+        """
+        Count an element of an array in a row whose address takes instructions to compute.
+        """
+        var = node.var
+        if var.meta.type.startswith("&") or len(indices) < 2 or len(indices) != len(var.meta.array_shape) or None in indices:
+            return
+        rows = indices[:-1]
+        if all(index[0] == "const" for index in rows):
+            return      # Known at compile time
+        number = ("index", key(var), None, tuple(rows))
+        self.costs[number] = 1 + sum(self.costs[index] + 3 for index in rows)   # Each index is multiplied by its stride and added
+        safe = self.changes == self.started and not any(isinstance(inner, ast.Binary) and inner.op in ("div", "mod") and not isinstance(inner.right, ast.Const)
+                                                         for index in node.indices[:-1] for inner in ast.walk(index))
+        self.rows.setdefault(number, []).append((self.position if safe else None, node))    # Computed before the statement if nothing in it runs first
+
+    ######################
+    ##    REWRITING     ##
+    ######################
+
+    def rewrite(self, node):
+        """
+        Replace the expressions of a tree whose value is reused, parents first.
+        """
+        if isinstance(node, list):
+            return [self.rewrite(item) for item in node]
+        if isinstance(node, tuple):
+            return tuple(self.rewrite(item) for item in node)
+        if not is_dataclass(node) or type(node).__module__ != ast.__name__ or isinstance(node, (ast.Symbol, ast.Block)):
+            return node
+        if isinstance(node, ast.Inline):
+            node.args = self.rewrite(node.args)
+            return node
+        number = self.numbers.get(node)
+        if number is not None and node not in self.actions:
+            self.decide(number)
+        action = self.actions.get(node)
+        if isinstance(action, ast.Symbol):
+            self.reused += 1
+            return ast.Load(node.type, action)
+        cell = self.row_cells.get(node)
+        if cell is not None:
+            node.var, node.indices = cell, node.indices[-1:]
+        for field in fields(node):
+            setattr(node, field.name, self.rewrite(getattr(node, field.name)))
+        return node if action is None else action
+
+    def decide(self, number: tuple):
+        """
+        Give a cell to a value if it is computed enough times to pay for it.
+        """
+        found = [node for node in self.occurrences.pop(number, []) if node not in self.dead]
+        cost = self.costs[number]
+        if len(found) < 2 or (len(found) - 1) * (cost - 1) <= 2:  # The cell costs a DUP and a STOREL
+            return
+        first, later = found[0], found[1:]
+        inside = [inner for node in later for inner in ast.walk(node) if inner is not node]
+        if any(isinstance(self.actions.get(inner), ast.Cache) for inner in inside):
+            return      # A value the rest of the block loads is computed in there
+        cell = self.cell(first.type)
+        self.actions[first] = ast.Cache(first.type, cell, first)
+        for node in later:
+            self.actions[node] = cell
+        self.dead.update(inside)
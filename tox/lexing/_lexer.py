@@ -1,8 +1,7 @@
-import sys
 
 from ply import lex
 
-from tox import find_column, lex_error
+from tox.utils.errors import find_column, lex_error
 
 arithmetics_literals = "[]()+-/*%^!{}&"     # Literals for arithmetics
 general_literals = ",:;"                    # Literals for general use
@@ -95,11 +94,32 @@ t_ignore = ' \t'    # Ignore spaces and tabs
 
 def t_error(t):    # Error handling
     lex_error(t, "Illegal character '%s'" % t.value[0])
-    sys.exit(1)
-
-lexer = lex.lex()
+    t.lexer.skip(1)
+
+ply_lexer = None
+
+def get_lexer():
+    """
+    Return a new lexer. The rules above are implemented by the hand written lexer in tox.lexing._scanner.
+    """
+    from tox.lexing._scanner import Lexer
+    return Lexer()
+
+def get_ply_lexer():
+    """
+    Build the PLY lexer for the rules above on first use and return it. Kept as the reference implementation.
+    """
+    global ply_lexer
+    if ply_lexer is None:
+        try:    # Precomputed by `make tables`, loaded read-only
+            from tox.lexing import _lextab
+        except ImportError:
+            _lextab = None
+        ply_lexer = lex.lex(optimize=1, lextab=_lextab) if _lextab is not None else lex.lex()
+    return ply_lexer
 
 if __name__ == "__main__":
+    lexer = get_lexer()
     lexer.input("""func main() {
     f: int = 1
 
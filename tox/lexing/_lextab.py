@@ -0,0 +1,10 @@
+# _lextab.py. This file automatically created by PLY (version 3.11). Don't edit!
+_tabversion   = '3.10'
+_lextokens    = set(('AND', 'ASSIGN', 'BREAK', 'COMMENT', 'CONTINUE', 'DEFAULT', 'DO', 'ELSE', 'EQ', 'FLOAT', 'FOR', 'FUNCTION', 'GT', 'GTE', 'ID', 'IF', 'INT', 'LT', 'LTE', 'MATCH', 'MULTICOMMENTS', 'NEQ', 'NEWLINE', 'OR', 'PRINT', 'RARROW', 'READ_FLOAT', 'READ_INT', 'READ_STRING', 'RETI', 'RETURN', 'STRING', 'TYPE_FLOAT', 'TYPE_INT', 'TYPE_STRING', 'TYPE_VEC', 'WHILE'))
+_lexreflags   = 64
+_lexliterals  = '[]()+-/*%^!{}&,:;'
+_lexstateinfo = {'INITIAL': 'inclusive'}
+_lexstatere   = {'INITIAL': [('(?P<t_FLOAT>\\d+f | \\d+\\.\\d+(f)?)|(?P<t_INT>\\d+)|(?P<t_OR>\\|\\|)|(?P<t_AND>&&)|(?P<t_PRINT>print)|(?P<t_STRING>\\"[^"]*\\")|(?P<t_ID>[a-zA-Z_][a-zA-Z0-9_]*)|(?P<t_COMMENT>//.*)|(?P<t_MULTICOMMENTS>/\\*(.|\\n)*?\\*/)|(?P<t_NEWLINE>\\n+)|(?P<t_RETI>\\.\\.\\.)|(?P<t_EQ>==)|(?P<t_GTE>>=)|(?P<t_LTE><=)|(?P<t_NEQ>!=)|(?P<t_RARROW>->)|(?P<t_ASSIGN>=)|(?P<t_GT>>)|(?P<t_LT><)', [None, ('t_FLOAT', 'FLOAT'), None, ('t_INT', 'INT'), ('t_OR', 'OR'), ('t_AND', 'AND'), ('t_PRINT', 'PRINT'), ('t_STRING', 'STRING'), ('t_ID', 'ID'), ('t_COMMENT', 'COMMENT'), ('t_MULTICOMMENTS', 'MULTICOMMENTS'), None, ('t_NEWLINE', 'NEWLINE'), (None, 'RETI'), (None, 'EQ'), (None, 'GTE'), (None, 'LTE'), (None, 'NEQ'), (None, 'RARROW'), (None, 'ASSIGN'), (None, 'GT'), (None, 'LT')])]}
+_lexstateignore = {'INITIAL': ' \t'}
+_lexstateerrorf = {'INITIAL': 't_error'}
+_lexstateeoff = {}
@@ -0,0 +1,138 @@
+from typing import Iterator, Optional
+
+import re
+
+from tox.lexing._lexer import reserved, literals
+from tox.utils.errors import lex_error
+from tox.utils.source import Source
+
+# Splits the input in pieces that tile it exactly: every piece is a token, a run of blanks or
+# newlines, a comment, or a single character that starts no token. One C call splits the whole
+# input, and the pieces are then classified by their first character, which is enough to follow
+# the rules of tox/lexing/_lexer.py. Multiline comments use the unrolled, non-backtracking form
+# of PLY's /\*(.|\n)*?\*/.
+PIECES = re.compile("|".join([
+    r'[a-zA-Z_][a-zA-Z0-9_]*',              # ID, reserved words and print
+    r'\d+(?:f|\.\d+f?)?',                   # INT and FLOAT
+    r'"[^"]*"',                             # STRING
+    r'//.*',                                # COMMENT
+    r'/\*[^*]*\*+(?:[^/*][^*]*\*+)*/',       # MULTICOMMENTS
+    r'\n+',                                 # NEWLINE
+    r'[ \t]+',                              # Ignored
+    r'\.\.\.|->|==|>=|<=|!=|\|\||&&',          # Multi character operators
+    r'.',                                   # Literals, single character operators and errors
+]))
+
+# Pieces that never start a token
+BLANK, NEWLINE = 0, 1
+
+# Kind of the pieces that always produce the same token, or none. Words and blanks are added as they are seen.
+KINDS = {"...": "RETI", "->": "RARROW", "==": "EQ", ">=": "GTE", "<=": "LTE", "!=": "NEQ", "||": "OR", "&&": "AND", "=": "ASSIGN", "<": "LT", ">": "GT"}
+KINDS.update((literal, literal) for literal in literals)
+KINDS.update(reserved)
+KINDS.update({" ": BLANK, "    ": BLANK, "\n": NEWLINE})
+
+LETTERS = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ_")
+
+class Token:
+    """
+    Class that represents a token. Same interface as PLY's LexToken.
+    """
+    __slots__ = ("type", "value", "lineno", "lexpos", "lexer")
+
+    def __repr__(self) -> str:
+        return f"LexToken({self.type},{self.value!r},{self.lineno},{self.lexpos})"
+
+class Lexer:
+    """
+    Hand written lexer for tox. A drop-in replacement for the PLY lexer built from tox/lexing/_lexer.py:
+    it produces the same tokens with the same line numbers, and `lineno` follows the last token returned.
+    """
+    def __init__(self):
+        self.lexdata = ""
+        self.lexpos = 0
+        self.lineno = 1
+        self.source = Source("")
+        self.token = lambda: None
+
+    def clone(self) -> "Lexer":
+        lexer = Lexer()
+        lexer.lineno = self.lineno
+        return lexer
+
+    def input(self, data: str):
+        self.lexdata = data
+        self.lexpos = 0
+        if self.source.text is not data:
+            self.source = Source(data)
+        self.token = self._tokens().__next__    # The parser calls this once per token, so keep it a bare generator step
+
+    def __iter__(self) -> Iterator[Token]:
+        return iter(self.token, None)
+
+    def _tokens(self) -> Iterator[Optional[Token]]:
+        data = self.lexdata
+        lineno = self.lineno
+        kinds = dict(KINDS)
+        known = kinds.get
+        pos = 0
+        while pos is not None:
+            split, pos = pos, None
+            for piece in PIECES.findall(data, split):
+                start = split
+                split += len(piece)
+                kind = known(piece)
+                if kind is None:
+                    c = piece[0]
+                    if c in LETTERS:
+                        if piece.startswith("print"):
+                            # PLY tries the print rule before the ID rule, so 'printer' is 'print' 'er'
+                            kind, piece, pos = "PRINT", "print", start + 5
+                        else:
+                            kind = kinds[piece] = "ID"
+                    elif c == " " or c == "\t":
+                        kinds[piece] = BLANK
+                        continue
+                    elif c == "\n":
+                        lineno += len(piece)
+                        continue
+                    elif c.isdecimal():
+                        if piece[-1] == "f":
+                            piece = piece[:-1] if "." in piece else piece[:-1] + ".0"
+                            kind = "FLOAT"
+                        else:
+                            kind = "FLOAT" if "." in piece else "INT"
+                    elif c == '"' and len(piece) > 1:
+                        kind = "STRING"
+                    elif c == "/":
+                        lineno += piece.count("\n")    # A comment
+                        continue
+                    else:
+                        self._error(start, lineno)  # Reported and skipped, like PLY's lexer.skip(1)
+                        continue
+                elif kind is BLANK:
+                    continue
+                elif kind is NEWLINE:
+                    lineno += 1
+                    continue
+                tok = Token()
+                tok.type = kind
+                tok.value = piece
+                tok.lineno = self.lineno = lineno
+                tok.lexpos = start
+                yield tok
+                if pos is not None:
+                    break   # Split again right after print
+        self.lineno = lineno
+        self.lexpos = len(data)
+        while True:
+            yield None
+
+    def _error(self, pos: int, lineno: int):
+        token = Token()
+        token.type = "error"
+        token.value = self.lexdata[pos:]
+        token.lineno = lineno
+        token.lexpos = self.lexpos = pos
+        token.lexer = self
+        lex_error(token, "Illegal character '%s'" % token.value[0])
@@ -0,0 +1,255 @@
+from typing import Dict, Iterable, List, Optional
+from dataclasses import dataclass, field
+from copy import deepcopy
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+import os
+import threading
+
+from ply import yacc
+
+from tox.lexing._lexer import get_lexer
+from tox.parsing._parser import get_parser
+from tox.semantics._scopes import Scope
+from tox.semantics._functions import Functions
+from tox.semantics._type_check import TypeCheck
+from tox.utils.errors import CompilationError, Diagnostic, Diagnostics, diagnostics_sink
+from tox.utils.source import Source
+from tox.codegen._program import Program
+from tox.codegen._generator import CodeGenerator
+from tox.codegen._folding import ConstantFolder
+from tox.codegen._propagation import ConstantPropagator
+from tox.codegen._dead_stores import DeadStoreEliminator
+from tox.codegen._dead_code import DeadCodeEliminator
+from tox.codegen._inlining import Inliner
+from tox.codegen._hoisting import LoopInvariantHoister
+from tox.codegen._value_numbering import CommonSubexpressionEliminator
+from tox.codegen._peephole import PeepholeOptimizer
+from tox.codegen._tail_calls import TailCallEliminator
+from tox.semantics import _ast as ast
+from tox.parsing._options import CompileOptions
+from tox.semantics._expression import (
+    Primary,
+    Unary,
+    Factor,
+    Term,
+    Comparison,
+    Condition,
+    SubExpression,
+    Expression
+)
+from tox.semantics._statement import (
+    IO,
+    Assignment,
+    Declaration,
+    DeclarationAssignment,
+    If,
+    Match,
+    Loop,
+    BreakContinue
+)
+
+_tables_lock = threading.Lock()    # Guards the first build of the shared parser tables
+
+@dataclass
+class CompilationResult:
+    """
+    Class that holds the outcome of a single compilation.
+
+    Results linked from saved code (see tox.parsing._incremental) only have the serialized code.
+    """
+    program: Optional[Program]
+    diagnostics: List[Diagnostic] = field(default_factory=list)
+    filename: str = "<string>"
+    serialized: Optional[str] = None
+    tree: Optional[ast.Program] = None     # Typed AST the program was generated from
+    peephole_hits: Dict[str, int] = field(default_factory=dict)    # Times each peephole rule was applied
+    dead_code: List[str] = field(default_factory=list)     # What the dead code elimination removed
+
+    @property
+    def ok(self) -> bool:
+        return self.program is not None or self.serialized is not None
+
+    @property
+    def code(self) -> Optional[str]:
+        if self.serialized is None and self.program is not None:
+            self.serialized = self.program.serialize()
+        return self.serialized
+
+class CompilationContext(yacc.LRParser):
+    """
+    Class that holds all the state of a single compilation.
+
+    The grammar tables are shared by every context, everything else is private to it.
+    PLY hands the context to the grammar rules as `p.parser`.
+    """
+    def __init__(self, options: Optional[CompileOptions] = None):
+        with _tables_lock:
+            tables = get_parser()
+        self.productions = tables.productions
+        self.action = tables.action
+        self.goto = tables.goto
+        self.errorfunc = tables.errorfunc
+        self.defaulted_states = {}  # Always read the lookahead first: PLY loses it when a rule fails without one
+        self.errorok = True
+
+        self.options = options or CompileOptions()
+        self.partial = False    # Compile a single unit of an incremental build instead of a whole program
+        self.earlier = None     # Finds the functions of the units before this one, for the inliner
+        self.inlinable: Dict[str, ast.Function] = {}    # The functions of a unit the next units can inline, as the inliner saw them
+        self.source = Source("")
+        self.diagnostics = Diagnostics(self.options.max_errors)
+        self.checkpoints = {}   # Semantic state after the last complete item of each list on the parser stack
+
+        self.primary_handler = Primary()
+        self.unary_handler = Unary()
+        self.factor_handler = Factor()
+        self.term_handler = Term()
+        self.comparison_handler = Comparison()
+        self.condition_handler = Condition()
+        self.subexpression_handler = SubExpression()
+        self.expression_handler = Expression()
+
+        self.io_handler = IO()
+        self.assignment_handler = Assignment()
+        self.declaration_handler = Declaration()
+        self.declaration_assignment_handler = DeclarationAssignment()
+        self.if_handler = If()
+        self.match_handler = Match()
+        self.loop_handler = Loop()
+        self.loop_break_handler = BreakContinue()
+
+        self.functions_handler = Functions()
+        self.num_params = 0
+        self.num_args = []
+
+        self.frame_count = 0
+        self.global_count = 0
+        self.current_scope: Scope = Scope(name="Global Scope", level=0, parent=None)
+
+        self.type_checker = TypeCheck()
+
+        self.current_loops = [] # This is needed for break and continue statements to be checked
+        self.array_assign_items = 0
+        self.indexing_depth = []
+        self.arr_dim = []
+
+    def compile(self, text: str) -> CompilationResult:
+        """
+        Compile a whole program. A context can only be used once.
+        """
+        token = diagnostics_sink.set(self.diagnostics)
+        try:
+            tree = self.parse(text)
+        except CompilationError:
+            tree = None
+        finally:
+            diagnostics_sink.reset(token)
+        if self.diagnostics.error_count or tree is None:
+            return CompilationResult(None, self.diagnostics, self.options.filename)
+        if self.options.fold_constants:
+            tree = ConstantFolder().fold(tree)
+        if self.options.propagate_constants:
+            tree = ConstantPropagator().propagate(tree)
+        if self.options.dead_stores:
+            tree = DeadStoreEliminator().eliminate(tree)
+        eliminator = DeadCodeEliminator() if self.options.dead_code else None
+        if eliminator is not None:
+            tree = eliminator.prune(tree)
+        if self.options.inline_size:
+            inliner = Inliner(self.options.inline_size)
+            tree = inliner.inline(tree, self.earlier)
+            if self.partial:    # The passes below change them
+                self.inlinable = {function.data.name: deepcopy(function) for function in tree.functions if inliner.inlinable(function)}
+        if self.options.hoisting:
+            tree = LoopInvariantHoister().hoist(tree)
+        if self.options.common_subexpressions:
+            tree = CommonSubexpressionEliminator().eliminate(tree)
+        removed = []
+        if eliminator is not None:
+            tree = eliminator.eliminate(tree, partial=self.partial)
+            removed = eliminator.removed
+        if self.options.tail_calls:
+            tree = TailCallEliminator().eliminate(tree)
+        program = CodeGenerator().generate(tree, partial=self.partial)
+        hits = {}
+        if self.options.peephole:
+            optimizer = PeepholeOptimizer()
+            program = optimizer.optimize(program)
+            hits = dict(optimizer.hits)
+        return CompilationResult(program, self.diagnostics, self.options.filename, tree=tree, peephole_hits=hits, dead_code=removed)
+
+    def parse(self, input=None, lexer=None, debug=False, tracking=False, tokenfunc=None):
+        """
+        Parse and check a program into its typed syntax tree, with a lexer of its own unless one is given.
+        """
+        if lexer is None:
+            self.source = Source(input, self.options.filename)
+            lexer = get_lexer()
+            lexer.source = self.source  # Shared, so the line table is built at most once per compilation
+        return super().parse(input, lexer, debug, tracking, tokenfunc)
+
+    def checkpoint(self, p):
+        """
+        Remember the semantic state after a complete statement, function or global declaration.
+
+        It is keyed by the position of the list on the parser stack, which is where
+        error recovery resumes when something goes wrong in the next item of that list.
+        """
+        self.checkpoints[len(p.stack)] = (
+            self.current_scope,
+            self.functions_handler.current_function,
+            self.frame_count,
+            self.global_count,
+            len(self.type_checker.stack),
+            len(self.current_loops),
+            len(self.num_args),
+            len(self.indexing_depth),
+            len(self.arr_dim),
+        )
+
+    def recover(self, p):
+        """
+        Drop whatever the item that failed left behind, back to the last checkpoint of its list.
+        """
+        (self.current_scope,
+         self.functions_handler.current_function,
+         self.frame_count,
+         self.global_count,
+         types, loops, args, indexing_depth, arr_dim) = self.checkpoints[len(p.stack)]
+        del self.type_checker.stack[types:]
+        del self.current_loops[loops:]
+        del self.num_args[args:]
+        del self.indexing_depth[indexing_depth:]
+        del self.arr_dim[arr_dim:]
+        self.array_assign_items = 0
+
+def compile_source(text: str, options: Optional[CompileOptions] = None) -> CompilationResult:
+    """
+    Compile a program and return its code and diagnostics.
+    """
+    return CompilationContext(options).compile(text)
+
+def _compile_unit(unit) -> CompilationResult:
+    text, options = unit
+    return compile_source(text, options)
+
+def compile_batch(sources: Iterable[str], options: Optional[Iterable[CompileOptions]] = None, workers: Optional[int] = None, processes: bool = False) -> List[CompilationResult]:
+    """
+    Compile many programs in one warm process. Results keep the order of the sources.
+
+    Threads share the already loaded tables. Processes sidestep the GIL for large batches.
+    """
+    sources = list(sources)
+    options = list(options) if options is not None else [CompileOptions() for _ in sources]
+    if len(options) != len(sources):
+        raise ValueError("compile_batch needs one CompileOptions per source")
+    units = list(zip(sources, options))
+    if processes:
+        workers = workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(_compile_unit, units, chunksize=max(1, len(units) // (4 * workers))))
+    with _tables_lock:
+        get_parser()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_compile_unit, units))
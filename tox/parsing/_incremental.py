@@ -0,0 +1,268 @@
+from typing import Dict, List, Optional, Tuple
+
+import re
+import hashlib
+
+from tox.parsing._options import CompileOptions
+from tox.parsing._compiler import CompilationContext, CompilationResult, compile_source
+from tox.semantics._scopes import Scope, MetaData
+from tox.semantics._functions import FunctionData
+from tox.codegen._program import Instruction
+from tox.codegen._generator import CodeGenerator
+from tox.codegen._peephole import PeepholeOptimizer
+from tox.codegen._dead_code import GlobalDeclaration, references, reachable, unused_globals
+from tox.semantics import _ast as ast
+
+# An incremental build compiles the global declarations and every function as separate units and
+# then links them. Each function unit is saved together with what its code depends on:
+#   - its signature,
+#   - the global variables it reads or writes (name, type and address),
+#   - the signatures of the functions it calls.
+# On the next build a function whose text and dependencies did not change is not compiled again.
+# Labels are local to each function (see Functions._id), so its code never depends on its position.
+#
+# A function can be inlined in the functions after it (see tox.codegen._inlining), so a function
+# also depends on the text of the earlier functions it calls, and the globals they use.
+#
+# Dead functions and unused globals can only be found once every unit is known, so each unit saves
+# what it calls and uses and the link step leaves out what main never reaches (see tox.codegen._dead_code).
+#
+# Anything that produces a diagnostic falls back to a regular compilation of the whole program,
+# so errors and warnings are always reported exactly as `compile_source` reports them.
+
+RECORD_VERSION = 3
+
+Record = Dict
+
+# Only what is needed to find the functions: strings and comments are skipped so that their braces are not counted
+UNIT_TOKENS = re.compile(r'"[^"]*"|//.*|/\*(?:.|\n)*?\*/|[{}]|\bfunc\s+([a-zA-Z_][a-zA-Z0-9_]*)')
+
+def split_units(text: str) -> Tuple[str, List[Tuple[str, int, int, str]]]:
+    """
+    Split a program in its global declarations and its functions.
+
+    Returns the text of the global declarations and a (name, line, column, text) tuple per function.
+    The split does not validate anything, a malformed program simply fails to compile.
+    """
+    starts = []
+    depth = 0
+    for match in UNIT_TOKENS.finditer(text):
+        token = match.group()
+        if token == "{":
+            depth += 1
+        elif token == "}":
+            depth -= 1
+        elif match.group(1) is not None and depth == 0:
+            starts.append((match.start(), match.group(1)))
+
+    units = []
+    line, counted = 1, 0
+    for i, (start, name) in enumerate(starts):
+        end = starts[i+1][0] if i + 1 < len(starts) else len(text)
+        line += text.count("\n", counted, start)
+        counted = start
+        column = start - (text.rfind("\n", 0, start) + 1)
+        units.append((name, line, column, text[start:end]))
+    return text[:starts[0][0]] if starts else text, units
+
+def _hash(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+def _meta(meta: MetaData) -> Dict:
+    return {"type": meta.type, "stack_position": list(meta.stack_position), "array_shape": meta.array_shape, "p_init": meta.p_init}
+
+def _signature(func: FunctionData) -> Dict:
+    return {"input_types": list(func.input_types), "output_type": func.output_type}
+
+def _compile_unit(text: str, options: CompileOptions, global_table: Dict[str, MetaData], functions: Dict[str, FunctionData], earlier=None) -> Tuple[CompilationContext, CompilationResult]:
+    """
+    Compile a single unit on top of the global variables and the functions declared before it.
+    `earlier` finds the bodies of the functions defined before it, for the inliner.
+    """
+    context = CompilationContext(options)
+    context.partial = True
+    context.earlier = earlier
+    context.current_scope = Scope(name="Global Scope", level=0, parent=None, Table=dict(global_table))
+    context.global_count = sum(meta.size_in_cells for meta in global_table.values())
+    context.functions_handler.Table = {name: FunctionData(func.name, func.init, list(func.input_types), func.output_type) for name, func in functions.items()}
+    return context, context.compile(text)
+
+def compile_incremental(text: str, options: Optional[CompileOptions] = None, record: Optional[Record] = None) -> Tuple[CompilationResult, Optional[Record]]:
+    """
+    Compile a program, reusing the functions of a previous build that did not change.
+
+    Returns the result and the record to pass to the next build.
+    """
+    options = options or CompileOptions()
+    if record is not None and (record.get("version") != RECORD_VERSION or record.get("options") != options.cache_key()):
+        record = None
+
+    globals_text, units = split_units(text)
+
+    # Global declarations
+    previous = record["globals"] if record is not None else None
+    if previous is not None and previous["hash"] == _hash(globals_text):
+        global_table = {name: MetaData(meta["type"], tuple(meta["stack_position"]), meta["array_shape"], meta["p_init"]) for name, meta in previous["table"].items()}
+        globals_record = previous
+    else:
+        context, result = _compile_unit(globals_text, options, {}, {})
+        if not result.ok or result.diagnostics:
+            return compile_source(text, options), None
+        global_table = context.current_scope.Table
+        globals_record = {
+            "hash": _hash(globals_text),
+            "table": {name: _meta(meta) for name, meta in global_table.items()},
+            "code": result.code,
+            "declarations": [_declaration(stmt, options) for stmt in result.tree.globals],
+        }
+
+    # Functions, in order, so that each one only sees the functions declared before it
+    previous_functions = {entry["hash"]: entry for entry in record["functions"]} if record is not None else {}
+    functions: Dict[str, FunctionData] = {}
+    defined: Dict[str, str] = {}    # Hash of the unit that defines each function seen so far
+    trees: Dict[str, Optional[ast.Function]] = {}   # The functions later units can inline, None for the others
+    sources: Dict[str, Tuple[str, Dict[str, FunctionData]]] = {}
+
+    def earlier(name: str) -> Optional[ast.Function]:
+        """
+        The body of a function defined by an earlier unit. A unit that was not compiled in this build is compiled again.
+        """
+        if name not in defined:
+            return None
+        if name not in trees:
+            padded, before = sources[name]
+            context, _ = _compile_unit(padded, options, global_table, before)
+            trees[name] = context.inlinable.get(name)
+        return trees[name]
+
+    function_records = []
+    compiled = 0
+    for name, line, column, unit in units:
+        unit_hash = _hash(unit)
+        entry = previous_functions.get(unit_hash)
+        padded = "\n" * (line - 1) + " " * column + unit    # Keep line and column numbers of the whole program
+        before = dict(functions)
+        if entry is None or not _reusable(entry, global_table, functions, defined):
+            context, result = _compile_unit(padded, options, global_table, functions, earlier if options.inline_size else None)
+            if not result.ok or result.diagnostics:
+                return compile_source(text, options), None
+            func = context.functions_handler.get(name)
+            bodies = [function for function in result.tree.functions if function.body is not None]
+            refs = references([function.body for function in bodies])
+            callees = sorted(callee for callee in context.functions_handler.callees if callee != name)
+            entry = {
+                "hash": unit_hash,
+                "name": func.name,
+                "init": func.init,
+                "signature": _signature(func),
+                "globals": {var: _meta(global_table[var]) for var in sorted(context.current_scope.accessed | refs.uses)},   # Those of the inlined functions too
+                "callees": {callee: _signature(context.functions_handler.get(callee)) for callee in callees},
+                "bodies": {callee: defined.get(callee) for callee in callees} if options.inline_size else {},  # Whether a callee is inlined depends on its body
+                "code": result.code,
+                "defines": bool(bodies),
+                "calls": sorted(refs.calls),
+                "uses": sorted(refs.uses),
+                "addresses": refs.addresses,
+                "dead_code": result.dead_code,
+            }
+            compiled += 1
+            if bodies:
+                trees[name] = context.inlinable.get(name)
+        if entry["defines"]:
+            defined[entry["name"]] = unit_hash
+            sources[entry["name"]] = (padded, before)
+        functions[entry["name"]] = FunctionData(entry["name"], entry["init"], list(entry["signature"]["input_types"]), entry["signature"]["output_type"])
+        function_records.append(entry)
+
+    # Link
+    if "main" not in functions or not all(func.init for func in functions.values()):
+        return compile_source(text, options), None
+    preamble = "".join(f"{Instruction.parse(line)}\n" for line in ["start", "PUSHA main", "CALL", "stop"])
+    removed = []
+    if options.dead_code:
+        globals_code, functions_code, removed = _eliminate(globals_record, function_records)
+        code = globals_code + preamble + functions_code
+    else:
+        code = globals_record["code"] + preamble + "".join(entry["code"] for entry in function_records)
+
+    new_record = {
+        "version": RECORD_VERSION,
+        "options": options.cache_key(),
+        "globals": globals_record,
+        "functions": function_records,
+        "compiled": compiled,
+        "reused": len(units) - compiled,
+    }
+    return CompilationResult(None, [], options.filename, serialized=code, dead_code=removed), new_record
+
+def _declaration(stmt, options: CompileOptions) -> Dict:
+    """
+    What the link step needs to leave out a global declaration, and its code on its own.
+    """
+    program = CodeGenerator().generate(ast.Program([stmt], []), partial=True)
+    if options.peephole:    # No rule spans two declarations, so their code is the same as in the whole unit
+        program = PeepholeOptimizer().optimize(program)
+    declaration = GlobalDeclaration.of(stmt)
+    return {
+        "name": declaration.name,
+        "cells": declaration.cells,
+        "uses": sorted(declaration.uses),
+        "addresses": declaration.addresses,
+        "reads": declaration.reads,
+        "code": program.serialize(),
+    }
+
+def _eliminate(globals_record: Record, function_records: List[Record]) -> Tuple[str, str, List[str]]:
+    """
+    Link only the functions main reaches and the globals they use, like DeadCodeEliminator does for a whole program.
+
+    Returns the code of the globals, the code of the functions and what was removed.
+    """
+    graph = {entry["name"]: set(entry["calls"]) for entry in function_records if entry["defines"]}
+    live = reachable({"main"}, graph)
+    removed = []
+    functions_code = []
+    used = set()
+    addressed = False
+    for entry in function_records:
+        if not entry["defines"]:
+            continue    # Every function is defined by now, its declaration needs no code
+        if entry["name"] not in live:
+            removed.append(f"function '{entry['name']}' is never called")
+            continue
+        removed.extend(entry["dead_code"])
+        functions_code.append(entry["code"])
+        used.update(entry["uses"])
+        addressed = addressed or entry["addresses"]
+
+    declarations = globals_record["declarations"]
+    unused = unused_globals([GlobalDeclaration(d["name"], d["cells"], set(d["uses"]), d["addresses"], d["reads"]) for d in declarations], used, addressed)
+    globals_code = []
+    reserved = 0    # Cells of the unused globals since the last one that is kept
+    for declaration in declarations:
+        if declaration["name"] in unused:
+            removed.append(f"global '{declaration['name']}' is never used")
+            reserved += unused[declaration["name"]] or 0
+            continue
+        if reserved:
+            globals_code.append(f"{Instruction('PUSHN', reserved) if reserved > 1 else Instruction('PUSHI', 0)}\n")   # As CodeGenerator.zeros pushes them
+            reserved = 0
+        globals_code.append(declaration["code"])
+    return "".join(globals_code), "".join(functions_code), removed
+
+def _reusable(entry: Record, global_table: Dict[str, MetaData], functions: Dict[str, FunctionData], defined: Dict[str, str]) -> bool:
+    """
+    Whether the saved code of a function is still valid in the current program.
+    """
+    if entry["name"] in functions and functions[entry["name"]].init:
+        return False    # Redefinition, let it be reported
+    for name, meta in entry["globals"].items():
+        if name not in global_table or _meta(global_table[name]) != meta:
+            return False
+    for name, signature in entry["callees"].items():
+        if name not in functions or _signature(functions[name]) != signature:
+            return False
+    for name, unit_hash in entry["bodies"].items():
+        if defined.get(name) != unit_hash:
+            return False
+    return True
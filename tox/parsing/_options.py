@@ -0,0 +1,32 @@
+from typing import Dict
+
+from dataclasses import dataclass
+
+@dataclass
+class CompileOptions:
+    """
+    Class that holds the options of a single compilation.
+    """
+    filename: str = "<string>"
+    max_errors: int = 20    # Errors reported before the compilation stops, 0 for no limit
+    fold_constants: bool = True     # Evaluate the operations on literals at compile time (see tox.codegen._folding)
+    propagate_constants: bool = True    # Replace the reads of local variables whose value is known by it (see tox.codegen._propagation)
+    dead_stores: bool = True        # Drop the assignments to local variables that are never read afterwards (see tox.codegen._dead_stores)
+    peephole: bool = True           # Rewrite redundant instruction sequences (see tox.codegen._peephole)
+    dead_code: bool = True          # Remove unreachable code, functions and globals (see tox.codegen._dead_code)
+    inline_size: int = 64           # Largest body, in syntax tree nodes, of the functions inlined at their calls, 0 for none (see tox.codegen._inlining)
+    hoisting: bool = True           # Compute the expressions that don't change in a loop before it (see tox.codegen._hoisting)
+    common_subexpressions: bool = True  # Compute each value once in every basic block (see tox.codegen._value_numbering)
+    tail_calls: bool = True         # Turn the calls of functions to themselves in tail position into jumps (see tox.codegen._tail_calls)
+
+    def settings(self) -> Dict:
+        """
+        Return every option but the filename, which is all a compile server needs to build the same code.
+        """
+        return {name: value for name, value in vars(self).items() if name != "filename"}
+
+    def cache_key(self) -> str:
+        """
+        Return the part of the options that affects the generated code.
+        """
+        return ",".join(f"{name}={value}" for name, value in sorted(self.settings().items()))
@@ -2,13 +2,14 @@ import sys
 
 from ply import yacc
 
-import tox
+from tox.utils.colors import *
 from tox.lexing._lexer import *
-from tox import Scope, MetaData
-from tox import Functions, FunctionData
-from tox import TypeCheck
-from tox.utils.errors import syntax_error, compiler_error, compiler_note, compiler_warning
-from tox import (
+from tox.semantics._scopes import Scope, MetaData
+from tox.semantics._functions import Functions, FunctionData
+from tox.semantics._type_check import TypeCheck
+from tox.utils.errors import CompilationError, Diagnostic, report, syntax_error, compiler_error, compiler_note, compiler_warning
+from tox.semantics import _ast as ast
+from tox.semantics._expression import (
     Primary,
     Unary,
     Factor,
@@ -18,7 +19,7 @@ from tox import (
     SubExpression,
     Expression
 )
-from tox import (
+from tox.semantics._statement import (
     IO,
     Assignment,
     Declaration,
@@ -34,46 +35,56 @@ def p_prog(p):
     """
     prog : global_declarations functions
     """
-    parser.global_count = 0
-    parser.loop_count = 0
-    parser.if_count = 0
-    if not parser.type_checker.is_empty():
-        for type, line in parser.type_checker.stack:
+    if p.parser.diagnostics.error_count:
+        raise CompilationError()    # Everything was reported already, a broken program has no code
+    p.parser.global_count = 0
+    if not p.parser.type_checker.is_empty():
+        for type, line in p.parser.type_checker.stack:
             compiler_warning(p, line, f"Unused return value of type '{type}'")
-            compiler_note(f"\n{line-2:5}|  {p.lexer.lexdata.splitlines()[line-2]}\n{line-1:5}|  {p.lexer.lexdata.splitlines()[line-1]}  {tox.COLOR_BLUE}<- Value was return here{tox.RESET_COLOR}\n{line:5}|  {p.lexer.lexdata.splitlines()[line]}")
+            source = p.parser.source
+            compiler_note(f"\n{line-2:5}|  {source.line(line-1)}\n{line-1:5}|  {source.line(line)}  {COLOR_BLUE}<- Value was return here{RESET_COLOR}\n{line:5}|  {source.line(line+1)}")
 
-    if parser.functions_handler.get("main") is None:
+    p[0] = ast.Program(p[1], p[2])
+    if p.parser.partial:    # A single unit of an incremental build. It is checked and linked by tox.parsing._incremental
+        return
+
+    if p.parser.functions_handler.get("main") is None:
         compiler_error(p, 0, "Did not find main function")
         compiler_note("Called from p_prog.")
-        sys.exit(1)
+        raise CompilationError()
 
-    for function, meta in parser.functions_handler.Table.items():
+    for function, meta in p.parser.functions_handler.Table.items():
         if meta.init is False:
             compiler_warning(p, 0, f"Function '{function}' was declared but not defined")
-            sys.exit(1)
-
-    p[0] = p[1]
-    p[0] += "start\n"
-    p[0] += f"PUSHA main\n"
-    p[0] += f"CALL\n"
-    p[0] += "stop\n"
-    p[0] += p[2]
+            raise CompilationError()
 
 ######################
 ##   GLOBAL RULES   ##
 ######################
 
+# Lists are left recursive so that PLY reduces each item as soon as it is parsed
+# and the parser stack does not grow with the length of the program.
 def p_global_declarations(p):
     """
-    global_declarations : global_declaration global_declarations
+    global_declarations : global_declarations global_declaration
     """
-    p[0] = p[1] + p[2]
+    p[1].append(p[2])
+    p[0] = p[1]
+    p.parser.checkpoint(p)
 
 def p_global_declarations_empty(p):
     """
     global_declarations :
     """
-    p[0] = ""
+    p[0] = []
+    p.parser.checkpoint(p)
+
+def p_global_declarations_error(p):
+    """
+    global_declarations : global_declarations error
+    """
+    p[0] = p[1]
+    p.parser.recover(p)
 
 def p_global_declaration(p):
     """
@@ -88,15 +99,25 @@ def p_global_declaration(p):
 
 def p_functions(p):
     """
-    functions : function functions
+    functions : functions function
     """
-    p[0] = p[1] + p[2]
+    p[1].append(p[2])
+    p[0] = p[1]
+    p.parser.checkpoint(p)
 
 def p_functions_empty(p):
     """
     functions :
     """
-    p[0] = ""
+    p[0] = []
+    p.parser.checkpoint(p)
+
+def p_functions_error(p):
+    """
+    functions : functions error
+    """
+    p[0] = p[1]
+    p.parser.recover(p)
 def p_function(p):
     """
     function : function_declaration
@@ -112,32 +133,33 @@ def p_function_definition(p):
     """
     function_definition : function_header function_body
     """
-    p[0] = p[1] + p[2]
+    p[1].body = p[2]
+    p[0] = p[1]
 def p_function_def(p):
     """
     function_def : function_id ss '(' params ')' out_type es
     """
-    p[0] = parser.functions_handler.handle(p, 'def')
+    p[0] = p.parser.functions_handler.handle(p, 'def')
 def p_function_header(p):
     """
     function_header : function_id ss '(' params ')' out_type
     """
-    p[0] = parser.functions_handler.handle(p, 'header')
+    p[0] = p.parser.functions_handler.handle(p, 'header')
 def p_function_id(p):
     """
     function_id : FUNCTION ID
     """
-    p[0] = parser.functions_handler.handle(p, 'id')
+    p[0] = p.parser.functions_handler.handle(p, 'id')
 def p_function_body(p):
     """
     function_body : '{' stmts '}' es
     """
-    p[0] = parser.functions_handler.handle(p, 'body')
+    p[0] = p.parser.functions_handler.handle(p, 'body')
 def p_function_call(p):
     """
     function_call : f_call '(' args ')'
     """
-    p[0] = parser.functions_handler.handle(p, 'call')
+    p[0] = p.parser.functions_handler.handle(p, 'call')
 def p_f_call(p):
     """
     f_call : ID
@@ -149,23 +171,24 @@ def p_params(p):
     """
     params : params ',' param
     """
-    p[0] = p[1] + p[3]
+    p[1].append(p[3])
+    p[0] = p[1]
 def p_params_empty(p):
     """
     params :
     """
-    p[0] = ""
+    p[0] = []
 def p_single_param(p):
     """
     params : param
     """
-    p[0] = p[1]
+    p[0] = [p[1]]
 def p_param(p):
     """
     param : ID ':' type
         |   ID ':' Ptype
     """
-    p[0] = parser.functions_handler.handle(p, 'parameter')
+    p[0] = p.parser.functions_handler.handle(p, 'parameter')
 
 def p_out_type(p):
     """
@@ -173,27 +196,28 @@ def p_out_type(p):
             | RARROW Ptype
             |
     """
-    p[0] = parser.functions_handler.handle(p, 'out_type')
+    p[0] = p.parser.functions_handler.handle(p, 'out_type')
 
 def p_args(p):
     """
     args : args ',' arg
     """
-    p[0] = p[3] + p[1]
+    p[1].append(p[3])
+    p[0] = p[1]
 def p_args_empty(p):
     """
     args :
         | arg
     """
     if len(p) == 1:
-        p[0] = ""
+        p[0] = []
     else:
-        p[0] = p[1]
+        p[0] = [p[1]]
 def p_single_arg(p):
     """
     arg : expression
     """
-    p[0] = parser.functions_handler.handle(p, 'argument')
+    p[0] = p.parser.functions_handler.handle(p, 'argument')
 
 
 ######################
@@ -202,14 +226,23 @@ def p_single_arg(p):
 
 def p_stmts(p):
     """
-    stmts : stmt stmts
+    stmts : stmts stmt
     """
-    p[0] = p[1] + p[2]
+    p[1].append(p[2])
+    p[0] = p[1]
+    p.parser.checkpoint(p)
 def p_stmts_empty(p):
     """
     stmts :
     """
-    p[0] = ""
+    p[0] = []
+    p.parser.checkpoint(p)
+def p_stmts_error(p):
+    """
+    stmts : stmts error
+    """
+    p[0] = p[1]
+    p.parser.recover(p)
 def p_stmt(p):
     """
     stmt : print
@@ -253,7 +286,7 @@ def p_return(p):
     return : RETURN expression
             | RETURN ';'
     """
-    p[0] = parser.functions_handler.handle(p, 'return')
+    p[0] = p.parser.functions_handler.handle(p, 'return')
 
 ######################
 ##    BREAK STMT    ##
@@ -263,12 +296,12 @@ def p_break(p):
     """
     break : BREAK
     """
-    p[0] = parser.loop_break_handler.handle(p, "break")
+    p[0] = p.parser.loop_break_handler.handle(p, "break")
 def p_continue(p):
     """
     continue : CONTINUE
     """
-    p[0] = parser.loop_break_handler.handle(p, "continue")
+    p[0] = p.parser.loop_break_handler.handle(p, "continue")
 
 ######################
 ##    LOOPS STMT    ##
@@ -278,13 +311,13 @@ def p_for(p):
     """
     for : loop_for ss '(' for_inits ';' expression ';' for_updates ')' ss '{' stmts  '}' es es
     """
-    p[0] = parser.loop_handler.handle(p, "for")
+    p[0] = p.parser.loop_handler.handle(p, "for")
 def p_for_inits(p):
     """
     for_inits : for_inits ',' for_init
             | for_init
     """
-    p[0] = parser.loop_handler.handle(p, "for_inits")
+    p[0] = p.parser.loop_handler.handle(p, "for_inits")
 def p_for_init(p):
     """
     for_init : declaration_assignment
@@ -292,47 +325,47 @@ def p_for_init(p):
             | assignment
             |
     """
-    p[0] = parser.loop_handler.handle(p, "for_init")
+    p[0] = p.parser.loop_handler.handle(p, "for_init")
 def p_for_updates(p):
     """
     for_updates : for_updates ',' for_update
             | for_update
     """
-    p[0] = parser.loop_handler.handle(p, "for_updates")
+    p[0] = p.parser.loop_handler.handle(p, "for_updates")
 def p_for_update(p):
     """
     for_update : assignment
     """
-    p[0] = parser.loop_handler.handle(p, "for_update")
+    p[0] = p.parser.loop_handler.handle(p, "for_update")
 
 def p_do_while(p):
     """
     do_while : loop_do ss '{' stmts '}' es WHILE '(' expression ')'
     """
-    p[0] = parser.loop_handler.handle(p, "do_while")
+    p[0] = p.parser.loop_handler.handle(p, "do_while")
 
 def p_while(p):
     """
     while : loop_while expression ss '{' stmts '}' es
     """
-    p[0] = parser.loop_handler.handle(p, "while")
+    p[0] = p.parser.loop_handler.handle(p, "while")
 
 # This functions append the loop type to the loop list
 def p_loop_for(p):
     """
     loop_for : FOR
     """
-    parser.current_loops.append("FOR")
+    p.parser.current_loops.append("FOR")
 def p_loop_do(p):
     """
     loop_do : DO
     """
-    parser.current_loops.append("DO")
+    p.parser.current_loops.append("DO")
 def p_loop_while(p):
     """
     loop_while : WHILE
     """
-    parser.current_loops.append("WHILE")
+    p.parser.current_loops.append("WHILE")
 
 ######################
 ##     IF STMT      ##
@@ -342,19 +375,19 @@ def p_if(p):
     """
     if : IF expression ss '{' stmts '}' es else_if
     """
-    p[0] = parser.if_handler.handle(p, "if")
+    p[0] = p.parser.if_handler.handle(p, "if")
 def p_else_if(p):
     """
     else_if : ELSE IF expression ss '{' stmts '}' es else_if
             | else
     """
-    p[0] = parser.if_handler.handle(p, "else_if")
+    p[0] = p.parser.if_handler.handle(p, "else_if")
 def p_else(p):
     """
     else : ELSE ss '{' stmts '}' es
         |
     """
-    p[0] = parser.if_handler.handle(p, "else")
+    p[0] = p.parser.if_handler.handle(p, "else")
 
 ######################
 ##   SWITCH STMT    ##
@@ -364,7 +397,7 @@ def p_match(p):
     """
     match : match_start expression '{' cases '}'
     """
-    p[0] = parser.match_handler.handle(p, "match")
+    p[0] = p.parser.match_handler.handle(p, "match")
 def p_match_start(p):
     """
     match_start : MATCH
@@ -375,12 +408,12 @@ def p_cases(p):
     cases : expression RARROW ss '{' stmts '}' es cases
         | default
     """
-    p[0] = parser.match_handler.handle(p, "cases")
+    p[0] = p.parser.match_handler.handle(p, "cases")
 def p_default(p):
     """
     default : DEFAULT RARROW ss '{' stmts '}' es
     """
-    p[0] = parser.match_handler.handle(p, "default")
+    p[0] = p.parser.match_handler.handle(p, "default")
 
 ######################
 ##    INIT STMT     ##
@@ -390,29 +423,29 @@ def p_variable_init(p):
     """
     declaration_assignment : ID ':' type ASSIGN expression
     """
-    p[0] = parser.declaration_assignment_handler.handle(p, "variable_init")
+    p[0] = p.parser.declaration_assignment_handler.handle(p, "variable_init")
 def p_pointer_init(p):
     """
     declaration_assignment : ID ':' Ptype ASSIGN expression
     """
-    p[0] = parser.declaration_assignment_handler.handle(p, "pointer_init")
+    p[0] = p.parser.declaration_assignment_handler.handle(p, "pointer_init")
 def p_array_literal_init(p):
     """
     declaration_assignment : ID ':' Vtype ndim ASSIGN '[' arrayitems ']'
                         | ID ':' Vtype ASSIGN '[' arrayitems ']'
     """
-    p[0] = parser.declaration_assignment_handler.handle(p, "array_literal_init")
+    p[0] = p.parser.declaration_assignment_handler.handle(p, "array_literal_init")
 def p_array_range_init(p):
     """
     declaration_assignment : ID ':' Vtype ASSIGN '['  INT  RETI  INT ']'
     """
-    p[0] = parser.declaration_assignment_handler.handle(p, "array_range_init")
+    p[0] = p.parser.declaration_assignment_handler.handle(p, "array_range_init")
 def p_array_items(p):
     """
     arrayitems : arrayitems ',' expression
         | expression
     """
-    p[0] = parser.declaration_assignment_handler.handle(p, "array_items")
+    p[0] = p.parser.declaration_assignment_handler.handle(p, "array_items")
 
 ######################
 ##   DECLARE STMT   ##
@@ -448,12 +481,12 @@ def p_assignment_indexing(p):
     """
     assignment : ID ndepth ASSIGN expression
     """
-    p[0] = parser.assignment_handler.handle(p, "indexing")
+    p[0] = p.parser.assignment_handler.handle(p, "indexing")
 def p_assignment_expression(p):
     """
     assignment : ID ASSIGN expression
     """
-    p[0] = parser.assignment_handler.handle(p, "variable")
+    p[0] = p.parser.assignment_handler.handle(p, "variable")
 
 ######################
 ##    READ  STMT    ##
@@ -463,14 +496,14 @@ def p_read(p):
     """
     read : read_type '(' multiple_prints ')'
     """
-    p[0] = parser.io_handler.handle(p, "read")
+    p[0] = p.parser.io_handler.handle(p, "read")
 def p_read_type(p):
     """
     read_type : READ_INT
             | READ_FLOAT
             | READ_STRING
     """
-    p[0] = parser.io_handler.handle(p, "read_type")
+    p[0] = p.parser.io_handler.handle(p, "read_type")
 
 ######################
 ##    PRINT STMT    ##
@@ -480,22 +513,22 @@ def p_print(p):
     """
     print : PRINT '(' multiple_prints ')'
     """
-    p[0] = parser.io_handler.handle(p, "print")
+    p[0] = p.parser.io_handler.handle(p, "print")
 def p_print_multiple(p):
     """
     multiple_prints : multiple_prints ',' expression
     """
-    p[0] = parser.io_handler.handle(p, "multiple")
+    p[0] = p.parser.io_handler.handle(p, "multiple")
 def p_print_single(p):
     """
     multiple_prints : expression
     """
-    p[0] = parser.io_handler.handle(p, "single")
+    p[0] = p.parser.io_handler.handle(p, "single")
 def p_print_empty(p):
     """
     multiple_prints :
     """
-    p[0] = parser.io_handler.handle(p, "empty")
+    p[0] = p.parser.io_handler.handle(p, "empty")
 
 ######################
 ## TYPES INITAL IMP ##
@@ -529,129 +562,129 @@ def p_expression_or(p):
     """
     expression : expression OR subexpression
     """
-    p[0] = parser.expression_handler.handle(p, "or")
+    p[0] = p.parser.expression_handler.handle(p, "or")
 def p_expression_subexpression(p):
     """
     expression : subexpression
     """
-    p[0] = parser.expression_handler.handle(p, "subexpression")
+    p[0] = p.parser.expression_handler.handle(p, "subexpression")
 
 def p_subexpression_and(p):
     """
     subexpression : subexpression AND condition
     """
-    p[0] = parser.subexpression_handler.handle(p, "and")
+    p[0] = p.parser.subexpression_handler.handle(p, "and")
 def p_subexpression_condition(p):
     """
     subexpression : condition
     """
-    p[0] = parser.subexpression_handler.handle(p, "condition")
+    p[0] = p.parser.subexpression_handler.handle(p, "condition")
 
 def p_condition_eq(p):
     """
     condition : condition EQ comparison
     """
-    p[0] = parser.condition_handler.handle(p, "eq")
+    p[0] = p.parser.condition_handler.handle(p, "eq")
 def p_condition_neq(p):
     """
     condition : condition NEQ comparison
     """
-    p[0] = parser.condition_handler.handle(p, "neq")
+    p[0] = p.parser.condition_handler.handle(p, "neq")
 def p_condition_comparison(p):
     """
     condition : comparison
     """
-    p[0] = parser.condition_handler.handle(p, "comparison")
+    p[0] = p.parser.condition_handler.handle(p, "comparison")
 
 def p_comparison_lt(p):
     """
     comparison : comparison LT term
     """
-    p[0] = parser.comparison_handler.handle(p, "lt")
+    p[0] = p.parser.comparison_handler.handle(p, "lt")
 def p_comparison_gt(p):
     """
     comparison : comparison GT term
     """
-    p[0] = parser.comparison_handler.handle(p, "gt")
+    p[0] = p.parser.comparison_handler.handle(p, "gt")
 def p_comparison_lte(p):
     """
     comparison : comparison LTE term
     """
-    p[0] = parser.comparison_handler.handle(p, "lte")
+    p[0] = p.parser.comparison_handler.handle(p, "lte")
 def p_comparison_gte(p):
     """
     comparison : comparison GTE term
     """
-    p[0] = parser.comparison_handler.handle(p, "gte")
+    p[0] = p.parser.comparison_handler.handle(p, "gte")
 def p_comparison_term(p):
     """
     comparison : term
     """
-    p[0] = parser.comparison_handler.handle(p, "term")
+    p[0] = p.parser.comparison_handler.handle(p, "term")
 
 def p_term_sub(p):
     """
     term : term '-' factor
     """
-    p[0] = parser.term_handler.handle(p, "sub")
+    p[0] = p.parser.term_handler.handle(p, "sub")
 def p_term_add(p):
     """
     term : term '+' factor
     """
-    p[0] = parser.term_handler.handle(p, "add")
+    p[0] = p.parser.term_handler.handle(p, "add")
 def p_term_factor(p):
     """
     term : factor
     """
-    p[0] = parser.term_handler.handle(p, "factor")
+    p[0] = p.parser.term_handler.handle(p, "factor")
 
 def p_factor_mul(p):
     """
     factor : factor '*' unary
     """
-    p[0] = parser.factor_handler.handle(p, "mul")
+    p[0] = p.parser.factor_handler.handle(p, "mul")
 def p_factor_div(p):
     """
     factor : factor '/' unary
     """
-    p[0] = parser.factor_handler.handle(p, "div")
+    p[0] = p.parser.factor_handler.handle(p, "div")
 def p_factor_mod(p):
     """
     factor : factor '%' unary
     """
-    p[0] = parser.factor_handler.handle(p, "mod")
+    p[0] = p.parser.factor_handler.handle(p, "mod")
 def p_factor_unary(p):
     """
     factor : unary
     """
-    p[0] = parser.factor_handler.handle(p, "unary")
+    p[0] = p.parser.factor_handler.handle(p, "unary")
 
 def p_unary_cast(p):
     """
     unary : '(' type ')' unary
     """
-    p[0] = parser.unary_handler.handle(p, "cast")
+    p[0] = p.parser.unary_handler.handle(p, "cast")
 def p_unary_not(p):
     """
     unary : '!' unary
     """
-    p[0] = parser.unary_handler.handle(p, "not")
+    p[0] = p.parser.unary_handler.handle(p, "not")
 def p_unary_neg(p):
     """
     unary : '-' unary
     """
-    p[0] = parser.unary_handler.handle(p, "neg")
+    p[0] = p.parser.unary_handler.handle(p, "neg")
 def p_unary_primary(p):
     """
     unary : primary
     """
-    p[0] = parser.unary_handler.handle(p, "primary")
+    p[0] = p.parser.unary_handler.handle(p, "primary")
 
 def p_primary_indexing(p):
     """
     primary : ID ndepth
     """
-    p[0] = parser.primary_handler.handle(p, "indexing")
+    p[0] = p.parser.primary_handler.handle(p, "indexing")
 def p_array_indexing_depth(p):
     """
     ndepth : ndepth '[' expression ']'
@@ -662,27 +695,27 @@ def p_primary_ref(p):
     """
     primary : '&' ID 
     """
-    p[0] = parser.primary_handler.handle(p, "ref")
+    p[0] = p.parser.primary_handler.handle(p, "ref")
 def p_primary_int(p):
     """
     primary : INT
     """
-    p[0] = parser.primary_handler.handle(p, "int")
+    p[0] = p.parser.primary_handler.handle(p, "int")
 def p_primary_float(p):
     """
     primary : FLOAT
     """
-    p[0] = parser.primary_handler.handle(p, "float")
+    p[0] = p.parser.primary_handler.handle(p, "float")
 def p_primary_string(p):
     """
     primary : STRING
     """
-    p[0] = parser.primary_handler.handle(p, "string")
+    p[0] = p.parser.primary_handler.handle(p, "string")
 def p_primary_id(p):
     """
     primary : ID
     """
-    p[0] = parser.primary_handler.handle(p, "id")
+    p[0] = p.parser.primary_handler.handle(p, "id")
 def p_primary_function(p):
     """
     primary : function_call
@@ -697,52 +730,40 @@ def p_primary_new(p):
     """
     primary : '(' expression ')'
     """
-    p[0] = parser.primary_handler.handle(p, "new")
+    p[0] = p.parser.primary_handler.handle(p, "new")
 
 def p_error(p):
-    syntax_error(p, f"Invalid syntax '{p.value}'")
-    sys.exit(1)
-
-parser = yacc.yacc()
-
-parser.primary_handler = Primary()
-parser.unary_handler = Unary()
-parser.factor_handler = Factor()
-parser.term_handler = Term()
-parser.comparison_handler = Comparison()
-parser.condition_handler = Condition()
-parser.subexpression_handler = SubExpression()
-parser.expression_handler = Expression()
-
-parser.io_handler = IO()
-parser.assignment_handler = Assignment()
-parser.declaration_handler = Declaration()
-parser.declaration_assignment_handler = DeclarationAssignment()
-parser.if_handler = If()
-parser.match_handler = Match()
-parser.loop_handler = Loop()
-parser.loop_break_handler = BreakContinue()
-
-parser.functions_handler = Functions()
-parser.num_params = 0
-parser.num_args = []
-
-parser.frame_count = 0
-parser.global_count = 0
-parser.current_scope: Scope = Scope(name="Global Scope", level=0, parent=None) 
-
-parser.type_checker = TypeCheck()
-
-parser.if_count = 0
-parser.rel_if_count = 0
-parser.match_count = 0
-parser.rel_match_count = 0
-parser.loop_count = 0
-parser.current_loops = [] # This is needed for break and continue statements to be checked
-parser.array_assign_items = 0
-parser.indexing_depth = []
-parser.arr_dim = []
+    if p is None:
+        report(Diagnostic("Syntax Error", "Unexpected end of input"))
+    else:
+        syntax_error(p, f"Invalid syntax '{p.value}'")
+    # PLY recovers through the error rules of the statement, function and global declaration lists
+
+parser = None
+
+def get_parser():
+    """
+    Build the parser tables on first use and return the shared parser.
+
+    The returned parser holds no compilation state. Use a CompilationContext
+    (see tox.parsing._compiler) to actually compile a program.
+    """
+    global parser
+    if parser is None:
+        # Tables are precomputed by `make tables`. If they are missing or stale they are
+        # rebuilt in memory, but nothing is ever written to disk at runtime.
+        parser = yacc.yacc(tabmodule="tox.parsing._parsetab", write_tables=False, debug=False)
+        # The error token only ever shifts into the error rules of the lists. Reducing on it would run
+        # rules on half parsed constructs, and a rule that failed would be reduced again.
+        for actions in parser.action.values():
+            if actions.get("error", 0) < 0:
+                del actions["error"]
+    return parser
 
 if __name__ == "__main__":
-    for line in sys.stdin:
-        parser.parse(line)
\ No newline at end of file
+    from tox.parsing._compiler import compile_source
+    result = compile_source(sys.stdin.read())
+    for diagnostic in result.diagnostics:
+        sys.stderr.write(str(diagnostic))
+    if result.ok:
+        print(result.code, end="")
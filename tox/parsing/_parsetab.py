@@ -0,0 +1,172 @@
+
+# _parsetab.py
+# This file is automatically generated. Do not edit.
+# pylint: disable=W,C,R
+_tabversion = '3.10'
+
+_lr_method = 'LALR'
+
+_lr_signature = "AND ASSIGN BREAK COMMENT CONTINUE DEFAULT DO ELSE EQ FLOAT FOR FUNCTION GT GTE ID IF INT LT LTE MATCH MULTICOMMENTS NEQ NEWLINE OR PRINT RARROW READ_FLOAT READ_INT READ_STRING RETI RETURN STRING TYPE_FLOAT TYPE_INT TYPE_STRING TYPE_VEC WHILE\n    prog : global_declarations functions\n    \n    global_declarations : global_declarations global_declaration\n    \n    global_declarations :\n    \n    global_declarations : global_declarations error\n    \n    global_declaration : declaration_assignment\n                    | declaration\n    \n    functions : functions function\n    \n    functions :\n    \n    functions : functions error\n    \n    function : function_declaration\n            | function_definition\n    \n    function_declaration : function_def\n    \n    function_definition : function_header function_body\n    \n    function_def : function_id ss '(' params ')' out_type es\n    \n    function_header : function_id ss '(' params ')' out_type\n    \n    function_id : FUNCTION ID\n    \n    function_body : '{' stmts '}' es\n    \n    function_call : f_call '(' args ')'\n    \n    f_call : ID\n    \n    params : params ',' param\n    \n    params :\n    \n    params : param\n    \n    param : ID ':' type\n        |   ID ':' Ptype\n    \n    out_type : RARROW type\n            | RARROW Ptype\n            |\n    \n    args : args ',' arg\n    \n    args :\n        | arg\n    \n    arg : expression\n    \n    stmts : stmts stmt\n    \n    stmts :\n    \n    stmts : stmts error\n    \n    stmt : print\n        | read\n        | function_call\n        | declaration_assignment\n        | assignment\n        | declaration\n        | if\n        | match\n        | while\n        | for\n        | do_while\n        | break\n        | continue\n        | return\n    \n    ss :\n    \n    es :\n    \n    return : RETURN expression\n            | RETURN ';'\n    \n    break : BREAK\n    \n    continue : CONTINUE\n    \n    for : loop_for ss '(' for_inits ';' expression ';' for_updates ')' ss '{' stmts  '}' es es\n    \n    for_inits : for_inits ',' for_init\n            | for_init\n    \n    for_init : declaration_assignment\n            | declaration\n            | assignment\n            |\n    \n    for_updates : for_updates ',' for_update\n            | for_update\n    \n    for_update : assignment\n    \n    do_while : loop_do ss '{' stmts '}' es WHILE '(' expression ')'\n    \n    while : loop_while expression ss '{' stmts '}' es\n    \n    loop_for : FOR\n    \n    loop_do : DO\n    \n    loop_while : WHILE\n    \n    if : IF expression ss '{' stmts '}' es else_if\n    \n    else_if : ELSE IF expression ss '{' stmts '}' es else_if\n            | else\n    \n    else : ELSE ss '{' stmts '}' es\n        |\n    \n    match : match_start expression '{' cases '}'\n    \n    match_start : MATCH\n    \n    cases : expression RARROW ss '{' stmts '}' es cases\n        | default\n    \n    default : DEFAULT RARROW ss '{' stmts '}' es\n    \n    declaration_assignment : ID ':' type ASSIGN expression\n    \n    declaration_assignment : ID ':' Ptype ASSIGN expression\n    \n    declaration_assignment : ID ':' Vtype ndim ASSIGN '[' arrayitems ']'\n                        | ID ':' Vtype ASSIGN '[' arrayitems ']'\n    \n    declaration_assignment : ID ':' Vtype ASSIGN '['  INT  RETI  INT ']'\n    \n    arrayitems : arrayitems ',' expression\n        | expression\n    \n    declaration : ID ':' type\n    \n    declaration : ID ':' Ptype\n    \n    declaration : ID ':' Vtype ndim\n    \n    ndim : ndim '[' INT ']'\n        | '[' INT ']'\n    \n    assignment : ID ndepth ASSIGN expression\n    \n    assignment : ID ASSIGN expression\n    \n    read : read_type '(' multiple_prints ')'\n    \n    read_type : READ_INT\n            | READ_FLOAT\n            | READ_STRING\n    \n    print : PRINT '(' multiple_prints ')'\n    \n    multiple_prints : multiple_prints ',' expression\n    \n    multiple_prints : expression\n    \n    multiple_prints :\n    \n    type : TYPE_INT\n        | TYPE_STRING\n        | TYPE_FLOAT\n    \n    Vtype : TYPE_VEC LT  type GT\n    \n    Ptype : '&' TYPE_INT\n        | '&' TYPE_STRING\n        | '&' TYPE_FLOAT\n    \n    expression : expression OR subexpression\n    \n    expression : subexpression\n    \n    subexpression : subexpression AND condition\n    \n    subexpression : condition\n    \n    condition : condition EQ comparison\n    \n    condition : condition NEQ comparison\n    \n    condition : comparison\n    \n    comparison : comparison LT term\n    \n    comparison : comparison GT term\n    \n    comparison : comparison LTE term\n    \n    comparison : comparison GTE term\n    \n    comparison : term\n    \n    term : term '-' factor\n    \n    term : term '+' factor\n    \n    term : factor\n    \n    factor : factor '*' unary\n    \n    factor : factor '/' unary\n    \n    factor : factor '%' unary\n    \n    factor : unary\n    \n    unary : '(' type ')' unary\n    \n    unary : '!' unary\n    \n    unary : '-' unary\n    \n    unary : primary\n    \n    primary : ID ndepth\n    \n    ndepth : ndepth '[' expression ']'\n        | '[' expression ']'\n    \n    primary : '&' ID \n    \n    primary : INT\n    \n    primary : FLOAT\n    \n    primary : STRING\n    \n    primary : ID\n    \n    primary : function_call\n    \n    primary : read\n    \n    primary : '(' expression ')'\n    "
+    
+_lr_action_items = {'error':([0,2,3,4,5,6,7,9,10,11,12,13,18,19,22,23,25,26,27,30,34,37,38,39,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,57,68,69,80,81,82,83,84,85,87,88,91,93,94,95,96,97,98,104,116,117,118,121,132,138,139,145,153,161,162,167,168,169,170,171,172,173,174,175,176,177,178,179,181,183,184,187,189,190,192,193,195,200,207,208,209,210,211,212,217,218,220,222,226,227,230,234,235,236,237,240,242,243,244,258,263,265,267,268,269,270,271,272,273,274,275,276,277,278,],[-3,5,10,-2,-4,-5,-6,-7,-9,-10,-11,-12,-13,-33,-87,-88,-102,-103,-104,43,-89,-106,-107,-108,-50,-32,-34,-35,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,-48,-53,-54,-139,-80,-110,-112,-115,-120,-123,-127,-131,-136,-137,-138,-140,-141,-81,-17,-51,-52,-27,-132,-130,-129,-135,-91,-93,-33,-50,-109,-111,-113,-114,-116,-117,-118,-119,-121,-122,-124,-125,-126,-142,-90,-83,-98,-94,-18,-134,-92,-33,-33,43,-14,-25,-26,-128,-82,-133,43,-75,43,-84,-50,-50,-74,-33,-33,-66,-70,-72,43,43,-33,-65,43,-33,-33,-50,43,43,-73,-50,-50,-50,-74,-55,-71,]),'ID':([0,2,4,5,6,7,16,19,22,23,25,26,27,30,31,32,33,34,37,38,39,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,57,62,63,64,67,68,69,70,74,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,97,98,101,105,106,107,108,109,116,117,119,121,122,123,124,125,126,127,128,129,130,131,132,133,134,135,138,139,140,145,153,155,156,158,160,161,167,168,169,170,171,172,173,174,175,176,177,178,179,180,181,183,184,185,187,188,189,190,191,192,193,195,200,207,211,212,217,218,220,222,223,224,226,227,230,234,235,236,237,238,240,242,243,244,249,250,252,255,258,259,263,265,267,268,269,270,271,272,273,274,275,276,277,278,],[-3,8,-2,-4,-5,-6,21,-33,-87,-88,-102,-103,-104,61,79,80,80,-89,-106,-107,-108,-32,-34,-35,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,-48,80,80,80,-69,-53,-54,80,-76,-139,-80,-110,-112,-115,-120,80,-123,-127,80,80,-131,139,-136,-137,-138,-140,-141,-81,80,80,80,80,80,80,-51,-52,79,-132,80,80,80,80,80,80,80,80,80,80,-130,80,80,80,-129,-135,80,-91,-93,80,80,80,206,-33,-109,-111,-113,-114,-116,-117,-118,-119,-121,-122,-124,-125,-126,80,-142,-90,-83,80,-98,80,-94,-18,80,-134,-92,-33,-33,61,-128,-82,-133,61,-75,61,80,206,-84,-50,-50,-74,-33,-33,-66,248,-70,-72,61,61,80,80,-50,248,-33,80,-65,61,-33,-33,-50,61,61,-73,-50,-50,-50,-74,-55,-71,]),'FUNCTION':([0,2,3,4,5,6,7,9,10,11,12,13,18,22,23,25,26,27,34,37,38,39,41,80,81,82,83,84,85,87,88,91,93,94,95,96,97,98,104,118,121,132,138,139,145,162,167,168,169,170,171,172,173,174,175,176,177,178,179,181,183,184,189,190,192,208,209,210,211,212,217,226,],[-3,-8,16,-2,-4,-5,-6,-7,-9,-10,-11,-12,-13,-87,-88,-102,-103,-104,-89,-106,-107,-108,-50,-139,-80,-110,-112,-115,-120,-123,-127,-131,-136,-137,-138,-140,-141,-81,-17,-27,-132,-130,-129,-135,-91,-50,-109,-111,-113,-114,-116,-117,-118,-119,-121,-122,-124,-125,-126,-142,-90,-83,-94,-18,-134,-14,-25,-26,-128,-82,-133,-84,]),'$end':([0,1,2,3,4,5,6,7,9,10,11,12,13,18,22,23,25,26,27,34,37,38,39,41,80,81,82,83,84,85,87,88,91,93,94,95,96,97,98,104,118,121,132,138,139,145,162,167,168,169,170,171,172,173,174,175,176,177,178,179,181,183,184,189,190,192,208,209,210,211,212,217,226,],[-3,0,-8,-1,-2,-4,-5,-6,-7,-9,-10,-11,-12,-13,-87,-88,-102,-103,-104,-89,-106,-107,-108,-50,-139,-80,-110,-112,-115,-120,-123,-127,-131,-136,-137,-138,-140,-141,-81,-17,-27,-132,-130,-129,-135,-91,-50,-109,-111,-113,-114,-116,-117,-118,-119,-121,-122,-124,-125,-126,-142,-90,-83,-94,-18,-134,-14,-25,-26,-128,-82,-133,-84,]),':':([8,61,79,206,],[17,17,120,17,]),'{':([14,25,26,27,37,38,39,66,76,80,82,83,84,85,87,88,91,93,94,95,96,97,111,112,113,115,118,121,132,138,139,157,159,162,167,168,169,170,171,172,173,174,175,176,177,178,179,181,189,190,192,209,210,211,217,219,221,228,229,241,251,254,257,261,264,],[19,-102,-103,-104,-106,-107,-108,-49,-68,-139,-110,-112,-115,-120,-123,-127,-131,-136,-137,-138,-140,-141,-49,158,-49,161,-27,-132,-130,-129,-135,195,200,-15,-109,-111,-113,-114,-116,-117,-118,-119,-121,-122,-124,-125,-126,-142,-94,-18,-134,-25,-26,-128,-133,-49,-49,235,236,-49,258,-49,-49,267,268,]),'(':([15,20,21,32,33,58,59,60,61,62,63,64,65,67,70,71,72,73,74,75,80,86,89,90,101,105,106,107,108,109,114,122,123,124,125,126,127,128,129,130,131,133,134,135,140,155,156,158,180,185,188,191,223,239,249,250,252,259,],[-49,31,-16,89,89,105,106,107,-19,89,89,89,-49,-69,89,-95,-96,-97,-76,-67,-19,89,89,89,89,89,89,89,89,89,160,89,89,89,89,89,89,89,89,89,89,89,89,89,89,89,89,89,89,89,89,89,89,249,89,89,-50,89,]),'TYPE_INT':([17,28,40,89,120,163,],[25,37,25,25,25,25,]),'TYPE_STRING':([17,28,40,89,120,163,],[26,38,26,26,26,26,]),'TYPE_FLOAT':([17,28,40,89,120,163,],[27,39,27,27,27,27,]),'&':([17,32,33,62,63,64,67,70,74,86,89,90,101,105,106,107,108,109,120,122,123,124,125,126,127,128,129,130,131,133,134,135,140,155,156,158,163,180,185,188,191,223,249,250,252,259,],[28,92,92,92,92,92,-69,92,-76,92,92,92,92,92,92,92,92,92,28,92,92,92,92,92,92,92,92,92,92,92,92,92,92,92,92,92,28,92,92,92,92,92,92,92,-50,92,]),'TYPE_VEC':([17,],[29,]),'}':([19,22,23,25,26,27,30,34,37,38,39,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,57,68,69,80,81,82,83,84,85,87,88,91,93,94,95,96,97,98,116,117,121,132,138,139,145,153,161,167,168,169,170,171,172,173,174,175,176,177,178,179,181,183,184,187,189,190,192,193,195,197,198,200,207,211,212,217,218,220,222,226,227,230,234,235,236,237,240,242,243,244,253,258,260,263,265,266,267,268,269,270,271,272,273,274,275,276,277,278,],[-33,-87,-88,-102,-103,-104,41,-89,-106,-107,-108,-32,-34,-35,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,-48,-53,-54,-139,-80,-110,-112,-115,-120,-123,-127,-131,-136,-137,-138,-140,-141,-81,-51,-52,-132,-130,-129,-135,-91,-93,-33,-109,-111,-113,-114,-116,-117,-118,-119,-121,-122,-124,-125,-126,-142,-90,-83,-98,-94,-18,-134,-92,-33,220,-78,-33,225,-128,-82,-133,227,-75,230,-84,-50,-50,-74,-33,-33,-66,-70,-72,252,253,-50,-33,-79,-65,269,-77,-33,-33,-50,273,274,-73,-50,-50,-50,-74,-55,-71,]),'PRINT':([19,22,23,25,26,27,30,34,37,38,39,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,57,68,69,80,81,82,83,84,85,87,88,91,93,94,95,96,97,98,116,117,121,132,138,139,145,153,161,167,168,169,170,171,172,173,174,175,176,177,178,179,181,183,184,187,189,190,192,193,195,200,207,211,212,217,218,220,222,226,227,230,234,235,236,237,240,242,243,244,258,263,265,267,268,269,270,271,272,273,274,275,276,277,278,],[-33,-87,-88,-102,-103,-104,58,-89,-106,-107,-108,-32,-34,-35,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,-48,-53,-54,-139,-80,-110,-112,-115,-120,-123,-127,-131,-136,-137,-138,-140,-141,-81,-51,-52,-132,-130,-129,-135,-91,-93,-33,-109,-111,-113,-114,-116,-117,-118,-119,-121,-122,-124,-125,-126,-142,-90,-83,-98,-94,-18,-134,-92,-33,-33,58,-128,-82,-133,58,-75,58,-84,-50,-50,-74,-33,-33,-66,-70,-72,58,58,-33,-65,58,-33,-33,-50,58,58,-73,-50,-50,-50,-74,-55,-71,]),'IF':([19,22,23,25,26,27,30,34,37,38,39,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,57,68,69,80,81,82,83,84,85,87,88,91,93,94,95,96,97,98,116,117,121,132,138,139,145,153,161,167,168,169,170,171,172,173,174,175,176,177,178,179,181,183,184,187,189,190,192,193,195,200,207,211,212,217,218,220,222,226,227,230,234,235,236,237,240,241,242,243,244,258,263,265,267,268,269,270,271,272,273,274,275,276,277,278,],[-33,-87,-88,-102,-103,-104,62,-89,-106,-107,-108,-32,-34,-35,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,-48,-53,-54,-139,-80,-110,-112,-115,-120,-123,-127,-131,-136,-137,-138,-140,-141,-81,-51,-52,-132,-130,-129,-135,-91,-93,-33,-109,-111,-113,-114,-116,-117,-118,-119,-121,-122,-124,-125,-126,-142,-90,-83,-98,-94,-18,-134,-92,-33,-33,62,-128,-82,-133,62,-75,62,-84,-50,-50,-74,-33,-33,-66,-70,250,-72,62,62,-33,-65,62,-33,-33,-50,62,62,-73,-50,-50,-50,-74,-55,-71,]),'BREAK':([19,22,23,25,26,27,30,34,37,38,39,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,57,68,69,80,81,82,83,84,85,87,88,91,93,94,95,96,97,98,116,117,121,132,138,139,145,153,161,167,168,169,170,171,172,173,174,175,176,177,178,179,181,183,184,187,189,190,192,193,195,200,207,211,212,217,218,220,222,226,227,230,234,235,236,237,240,242,243,244,258,263,265,267,268,269,270,271,272,273,274,275,276,277,278,],[-33,-87,-88,-102,-103,-104,68,-89,-106,-107,-108,-32,-34,-35,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,-48,-53,-54,-139,-80,-110,-112,-115,-120,-123,-127,-131,-136,-137,-138,-140,-141,-81,-51,-52,-132,-130,-129,-135,-91,-93,-33,-109,-111,-113,-114,-116,-117,-118,-119,-121,-122,-124,-125,-126,-142,-90,-83,-98,-94,-18,-134,-92,-33,-33,68,-128,-82,-133,68,-75,68,-84,-50,-50,-74,-33,-33,-66,-70,-72,68,68,-33,-65,68,-33,-33,-50,68,68,-73,-50,-50,-50,-74,-55,-71,]),'CONTINUE':([19,22,23,25,26,27,30,34,37,38,39,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,57,68,69,80,81,82,83,84,85,87,88,91,93,94,95,96,97,98,116,117,121,132,138,139,145,153,161,167,168,169,170,171,172,173,174,175,176,177,178,179,181,183,184,187,189,190,192,193,195,200,207,211,212,217,218,220,222,226,227,230,234,235,236,237,240,242,243,244,258,263,265,267,268,269,270,271,272,273,274,275,276,277,278,],[-33,-87,-88,-102,-103,-104,69,-89,-106,-107,-108,-32,-34,-35,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,-48,-53,-54,-139,-80,-110,-112,-115,-120,-123,-127,-131,-136,-137,-138,-140,-141,-81,-51,-52,-132,-130,-129,-135,-91,-93,-33,-109,-111,-113,-114,-116,-117,-118,-119,-121,-122,-124,-125,-126,-142,-90,-83,-98,-94,-18,-134,-92,-33,-33,69,-128,-82,-133,69,-75,69,-84,-50,-50,-74,-33,-33,-66,-70,-72,69,69,-33,-65,69,-33,-33,-50,69,69,-73,-50,-50,-50,-74,-55,-71,]),'RETURN':([19,22,23,25,26,27,30,34,37,38,39,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,57,68,69,80,81,82,83,84,85,87,88,91,93,94,95,96,97,98,116,117,121,132,138,139,145,153,161,167,168,169,170,171,172,173,174,175,176,177,178,179,181,183,184,187,189,190,192,193,195,200,207,211,212,217,218,220,222,226,227,230,234,235,236,237,240,242,243,244,258,263,265,267,268,269,270,271,272,273,274,275,276,277,278,],[-33,-87,-88,-102,-103,-104,70,-89,-106,-107,-108,-32,-34,-35,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,-48,-53,-54,-139,-80,-110,-112,-115,-120,-123,-127,-131,-136,-137,-138,-140,-141,-81,-51,-52,-132,-130,-129,-135,-91,-93,-33,-109,-111,-113,-114,-116,-117,-118,-119,-121,-122,-124,-125,-126,-142,-90,-83,-98,-94,-18,-134,-92,-33,-33,70,-128,-82,-133,70,-75,70,-84,-50,-50,-74,-33,-33,-66,-70,-72,70,70,-33,-65,70,-33,-33,-50,70,70,-73,-50,-50,-50,-74,-55,-71,]),'READ_INT':([19,22,23,25,26,27,30,32,33,34,37,38,39,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,57,62,63,64,67,68,69,70,74,80,81,82,83,84,85,86,87,88,89,90,91,93,94,95,96,97,98,101,105,106,107,108,109,116,117,121,122,123,124,125,126,127,128,129,130,131,132,133,134,135,138,139,140,145,153,155,156,158,161,167,168,169,170,171,172,173,174,175,176,177,178,179,180,181,183,184,185,187,188,189,190,191,192,193,195,200,207,211,212,217,218,220,222,223,226,227,230,234,235,236,237,240,242,243,244,249,250,252,258,259,263,265,267,268,269,270,271,272,273,274,275,276,277,278,],[-33,-87,-88,-102,-103,-104,71,71,71,-89,-106,-107,-108,-32,-34,-35,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,-48,71,71,71,-69,-53,-54,71,-76,-139,-80,-110,-112,-115,-120,71,-123,-127,71,71,-131,-136,-137,-138,-140,-141,-81,71,71,71,71,71,71,-51,-52,-132,71,71,71,71,71,71,71,71,71,71,-130,71,71,71,-129,-135,71,-91,-93,71,71,71,-33,-109,-111,-113,-114,-116,-117,-118,-119,-121,-122,-124,-125,-126,71,-142,-90,-83,71,-98,71,-94,-18,71,-134,-92,-33,-33,71,-128,-82,-133,71,-75,71,71,-84,-50,-50,-74,-33,-33,-66,-70,-72,71,71,71,71,-50,-33,71,-65,71,-33,-33,-50,71,71,-73,-50,-50,-50,-74,-55,-71,]),'READ_FLOAT':([19,22,23,25,26,27,30,32,33,34,37,38,39,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,57,62,63,64,67,68,69,70,74,80,81,82,83,84,85,86,87,88,89,90,91,93,94,95,96,97,98,101,105,106,107,108,109,116,117,121,122,123,124,125,126,127,128,129,130,131,132,133,134,135,138,139,140,145,153,155,156,158,161,167,168,169,170,171,172,173,174,175,176,177,178,179,180,181,183,184,185,187,188,189,190,191,192,193,195,200,207,211,212,217,218,220,222,223,226,227,230,234,235,236,237,240,242,243,244,249,250,252,258,259,263,265,267,268,269,270,271,272,273,274,275,276,277,278,],[-33,-87,-88,-102,-103,-104,72,72,72,-89,-106,-107,-108,-32,-34,-35,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,-48,72,72,72,-69,-53,-54,72,-76,-139,-80,-110,-112,-115,-120,72,-123,-127,72,72,-131,-136,-137,-138,-140,-141,-81,72,72,72,72,72,72,-51,-52,-132,72,72,72,72,72,72,72,72,72,72,-130,72,72,72,-129,-135,72,-91,-93,72,72,72,-33,-109,-111,-113,-114,-116,-117,-118,-119,-121,-122,-124,-125,-126,72,-142,-90,-83,72,-98,72,-94,-18,72,-134,-92,-33,-33,72,-128,-82,-133,72,-75,72,72,-84,-50,-50,-74,-33,-33,-66,-70,-72,72,72,72,72,-50,-33,72,-65,72,-33,-33,-50,72,72,-73,-50,-50,-50,-74,-55,-71,]),'READ_STRING':([19,22,23,25,26,27,30,32,33,34,37,38,39,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,57,62,63,64,67,68,69,70,74,80,81,82,83,84,85,86,87,88,89,90,91,93,94,95,96,97,98,101,105,106,107,108,109,116,117,121,122,123,124,125,126,127,128,129,130,131,132,133,134,135,138,139,140,145,153,155,156,158,161,167,168,169,170,171,172,173,174,175,176,177,178,179,180,181,183,184,185,187,188,189,190,191,192,193,195,200,207,211,212,217,218,220,222,223,226,227,230,234,235,236,237,240,242,243,244,249,250,252,258,259,263,265,267,268,269,270,271,272,273,274,275,276,277,278,],[-33,-87,-88,-102,-103,-104,73,73,73,-89,-106,-107,-108,-32,-34,-35,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,-48,73,73,73,-69,-53,-54,73,-76,-139,-80,-110,-112,-115,-120,73,-123,-127,73,73,-131,-136,-137,-138,-140,-141,-81,73,73,73,73,73,73,-51,-52,-132,73,73,73,73,73,73,73,73,73,73,-130,73,73,73,-129,-135,73,-91,-93,73,73,73,-33,-109,-111,-113,-114,-116,-117,-118,-119,-121,-122,-124,-125,-126,73,-142,-90,-83,73,-98,73,-94,-18,73,-134,-92,-33,-33,73,-128,-82,-133,73,-75,73,73,-84,-50,-50,-74,-33,-33,-66,-70,-72,73,73,73,73,-50,-33,73,-65,73,-33,-33,-50,73,73,-73,-50,-50,-50,-74,-55,-71,]),'MATCH':([19,22,23,25,26,27,30,34,37,38,39,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,57,68,69,80,81,82,83,84,85,87,88,91,93,94,95,96,97,98,116,117,121,132,138,139,145,153,161,167,168,169,170,171,172,173,174,175,176,177,178,179,181,183,184,187,189,190,192,193,195,200,207,211,212,217,218,220,222,226,227,230,234,235,236,237,240,242,243,244,258,263,265,267,268,269,270,271,272,273,274,275,276,277,278,],[-33,-87,-88,-102,-103,-104,74,-89,-106,-107,-108,-32,-34,-35,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,-48,-53,-54,-139,-80,-110,-112,-115,-120,-123,-127,-131,-136,-137,-138,-140,-141,-81,-51,-52,-132,-130,-129,-135,-91,-93,-33,-109,-111,-113,-114,-116,-117,-118,-119,-121,-122,-124,-125,-126,-142,-90,-83,-98,-94,-18,-134,-92,-33,-33,74,-128,-82,-133,74,-75,74,-84,-50,-50,-74,-33,-33,-66,-70,-72,74,74,-33,-65,74,-33,-33,-50,74,74,-73,-50,-50,-50,-74,-55,-71,]),'WHILE':([19,22,23,25,26,27,30,34,37,38,39,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,57,68,69,80,81,82,83,84,85,87,88,91,93,94,95,96,97,98,116,117,121,132,138,139,145,153,161,167,168,169,170,171,172,173,174,175,176,177,178,179,181,183,184,187,189,190,192,193,195,200,207,211,212,217,218,220,222,225,226,227,230,233,234,235,236,237,240,242,243,244,258,263,265,267,268,269,270,271,272,273,274,275,276,277,278,],[-33,-87,-88,-102,-103,-104,67,-89,-106,-107,-108,-32,-34,-35,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,-48,-53,-54,-139,-80,-110,-112,-115,-120,-123,-127,-131,-136,-137,-138,-140,-141,-81,-51,-52,-132,-130,-129,-135,-91,-93,-33,-109,-111,-113,-114,-116,-117,-118,-119,-121,-122,-124,-125,-126,-142,-90,-83,-98,-94,-18,-134,-92,-33,-33,67,-128,-82,-133,67,-75,67,-50,-84,-50,-50,239,-74,-33,-33,-66,-70,-72,67,67,-33,-65,67,-33,-33,-50,67,67,-73,-50,-50,-50,-74,-55,-71,]),'FOR':([19,22,23,25,26,27,30,34,37,38,39,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,57,68,69,80,81,82,83,84,85,87,88,91,93,94,95,96,97,98,116,117,121,132,138,139,145,153,161,167,168,169,170,171,172,173,174,175,176,177,178,179,181,183,184,187,189,190,192,193,195,200,207,211,212,217,218,220,222,226,227,230,234,235,236,237,240,242,243,244,258,263,265,267,268,269,270,271,272,273,274,275,276,277,278,],[-33,-87,-88,-102,-103,-104,75,-89,-106,-107,-108,-32,-34,-35,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,-48,-53,-54,-139,-80,-110,-112,-115,-120,-123,-127,-131,-136,-137,-138,-140,-141,-81,-51,-52,-132,-130,-129,-135,-91,-93,-33,-109,-111,-113,-114,-116,-117,-118,-119,-121,-122,-124,-125,-126,-142,-90,-83,-98,-94,-18,-134,-92,-33,-33,75,-128,-82,-133,75,-75,75,-84,-50,-50,-74,-33,-33,-66,-70,-72,75,75,-33,-65,75,-33,-33,-50,75,75,-73,-50,-50,-50,-74,-55,-71,]),'DO':([19,22,23,25,26,27,30,34,37,38,39,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,57,68,69,80,81,82,83,84,85,87,88,91,93,94,95,96,97,98,116,117,121,132,138,139,145,153,161,167,168,169,170,171,172,173,174,175,176,177,178,179,181,183,184,187,189,190,192,193,195,200,207,211,212,217,218,220,222,226,227,230,234,235,236,237,240,242,243,244,258,263,265,267,268,269,270,271,272,273,274,275,276,277,278,],[-33,-87,-88,-102,-103,-104,76,-89,-106,-107,-108,-32,-34,-35,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,-48,-53,-54,-139,-80,-110,-112,-115,-120,-123,-127,-131,-136,-137,-138,-140,-141,-81,-51,-52,-132,-130,-129,-135,-91,-93,-33,-109,-111,-113,-114,-116,-117,-118,-119,-121,-122,-124,-125,-126,-142,-90,-83,-98,-94,-18,-134,-92,-33,-33,76,-128,-82,-133,76,-75,76,-84,-50,-50,-74,-33,-33,-66,-70,-72,76,76,-33,-65,76,-33,-33,-50,76,76,-73,-50,-50,-50,-74,-55,-71,]),'ASSIGN':([22,23,24,25,26,27,34,37,38,39,61,110,145,146,183,192,206,217,248,],[32,33,35,-102,-103,-104,99,-106,-107,-108,108,155,-91,-105,-90,-134,108,-133,108,]),';':([22,23,25,26,27,34,37,38,39,70,80,81,82,83,84,85,87,88,91,93,94,95,96,97,98,121,132,138,139,145,153,160,167,168,169,170,171,172,173,174,175,176,177,178,179,181,183,184,189,190,192,193,201,202,203,204,205,211,212,217,224,226,231,232,],[-87,-88,-102,-103,-104,-89,-106,-107,-108,117,-139,-80,-110,-112,-115,-120,-123,-127,-131,-136,-137,-138,-140,-141,-81,-132,-130,-129,-135,-91,-93,-61,-109,-111,-113,-114,-116,-117,-118,-119,-121,-122,-124,-125,-126,-142,-90,-83,-94,-18,-134,-92,223,-57,-58,-59,-60,-128,-82,-133,-61,-84,238,-56,]),',':([22,23,25,26,27,31,34,37,38,39,77,78,80,81,82,83,84,85,87,88,91,93,94,95,96,97,98,105,106,107,121,132,138,139,142,143,144,145,147,148,149,150,151,152,153,160,164,165,166,167,168,169,170,171,172,173,174,175,176,177,178,179,181,182,183,184,189,190,192,193,201,202,203,204,205,211,212,213,215,216,217,224,226,232,245,246,247,262,],[-87,-88,-102,-103,-104,-21,-89,-106,-107,-108,119,-22,-139,-80,-110,-112,-115,-120,-123,-127,-131,-136,-137,-138,-140,-141,-81,-101,-101,-29,-132,-130,-129,-135,185,-136,-86,-91,188,-100,188,191,-30,-31,-93,-61,-20,-23,-24,-109,-111,-113,-114,-116,-117,-118,-119,-121,-122,-124,-125,-126,-142,185,-90,-83,-94,-18,-134,-92,224,-57,-58,-59,-60,-128,-82,-85,-99,-28,-133,-61,-84,-56,255,-63,-64,-62,]),'[':([24,34,35,61,80,99,110,121,145,146,183,192,206,217,248,],[36,100,101,109,109,140,156,156,-91,-105,-90,-134,109,-133,109,]),'GT':([25,26,27,80,84,85,87,88,91,93,94,95,96,97,103,121,132,138,139,143,169,170,171,172,173,174,175,176,177,178,179,181,189,190,192,211,217,],[-102,-103,-104,-139,127,-120,-123,-127,-131,-136,-137,-138,-140,-141,146,-132,-130,-129,-135,-136,127,127,-116,-117,-118,-119,-121,-122,-124,-125,-126,-142,-94,-18,-134,-128,-133,]),')':([25,26,27,31,37,38,39,77,78,80,82,83,84,85,87,88,91,93,94,95,96,97,105,106,107,121,132,136,137,138,139,147,148,149,150,151,152,153,164,165,166,167,168,169,170,171,172,173,174,175,176,177,178,179,181,189,190,192,193,211,215,216,217,245,246,247,256,262,],[-102,-103,-104,-21,-106,-107,-108,118,-22,-139,-110,-112,-115,-120,-123,-127,-131,-136,-137,-138,-140,-141,-101,-101,-29,-132,-130,180,181,-129,-135,187,-100,189,190,-30,-31,-93,-20,-23,-24,-109,-111,-113,-114,-116,-117,-118,-119,-121,-122,-124,-125,-126,-142,-94,-18,-134,-92,-128,-99,-28,-133,254,-63,-64,263,-62,]),'LT':([29,80,84,85,87,88,91,93,94,95,96,97,121,132,138,139,143,169,170,171,172,173,174,175,176,177,178,179,181,189,190,192,211,217,],[40,-139,126,-120,-123,-127,-131,-136,-137,-138,-140,-141,-132,-130,-129,-135,-136,126,126,-116,-117,-118,-119,-121,-122,-124,-125,-126,-142,-94,-18,-134,-128,-133,]),'!':([32,33,62,63,64,67,70,74,86,89,90,101,105,106,107,108,109,122,123,124,125,126,127,128,129,130,131,133,134,135,140,155,156,158,180,185,188,191,223,249,250,252,259,],[90,90,90,90,90,-69,90,-76,90,90,90,90,90,90,90,90,90,90,90,90,90,90,90,90,90,90,90,90,90,90,90,90,90,90,90,90,90,90,90,90,90,-50,90,]),'-':([32,33,62,63,64,67,70,74,80,85,86,87,88,89,90,91,93,94,95,96,97,101,105,106,107,108,109,121,122,123,124,125,126,127,128,129,130,131,132,133,134,135,138,139,140,143,155,156,158,171,172,173,174,175,176,177,178,179,180,181,185,188,189,190,191,192,211,217,223,249,250,252,259,],[86,86,86,86,86,-69,86,-76,-139,130,86,-123,-127,86,86,-131,-136,-137,-138,-140,-141,86,86,86,86,86,86,-132,86,86,86,86,86,86,86,86,86,86,-130,86,86,86,-129,-135,86,-136,86,86,86,130,130,130,130,-121,-122,-124,-125,-126,86,-142,86,86,-94,-18,86,-134,-128,-133,86,86,86,-50,86,]),'INT':([32,33,36,62,63,64,67,70,74,86,89,90,100,101,105,106,107,108,109,122,123,124,125,126,127,128,129,130,131,133,134,135,140,155,156,158,180,185,186,188,191,223,249,250,252,259,],[93,93,102,93,93,93,-69,93,-76,93,93,93,141,143,93,93,93,93,93,93,93,93,93,93,93,93,93,93,93,93,93,93,93,93,93,93,93,93,214,93,93,93,93,93,-50,93,]),'FLOAT':([32,33,62,63,64,67,70,74,86,89,90,101,105,106,107,108,109,122,123,124,125,126,127,128,129,130,131,133,134,135,140,155,156,158,180,185,188,191,223,249,250,252,259,],[94,94,94,94,94,-69,94,-76,94,94,94,94,94,94,94,94,94,94,94,94,94,94,94,94,94,94,94,94,94,94,94,94,94,94,94,94,94,94,94,94,94,-50,94,]),'STRING':([32,33,62,63,64,67,70,74,86,89,90,101,105,106,107,108,109,122,123,124,125,126,127,128,129,130,131,133,134,135,140,155,156,158,180,185,188,191,223,249,250,252,259,],[95,95,95,95,95,-69,95,-76,95,95,95,95,95,95,95,95,95,95,95,95,95,95,95,95,95,95,95,95,95,95,95,95,95,95,95,95,95,95,95,95,95,-50,95,]),'*':([80,87,88,91,93,94,95,96,97,121,132,138,139,143,175,176,177,178,179,181,189,190,192,211,217,],[-139,133,-127,-131,-136,-137,-138,-140,-141,-132,-130,-129,-135,-136,133,133,-124,-125,-126,-142,-94,-18,-134,-128,-133,]),'/':([80,87,88,91,93,94,95,96,97,121,132,138,139,143,175,176,177,178,179,181,189,190,192,211,217,],[-139,134,-127,-131,-136,-137,-138,-140,-141,-132,-130,-129,-135,-136,134,134,-124,-125,-126,-142,-94,-18,-134,-128,-133,]),'%':([80,87,88,91,93,94,95,96,97,121,132,138,139,143,175,176,177,178,179,181,189,190,192,211,217,],[-139,135,-127,-131,-136,-137,-138,-140,-141,-132,-130,-129,-135,-136,135,135,-124,-125,-126,-142,-94,-18,-134,-128,-133,]),'+':([80,85,87,88,91,93,94,95,96,97,121,132,138,139,143,171,172,173,174,175,176,177,178,179,181,189,190,192,211,217,],[-139,131,-123,-127,-131,-136,-137,-138,-140,-141,-132,-130,-129,-135,-136,131,131,131,131,-121,-122,-124,-125,-126,-142,-94,-18,-134,-128,-133,]),'LTE':([80,84,85,87,88,91,93,94,95,96,97,121,132,138,139,143,169,170,171,172,173,174,175,176,177,178,179,181,189,190,192,211,217,],[-139,128,-120,-123,-127,-131,-136,-137,-138,-140,-141,-132,-130,-129,-135,-136,128,128,-116,-117,-118,-119,-121,-122,-124,-125,-126,-142,-94,-18,-134,-128,-133,]),'GTE':([80,84,85,87,88,91,93,94,95,96,97,121,132,138,139,143,169,170,171,172,173,174,175,176,177,178,179,181,189,190,192,211,217,],[-139,129,-120,-123,-127,-131,-136,-137,-138,-140,-141,-132,-130,-129,-135,-136,129,129,-116,-117,-118,-119,-121,-122,-124,-125,-126,-142,-94,-18,-134,-128,-133,]),'EQ':([80,83,84,85,87,88,91,93,94,95,96,97,121,132,138,139,143,168,169,170,171,172,173,174,175,176,177,178,179,181,189,190,192,211,217,],[-139,124,-115,-120,-123,-127,-131,-136,-137,-138,-140,-141,-132,-130,-129,-135,-136,124,-113,-114,-116,-117,-118,-119,-121,-122,-124,-125,-126,-142,-94,-18,-134,-128,-133,]),'NEQ':([80,83,84,85,87,88,91,93,94,95,96,97,121,132,138,139,143,168,169,170,171,172,173,174,175,176,177,178,179,181,189,190,192,211,217,],[-139,125,-115,-120,-123,-127,-131,-136,-137,-138,-140,-141,-132,-130,-129,-135,-136,125,-113,-114,-116,-117,-118,-119,-121,-122,-124,-125,-126,-142,-94,-18,-134,-128,-133,]),'AND':([80,82,83,84,85,87,88,91,93,94,95,96,97,121,132,138,139,143,167,168,169,170,171,172,173,174,175,176,177,178,179,181,189,190,192,211,217,],[-139,123,-112,-115,-120,-123,-127,-131,-136,-137,-138,-140,-141,-132,-130,-129,-135,-136,123,-111,-113,-114,-116,-117,-118,-119,-121,-122,-124,-125,-126,-142,-94,-18,-134,-128,-133,]),'OR':([80,81,82,83,84,85,87,88,91,93,94,95,96,97,98,111,112,113,116,121,132,137,138,139,143,144,148,152,153,154,167,168,169,170,171,172,173,174,175,176,177,178,179,181,189,190,192,193,194,196,211,213,215,217,231,256,257,],[-139,122,-110,-112,-115,-120,-123,-127,-131,-136,-137,-138,-140,-141,122,122,122,122,122,-132,-130,122,-129,-135,-136,122,122,122,122,122,-109,-111,-113,-114,-116,-117,-118,-119,-121,-122,-124,-125,-126,-142,-94,-18,-134,122,122,122,-128,122,122,-133,122,122,122,]),']':([80,82,83,84,85,87,88,91,93,94,95,96,97,102,121,132,138,139,141,142,143,144,154,167,168,169,170,171,172,173,174,175,176,177,178,179,181,182,189,190,192,194,211,213,214,217,],[-139,-110,-112,-115,-120,-123,-127,-131,-136,-137,-138,-140,-141,145,-132,-130,-129,-135,183,184,-136,-86,192,-109,-111,-113,-114,-116,-117,-118,-119,-121,-122,-124,-125,-126,-142,212,-94,-18,-134,217,-128,-85,226,-133,]),'RARROW':([80,82,83,84,85,87,88,91,93,94,95,96,97,118,121,132,138,139,167,168,169,170,171,172,173,174,175,176,177,178,179,181,189,190,192,196,199,211,217,],[-139,-110,-112,-115,-120,-123,-127,-131,-136,-137,-138,-140,-141,163,-132,-130,-129,-135,-109,-111,-113,-114,-116,-117,-118,-119,-121,-122,-124,-125,-126,-142,-94,-18,-134,219,221,-128,-133,]),'RETI':([143,],[186,]),'DEFAULT':([158,252,259,],[199,-50,199,]),'ELSE':([227,234,274,276,],[-50,241,-50,241,]),}
+
+_lr_action = {}
+for _k, _v in _lr_action_items.items():
+   for _x,_y in zip(_v[0],_v[1]):
+      if not _x in _lr_action:  _lr_action[_x] = {}
+      _lr_action[_x][_k] = _y
+del _lr_action_items
+
+_lr_goto_items = {'prog':([0,],[1,]),'global_declarations':([0,],[2,]),'functions':([2,],[3,]),'global_declaration':([2,],[4,]),'declaration_assignment':([2,30,160,207,218,222,224,243,244,265,270,271,],[6,47,203,47,47,47,203,47,47,47,47,47,]),'declaration':([2,30,160,207,218,222,224,243,244,265,270,271,],[7,49,204,49,49,49,204,49,49,49,49,49,]),'function':([3,],[9,]),'function_declaration':([3,],[11,]),'function_definition':([3,],[12,]),'function_def':([3,],[13,]),'function_header':([3,],[14,]),'function_id':([3,],[15,]),'function_body':([14,],[18,]),'ss':([15,65,66,111,113,219,221,241,254,257,],[20,114,115,157,159,228,229,251,261,264,]),'type':([17,40,89,120,163,],[22,103,136,165,209,]),'Ptype':([17,120,163,],[23,166,210,]),'Vtype':([17,],[24,]),'stmts':([19,161,195,200,235,236,258,267,268,],[30,207,218,222,243,244,265,270,271,]),'ndim':([24,],[34,]),'stmt':([30,207,218,222,243,244,265,270,271,],[42,42,42,42,42,42,42,42,42,]),'print':([30,207,218,222,243,244,265,270,271,],[44,44,44,44,44,44,44,44,44,]),'read':([30,32,33,62,63,64,70,86,89,90,101,105,106,107,108,109,122,123,124,125,126,127,128,129,130,131,133,134,135,140,155,156,158,180,185,188,191,207,218,222,223,243,244,249,250,259,265,270,271,],[45,97,97,97,97,97,97,97,97,97,97,97,97,97,97,97,97,97,97,97,97,97,97,97,97,97,97,97,97,97,97,97,97,97,97,97,97,45,45,45,97,45,45,97,97,97,45,45,45,]),'function_call':([30,32,33,62,63,64,70,86,89,90,101,105,106,107,108,109,122,123,124,125,126,127,128,129,130,131,133,134,135,140,155,156,158,180,185,188,191,207,218,222,223,243,244,249,250,259,265,270,271,],[46,96,96,96,96,96,96,96,96,96,96,96,96,96,96,96,96,96,96,96,96,96,96,96,96,96,96,96,96,96,96,96,96,96,96,96,96,46,46,46,96,46,46,96,96,96,46,46,46,]),'assignment':([30,160,207,218,222,224,238,243,244,255,265,270,271,],[48,205,48,48,48,205,247,48,48,247,48,48,48,]),'if':([30,207,218,222,243,244,265,270,271,],[50,50,50,50,50,50,50,50,50,]),'match':([30,207,218,222,243,244,265,270,271,],[51,51,51,51,51,51,51,51,51,]),'while':([30,207,218,222,243,244,265,270,271,],[52,52,52,52,52,52,52,52,52,]),'for':([30,207,218,222,243,244,265,270,271,],[53,53,53,53,53,53,53,53,53,]),'do_while':([30,207,218,222,243,244,265,270,271,],[54,54,54,54,54,54,54,54,54,]),'break':([30,207,218,222,243,244,265,270,271,],[55,55,55,55,55,55,55,55,55,]),'continue':([30,207,218,222,243,244,265,270,271,],[56,56,56,56,56,56,56,56,56,]),'return':([30,207,218,222,243,244,265,270,271,],[57,57,57,57,57,57,57,57,57,]),'read_type':([30,32,33,62,63,64,70,86,89,90,101,105,106,107,108,109,122,123,124,125,126,127,128,129,130,131,133,134,135,140,155,156,158,180,185,188,191,207,218,222,223,243,244,249,250,259,265,270,271,],[59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,]),'f_call':([30,32,33,62,63,64,70,86,89,90,101,105,106,107,108,109,122,123,124,125,126,127,128,129,130,131,133,134,135,140,155,156,158,180,185,188,191,207,218,222,223,243,244,249,250,259,265,270,271,],[60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,]),'match_start':([30,207,218,222,243,244,265,270,271,],[63,63,63,63,63,63,63,63,63,]),'loop_while':([30,207,218,222,243,244,265,270,271,],[64,64,64,64,64,64,64,64,64,]),'loop_for':([30,207,218,222,243,244,265,270,271,],[65,65,65,65,65,65,65,65,65,]),'loop_do':([30,207,218,222,243,244,265,270,271,],[66,66,66,66,66,66,66,66,66,]),'params':([31,],[77,]),'param':([31,119,],[78,164,]),'expression':([32,33,62,63,64,70,89,101,105,106,107,108,109,140,155,156,158,185,188,191,223,249,250,259,],[81,98,111,112,113,116,137,144,148,148,152,153,154,144,193,194,196,213,215,152,231,256,257,196,]),'subexpression':([32,33,62,63,64,70,89,101,105,106,107,108,109,122,140,155,156,158,185,188,191,223,249,250,259,],[82,82,82,82,82,82,82,82,82,82,82,82,82,167,82,82,82,82,82,82,82,82,82,82,82,]),'condition':([32,33,62,63,64,70,89,101,105,106,107,108,109,122,123,140,155,156,158,185,188,191,223,249,250,259,],[83,83,83,83,83,83,83,83,83,83,83,83,83,83,168,83,83,83,83,83,83,83,83,83,83,83,]),'comparison':([32,33,62,63,64,70,89,101,105,106,107,108,109,122,123,124,125,140,155,156,158,185,188,191,223,249,250,259,],[84,84,84,84,84,84,84,84,84,84,84,84,84,84,84,169,170,84,84,84,84,84,84,84,84,84,84,84,]),'term':([32,33,62,63,64,70,89,101,105,106,107,108,109,122,123,124,125,126,127,128,129,140,155,156,158,185,188,191,223,249,250,259,],[85,85,85,85,85,85,85,85,85,85,85,85,85,85,85,85,85,171,172,173,174,85,85,85,85,85,85,85,85,85,85,85,]),'factor':([32,33,62,63,64,70,89,101,105,106,107,108,109,122,123,124,125,126,127,128,129,130,131,140,155,156,158,185,188,191,223,249,250,259,],[87,87,87,87,87,87,87,87,87,87,87,87,87,87,87,87,87,87,87,87,87,175,176,87,87,87,87,87,87,87,87,87,87,87,]),'unary':([32,33,62,63,64,70,86,89,90,101,105,106,107,108,109,122,123,124,125,126,127,128,129,130,131,133,134,135,140,155,156,158,180,185,188,191,223,249,250,259,],[88,88,88,88,88,88,132,88,138,88,88,88,88,88,88,88,88,88,88,88,88,88,88,88,88,177,178,179,88,88,88,88,211,88,88,88,88,88,88,88,]),'primary':([32,33,62,63,64,70,86,89,90,101,105,106,107,108,109,122,123,124,125,126,127,128,129,130,131,133,134,135,140,155,156,158,180,185,188,191,223,249,250,259,],[91,91,91,91,91,91,91,91,91,91,91,91,91,91,91,91,91,91,91,91,91,91,91,91,91,91,91,91,91,91,91,91,91,91,91,91,91,91,91,91,]),'es':([41,162,225,227,230,252,253,269,273,274,275,],[104,208,233,234,237,259,260,272,275,276,277,]),'ndepth':([61,80,206,248,],[110,121,110,110,]),'arrayitems':([101,140,],[142,182,]),'multiple_prints':([105,106,],[147,149,]),'args':([107,],[150,]),'arg':([107,191,],[151,216,]),'out_type':([118,],[162,]),'cases':([158,259,],[197,266,]),'default':([158,259,],[198,198,]),'for_inits':([160,],[201,]),'for_init':([160,224,],[202,232,]),'else_if':([234,276,],[240,278,]),'else':([234,276,],[242,242,]),'for_updates':([238,],[245,]),'for_update':([238,255,],[246,262,]),}
+
+_lr_goto = {}
+for _k, _v in _lr_goto_items.items():
+   for _x, _y in zip(_v[0], _v[1]):
+       if not _x in _lr_goto: _lr_goto[_x] = {}
+       _lr_goto[_x][_k] = _y
+del _lr_goto_items
+_lr_productions = [
+  ("S' -> prog","S'",1,None,None,None),
+  ('prog -> global_declarations functions','prog',2,'p_prog','_parser.py',36),
+  ('global_declarations -> global_declarations global_declaration','global_declarations',2,'p_global_declarations','_parser.py',69),
+  ('global_declarations -> <empty>','global_declarations',0,'p_global_declarations_empty','_parser.py',77),
+  ('global_declarations -> global_declarations error','global_declarations',2,'p_global_declarations_error','_parser.py',84),
+  ('global_declaration -> declaration_assignment','global_declaration',1,'p_global_declaration','_parser.py',91),
+  ('global_declaration -> declaration','global_declaration',1,'p_global_declaration','_parser.py',92),
+  ('functions -> functions function','functions',2,'p_functions','_parser.py',102),
+  ('functions -> <empty>','functions',0,'p_functions_empty','_parser.py',110),
+  ('functions -> functions error','functions',2,'p_functions_error','_parser.py',117),
+  ('function -> function_declaration','function',1,'p_function','_parser.py',123),
+  ('function -> function_definition','function',1,'p_function','_parser.py',124),
+  ('function_declaration -> function_def','function_declaration',1,'p_function_declaration','_parser.py',129),
+  ('function_definition -> function_header function_body','function_definition',2,'p_function_definition','_parser.py',134),
+  ('function_def -> function_id ss ( params ) out_type es','function_def',7,'p_function_def','_parser.py',140),
+  ('function_header -> function_id ss ( params ) out_type','function_header',6,'p_function_header','_parser.py',145),
+  ('function_id -> FUNCTION ID','function_id',2,'p_function_id','_parser.py',150),
+  ('function_body -> { stmts } es','function_body',4,'p_function_body','_parser.py',155),
+  ('function_call -> f_call ( args )','function_call',4,'p_function_call','_parser.py',160),
+  ('f_call -> ID','f_call',1,'p_f_call','_parser.py',165),
+  ('params -> params , param','params',3,'p_params','_parser.py',172),
+  ('params -> <empty>','params',0,'p_params_empty','_parser.py',178),
+  ('params -> param','params',1,'p_single_param','_parser.py',183),
+  ('param -> ID : type','param',3,'p_param','_parser.py',188),
+  ('param -> ID : Ptype','param',3,'p_param','_parser.py',189),
+  ('out_type -> RARROW type','out_type',2,'p_out_type','_parser.py',195),
+  ('out_type -> RARROW Ptype','out_type',2,'p_out_type','_parser.py',196),
+  ('out_type -> <empty>','out_type',0,'p_out_type','_parser.py',197),
+  ('args -> args , arg','args',3,'p_args','_parser.py',203),
+  ('args -> <empty>','args',0,'p_args_empty','_parser.py',209),
+  ('args -> arg','args',1,'p_args_empty','_parser.py',210),
+  ('arg -> expression','arg',1,'p_single_arg','_parser.py',218),
+  ('stmts -> stmts stmt','stmts',2,'p_stmts','_parser.py',229),
+  ('stmts -> <empty>','stmts',0,'p_stmts_empty','_parser.py',236),
+  ('stmts -> stmts error','stmts',2,'p_stmts_error','_parser.py',242),
+  ('stmt -> print','stmt',1,'p_stmt','_parser.py',248),
+  ('stmt -> read','stmt',1,'p_stmt','_parser.py',249),
+  ('stmt -> function_call','stmt',1,'p_stmt','_parser.py',250),
+  ('stmt -> declaration_assignment','stmt',1,'p_stmt','_parser.py',251),
+  ('stmt -> assignment','stmt',1,'p_stmt','_parser.py',252),
+  ('stmt -> declaration','stmt',1,'p_stmt','_parser.py',253),
+  ('stmt -> if','stmt',1,'p_stmt','_parser.py',254),
+  ('stmt -> match','stmt',1,'p_stmt','_parser.py',255),
+  ('stmt -> while','stmt',1,'p_stmt','_parser.py',256),
+  ('stmt -> for','stmt',1,'p_stmt','_parser.py',257),
+  ('stmt -> do_while','stmt',1,'p_stmt','_parser.py',258),
+  ('stmt -> break','stmt',1,'p_stmt','_parser.py',259),
+  ('stmt -> continue','stmt',1,'p_stmt','_parser.py',260),
+  ('stmt -> return','stmt',1,'p_stmt','_parser.py',261),
+  ('ss -> <empty>','ss',0,'p_start_scope','_parser.py',271),
+  ('es -> <empty>','es',0,'p_end_scope','_parser.py',276),
+  ('return -> RETURN expression','return',2,'p_return','_parser.py',286),
+  ('return -> RETURN ;','return',2,'p_return','_parser.py',287),
+  ('break -> BREAK','break',1,'p_break','_parser.py',297),
+  ('continue -> CONTINUE','continue',1,'p_continue','_parser.py',302),
+  ('for -> loop_for ss ( for_inits ; expression ; for_updates ) ss { stmts } es es','for',15,'p_for','_parser.py',312),
+  ('for_inits -> for_inits , for_init','for_inits',3,'p_for_inits','_parser.py',317),
+  ('for_inits -> for_init','for_inits',1,'p_for_inits','_parser.py',318),
+  ('for_init -> declaration_assignment','for_init',1,'p_for_init','_parser.py',323),
+  ('for_init -> declaration','for_init',1,'p_for_init','_parser.py',324),
+  ('for_init -> assignment','for_init',1,'p_for_init','_parser.py',325),
+  ('for_init -> <empty>','for_init',0,'p_for_init','_parser.py',326),
+  ('for_updates -> for_updates , for_update','for_updates',3,'p_for_updates','_parser.py',331),
+  ('for_updates -> for_update','for_updates',1,'p_for_updates','_parser.py',332),
+  ('for_update -> assignment','for_update',1,'p_for_update','_parser.py',337),
+  ('do_while -> loop_do ss { stmts } es WHILE ( expression )','do_while',10,'p_do_while','_parser.py',343),
+  ('while -> loop_while expression ss { stmts } es','while',7,'p_while','_parser.py',349),
+  ('loop_for -> FOR','loop_for',1,'p_loop_for','_parser.py',356),
+  ('loop_do -> DO','loop_do',1,'p_loop_do','_parser.py',361),
+  ('loop_while -> WHILE','loop_while',1,'p_loop_while','_parser.py',366),
+  ('if -> IF expression ss { stmts } es else_if','if',8,'p_if','_parser.py',376),
+  ('else_if -> ELSE IF expression ss { stmts } es else_if','else_if',9,'p_else_if','_parser.py',381),
+  ('else_if -> else','else_if',1,'p_else_if','_parser.py',382),
+  ('else -> ELSE ss { stmts } es','else',6,'p_else','_parser.py',387),
+  ('else -> <empty>','else',0,'p_else','_parser.py',388),
+  ('match -> match_start expression { cases }','match',5,'p_match','_parser.py',398),
+  ('match_start -> MATCH','match_start',1,'p_match_start','_parser.py',403),
+  ('cases -> expression RARROW ss { stmts } es cases','cases',8,'p_cases','_parser.py',408),
+  ('cases -> default','cases',1,'p_cases','_parser.py',409),
+  ('default -> DEFAULT RARROW ss { stmts } es','default',7,'p_default','_parser.py',414),
+  ('declaration_assignment -> ID : type ASSIGN expression','declaration_assignment',5,'p_variable_init','_parser.py',424),
+  ('declaration_assignment -> ID : Ptype ASSIGN expression','declaration_assignment',5,'p_pointer_init','_parser.py',429),
+  ('declaration_assignment -> ID : Vtype ndim ASSIGN [ arrayitems ]','declaration_assignment',8,'p_array_literal_init','_parser.py',434),
+  ('declaration_assignment -> ID : Vtype ASSIGN [ arrayitems ]','declaration_assignment',7,'p_array_literal_init','_parser.py',435),
+  ('declaration_assignment -> ID : Vtype ASSIGN [ INT RETI INT ]','declaration_assignment',9,'p_array_range_init','_parser.py',440),
+  ('arrayitems -> arrayitems , expression','arrayitems',3,'p_array_items','_parser.py',445),
+  ('arrayitems -> expression','arrayitems',1,'p_array_items','_parser.py',446),
+  ('declaration -> ID : type','declaration',3,'p_variable_declaration','_parser.py',456),
+  ('declaration -> ID : Ptype','declaration',3,'p_pointer_declaration','_parser.py',461),
+  ('declaration -> ID : Vtype ndim','declaration',4,'p_array_declaration','_parser.py',466),
+  ('ndim -> ndim [ INT ]','ndim',4,'p_array_dimension','_parser.py',471),
+  ('ndim -> [ INT ]','ndim',3,'p_array_dimension','_parser.py',472),
+  ('assignment -> ID ndepth ASSIGN expression','assignment',4,'p_assignment_indexing','_parser.py',482),
+  ('assignment -> ID ASSIGN expression','assignment',3,'p_assignment_expression','_parser.py',487),
+  ('read -> read_type ( multiple_prints )','read',4,'p_read','_parser.py',497),
+  ('read_type -> READ_INT','read_type',1,'p_read_type','_parser.py',502),
+  ('read_type -> READ_FLOAT','read_type',1,'p_read_type','_parser.py',503),
+  ('read_type -> READ_STRING','read_type',1,'p_read_type','_parser.py',504),
+  ('print -> PRINT ( multiple_prints )','print',4,'p_print','_parser.py',514),
+  ('multiple_prints -> multiple_prints , expression','multiple_prints',3,'p_print_multiple','_parser.py',519),
+  ('multiple_prints -> expression','multiple_prints',1,'p_print_single','_parser.py',524),
+  ('multiple_prints -> <empty>','multiple_prints',0,'p_print_empty','_parser.py',529),
+  ('type -> TYPE_INT','type',1,'p_type','_parser.py',539),
+  ('type -> TYPE_STRING','type',1,'p_type','_parser.py',540),
+  ('type -> TYPE_FLOAT','type',1,'p_type','_parser.py',541),
+  ('Vtype -> TYPE_VEC LT type GT','Vtype',4,'p_vtype','_parser.py',546),
+  ('Ptype -> & TYPE_INT','Ptype',2,'p_ptype','_parser.py',551),
+  ('Ptype -> & TYPE_STRING','Ptype',2,'p_ptype','_parser.py',552),
+  ('Ptype -> & TYPE_FLOAT','Ptype',2,'p_ptype','_parser.py',553),
+  ('expression -> expression OR subexpression','expression',3,'p_expression_or','_parser.py',563),
+  ('expression -> subexpression','expression',1,'p_expression_subexpression','_parser.py',568),
+  ('subexpression -> subexpression AND condition','subexpression',3,'p_subexpression_and','_parser.py',574),
+  ('subexpression -> condition','subexpression',1,'p_subexpression_condition','_parser.py',579),
+  ('condition -> condition EQ comparison','condition',3,'p_condition_eq','_parser.py',585),
+  ('condition -> condition NEQ comparison','condition',3,'p_condition_neq','_parser.py',590),
+  ('condition -> comparison','condition',1,'p_condition_comparison','_parser.py',595),
+  ('comparison -> comparison LT term','comparison',3,'p_comparison_lt','_parser.py',601),
+  ('comparison -> comparison GT term','comparison',3,'p_comparison_gt','_parser.py',606),
+  ('comparison -> comparison LTE term','comparison',3,'p_comparison_lte','_parser.py',611),
+  ('comparison -> comparison GTE term','comparison',3,'p_comparison_gte','_parser.py',616),
+  ('comparison -> term','comparison',1,'p_comparison_term','_parser.py',621),
+  ('term -> term - factor','term',3,'p_term_sub','_parser.py',627),
+  ('term -> term + factor','term',3,'p_term_add','_parser.py',632),
+  ('term -> factor','term',1,'p_term_factor','_parser.py',637),
+  ('factor -> factor * unary','factor',3,'p_factor_mul','_parser.py',643),
+  ('factor -> factor / unary','factor',3,'p_factor_div','_parser.py',648),
+  ('factor -> factor % unary','factor',3,'p_factor_mod','_parser.py',653),
+  ('factor -> unary','factor',1,'p_factor_unary','_parser.py',658),
+  ('unary -> ( type ) unary','unary',4,'p_unary_cast','_parser.py',664),
+  ('unary -> ! unary','unary',2,'p_unary_not','_parser.py',669),
+  ('unary -> - unary','unary',2,'p_unary_neg','_parser.py',674),
+  ('unary -> primary','unary',1,'p_unary_primary','_parser.py',679),
+  ('primary -> ID ndepth','primary',2,'p_primary_indexing','_parser.py',685),
+  ('ndepth -> ndepth [ expression ]','ndepth',4,'p_array_indexing_depth','_parser.py',690),
+  ('ndepth -> [ expression ]','ndepth',3,'p_array_indexing_depth','_parser.py',691),
+  ('primary -> & ID','primary',2,'p_primary_ref','_parser.py',696),
+  ('primary -> INT','primary',1,'p_primary_int','_parser.py',701),
+  ('primary -> FLOAT','primary',1,'p_primary_float','_parser.py',706),
+  ('primary -> STRING','primary',1,'p_primary_string','_parser.py',711),
+  ('primary -> ID','primary',1,'p_primary_id','_parser.py',716),
+  ('primary -> function_call','primary',1,'p_primary_function','_parser.py',721),
+  ('primary -> read','primary',1,'p_primary_read','_parser.py',726),
+  ('primary -> ( expression )','primary',3,'p_primary_new','_parser.py',731),
+]
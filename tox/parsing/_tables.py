@@ -0,0 +1,35 @@
+"""
+Generates the lexer and parser tables shipped with tox.
+
+Run `make tables` (or `python -m tox.parsing._tables`) whenever the token rules in
+`tox/lexing/_lexer.py` or the grammar in `tox/parsing/_parser.py` change.
+"""
+import os
+import sys
+
+from ply import lex, yacc
+
+from tox.lexing import _lexer
+from tox.parsing import _parser
+
+LEXTAB = "_lextab"
+PARSETAB = "_parsetab"
+
+def build_tables():
+    """
+    Regenerate `tox/lexing/_lextab.py` and `tox/parsing/_parsetab.py`.
+    """
+    lexing_dir = os.path.dirname(_lexer.__file__)
+    parsing_dir = os.path.dirname(_parser.__file__)
+
+    lex.lex(module=_lexer).writetab(LEXTAB, lexing_dir)
+
+    # PLY only writes the parse table when the current one does not match the grammar, so drop it first
+    parsetab_path = os.path.join(parsing_dir, PARSETAB + ".py")
+    if os.path.exists(parsetab_path):
+        os.remove(parsetab_path)
+    sys.modules.pop(f"tox.parsing.{PARSETAB}", None)
+    yacc.yacc(module=_parser, tabmodule=f"tox.parsing.{PARSETAB}", outputdir=parsing_dir, write_tables=True, debug=False)
+
+if __name__ == "__main__":
+    build_tables()
@@ -0,0 +1,290 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Iterator, Optional, List, Tuple
+from dataclasses import dataclass, field, fields
+
+if TYPE_CHECKING:   # The semantic handlers build the nodes, so they can't be imported from here
+    from tox.semantics._scopes import MetaData
+    from tox.semantics._functions import FunctionData
+
+# Typed abstract syntax tree built by the grammar rules once a construct has been checked.
+# Every expression knows its type and every variable is resolved to its metadata and stack slot,
+# so the code generator (tox.codegen._generator) never looks anything up.
+
+@dataclass(eq=False)
+class Symbol:
+    """
+    Class that represents a resolved variable.
+    """
+    name: str
+    meta: MetaData
+    local: bool     # Lives in the frame of a function rather than in the globals
+
+    @property
+    def slot(self) -> int:
+        return self.meta.stack_position[0]
+
+######################
+##   EXPRESSIONS    ##
+######################
+
+@dataclass(eq=False)
+class Expr:
+    """
+    Base class of the expressions. `type` is the type the expression leaves on the stack.
+    """
+    type: Optional[str]
+
+@dataclass(eq=False)
+class Const(Expr):
+    """
+    A literal, kept as written in the source.
+    """
+    value: str
+
+@dataclass(eq=False)
+class Load(Expr):
+    """
+    The value of a scalar variable.
+    """
+    var: Symbol
+
+@dataclass(eq=False)
+class Address(Expr):
+    """
+    The address of a variable: '&x', or an array used as a pointer.
+    """
+    var: Symbol
+
+@dataclass(eq=False)
+class Index(Expr):
+    """
+    An element of an array or pointer. Indexing fewer dimensions than an array has gives an address.
+    """
+    var: Symbol
+    indices: List[Expr]
+
+@dataclass(eq=False)
+class Unary(Expr):
+    """
+    'not' or 'neg' applied to an operand.
+    """
+    op: str
+    operand: Expr
+
+@dataclass(eq=False)
+class Binary(Expr):
+    """
+    A binary operation, named after its TypeCheck production ('add', 'lt', ...).
+    """
+    op: str
+    left: Expr
+    right: Expr
+
+@dataclass(eq=False)
+class Cast(Expr):
+    """
+    A conversion of the operand to `type`. Casts to the same type are never built.
+    """
+    operand: Expr
+
+@dataclass(eq=False)
+class Call(Expr):
+    """
+    A function call. The type is None for functions without a return value.
+    """
+    function: FunctionData
+    args: List[Expr]
+
+@dataclass(eq=False)
+class Inline(Expr):
+    """
+    A call replaced by a copy of the body of the function (see tox.codegen._inlining).
+
+    The parameters and variables of the copy live in cells reserved at the start of the frame
+    of the caller, and the return value is left in `result`.
+    """
+    function: FunctionData
+    params: List[Symbol]
+    args: List[Expr]
+    body: Block
+    result: Optional[Symbol] = None
+
+@dataclass(eq=False)
+class Cache(Expr):
+    """
+    An expression whose value is also stored in `cell`, where the later uses of the same value
+    load it from (see tox.codegen._value_numbering).
+    """
+    cell: Symbol
+    value: Expr
+
+@dataclass(eq=False)
+class Read(Expr):
+    """
+    A read from stdin after printing the prompt.
+    """
+    prompt: List[Expr]
+
+######################
+##    STATEMENTS    ##
+######################
+
+@dataclass(eq=False)
+class Block:
+    """
+    The statements of a scope and the number of cells its variables take.
+    """
+    stmts: List
+    size: int
+
+@dataclass(eq=False)
+class Print:
+    values: List[Expr]
+
+@dataclass(eq=False)
+class Declare:
+    """
+    A declaration without an initial value. The variable is zeroed, a pointer points to itself.
+    """
+    var: Symbol
+
+@dataclass(eq=False)
+class Init:
+    """
+    A declaration of a variable or pointer with an initial value.
+    """
+    var: Symbol
+    value: Expr
+
+@dataclass(eq=False)
+class ArrayInit:
+    var: Symbol
+    items: List[Expr]
+
+@dataclass(eq=False)
+class RangeInit:
+    var: Symbol
+    start: int
+    end: int
+
+@dataclass(eq=False)
+class Reserve:
+    """
+    Cells left in place of a global that is never used, so the globals after it keep their address.
+    """
+    size: int
+
+@dataclass(eq=False)
+class Assign:
+    var: Symbol
+    value: Expr
+
+@dataclass(eq=False)
+class IndexAssign:
+    var: Symbol
+    indices: List[Expr]
+    value: Expr
+
+@dataclass(eq=False)
+class If:
+    """
+    An if statement with its else ifs as (condition, block) branches, and its else block if any.
+    """
+    branches: List[Tuple[Expr, Block]]
+    orelse: Optional[Block] = None
+
+@dataclass(eq=False)
+class Match:
+    subject: Expr
+    cases: List[Tuple[Expr, Block]]
+    default: Block
+
+@dataclass(eq=False)
+class While:
+    cond: Expr
+    body: Block
+
+@dataclass(eq=False)
+class DoWhile:
+    body: Block
+    cond: Expr
+
+@dataclass(eq=False)
+class For:
+    """
+    A for loop. `size` is the number of cells taken by the variables declared in its initialization.
+    """
+    inits: List
+    cond: Expr
+    updates: List
+    body: Block
+    size: int
+
+@dataclass(eq=False)
+class Break:
+    pass
+
+@dataclass(eq=False)
+class Continue:
+    pass
+
+@dataclass(eq=False)
+class Return:
+    value: Optional[Expr] = None
+
+@dataclass(eq=False)
+class TailCall:
+    """
+    A call of a function to itself in tail position, made by setting its parameters to the
+    arguments and jumping back to its start (see tox.codegen._tail_calls).
+    """
+    args: List[Expr]
+
+######################
+##     PROGRAM      ##
+######################
+
+@dataclass(eq=False)
+class Function:
+    """
+    A function definition, or a declaration when it has no body.
+    """
+    data: FunctionData
+    params: List[Symbol] = field(default_factory=list)
+    body: Optional[Block] = None
+
+@dataclass(eq=False)
+class Program:
+    """
+    The global declarations and the functions of a program, in source order.
+    """
+    globals: List
+    functions: List[Function]
+
+def ends_with_return(stmts: List) -> bool:
+    """
+    Whether the last statement that generates any code is a return.
+    """
+    for stmt in reversed(stmts):
+        if isinstance(stmt, Print) and not stmt.values:
+            continue
+        if isinstance(stmt, Block):     # An if the dead code elimination reduced to one of its blocks
+            return ends_with_return(stmt.stmts)
+        return isinstance(stmt, Return)
+    return False
+
+def walk(node) -> Iterator:
+    """
+    Every node of a tree, the node itself included, in no particular order. Symbols are not entered.
+    """
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, (list, tuple)):
+            stack.extend(node)
+            continue
+        if type(node).__module__ != __name__:
+            continue
+        yield node
+        if not isinstance(node, Symbol):
+            stack.extend(getattr(node, item.name) for item in fields(node))
@@ -1,6 +1,5 @@
-import sys
-
-from tox import compiler_error, compiler_note, std_message
+from tox.utils.errors import SemanticError, compiler_error, compiler_note
+from tox.semantics import _ast as ast
 
 
 class Primary:
@@ -27,21 +26,21 @@ class Primary:
         primary : INT
         """
         p.parser.type_checker.push(("int", p.lexer.lineno))
-        return std_message([f"PUSHI {p[1]}"]) # Return the message
+        return ast.Const("int", p[1])
 
     def _float(self, p) -> str: # Handles pushing an integer
         """
         primary : FLOAT
         """
         p.parser.type_checker.push(("float", p.lexer.lineno))
-        return std_message([f"PUSHF {p[1]}"]) # Return the message
+        return ast.Const("float", p[1])
 
     def _string(self, p) -> str: # Handles pushing an integer
         """
         primary : STRING
         """
         p.parser.type_checker.push(("string", p.lexer.lineno))
-        return std_message([f"PUSHS {p[1]}"]) # Return the message
+        return ast.Const("string", p[1])
 
     def _id(self, p) -> str: # Handles pushing the value of a variable
         """
@@ -51,19 +50,19 @@ class Primary:
         if id_meta is None: # If the variable is not declared, Throw an error
             compiler_error(p, 1, f"Variable {p[1]} not declared")
             compiler_note("Called from Primary.id")
-            sys.exit(1)
+            raise SemanticError()
         if not id_meta.p_init:
             compiler_error(p, 1, f"Using non initialized pointer '{p[1]}'")
             compiler_note("Called from Primary.id")
-            sys.exit(1)
+            raise SemanticError()
 
-        push_op = "PUSHGP" if not in_function else "PUSHFP" # If the variable is in a function, push the frame pointer else push the global pointer
-        if id_meta.type.startswith("vec"):
+        var = ast.Symbol(p[1], id_meta, in_function)
+        if id_meta.type.startswith("vec"):   # An array is used as a pointer to its first element
             p.parser.type_checker.push((f"&{id_meta.type[4:-1]}", p.lexer.lineno))
-            return std_message([push_op, f"PUSHI {id_meta.stack_position[0]}", "PADD"])
+            return ast.Address(f"&{id_meta.type[4:-1]}", var)
         else:
             p.parser.type_checker.push((id_meta.type, p.lexer.lineno))
-            return std_message([push_op, f"LOAD {id_meta.stack_position[0]}"])  # Return the message
+            return ast.Load(id_meta.type, var)
 
     def _ref(self, p) -> str: # Handles getting the address of a variable
         """
@@ -73,15 +72,13 @@ class Primary:
         if id_meta is None: # If the variable is not declared, Throw an error
             compiler_error(p, 2, f"Variable {p[2]} not declared")
             compiler_note("Called from Primary._ref")
-            sys.exit(1)
+            raise SemanticError()
         if id_meta.type.startswith("&") or id_meta.type.startswith("vec"):
             compiler_error(p, 1, f"Pointer to pointer not supported")
             compiler_note("Called from Primary._ref")
-            sys.exit(1)
+            raise SemanticError()
         p.parser.type_checker.push((f"&{id_meta.type}", p.lexer.lineno))
-
-        push_op = "PUSHGP" if not in_function else "PUSHFP" # If the variable is in a function, push the frame pointer else push the global pointer
-        return std_message([push_op, f"PUSHI {id_meta.stack_position[0]}", "PADD"]) # Return the message
+        return ast.Address(f"&{id_meta.type}", ast.Symbol(p[2], id_meta, in_function))
 
     def _indexing(self, p) -> str: # Handles indexing into an array
         """
@@ -91,44 +88,36 @@ class Primary:
         if id_meta is None: # If the variable is not declared, Throw an error
             compiler_error(p, 1, f"Variable {p[1]} not declared")
             compiler_note("Called from Primary._indexing")
-            sys.exit(1)
+            raise SemanticError()
         if not id_meta.type.startswith("vec") and not id_meta.type.startswith("&"):
             compiler_error(p, 1, f"Can't index into variable of type '{id_meta.type}'")
             compiler_note("Called from Assignment._array_index")
-            sys.exit(1)
+            raise SemanticError()
         if not id_meta.p_init:
             compiler_error(p, 1, f"Indexing into non initialized pointer '{p[1]}'")
             compiler_note("Called from Primary._indexing")
-            sys.exit(1)
+            raise SemanticError()
         if len(p.parser.indexing_depth[-1]) > 1 and id_meta.type.startswith("&"):
             compiler_error(p, 1, f"Can't index pointer with more than one dimension")
             compiler_note("Called from Primary._indexing")
-            sys.exit(1)
+            raise SemanticError()
         if id_meta.array_shape and len(p.parser.indexing_depth[-1]) > len(id_meta.array_shape):
             compiler_error(p, 1, f"Indexing into dimension {len(p.parser.indexing_depth[-1])} of array {p[1]} of dimension {len(id_meta.array_shape)}")
             compiler_note("Called from Primary._indexing")
-            sys.exit(1)
+            raise SemanticError()
 
-        push_op = "PUSHGP" if not in_function else "PUSHFP" # If the variable is in a function, push the frame pointer else push the global pointer
+        var = ast.Symbol(p[1], id_meta, in_function)
+        indices = p.parser.indexing_depth.pop()
         if id_meta.type.startswith("vec"):
-            op = [push_op, f"PUSHI {id_meta.stack_position[0]}", "PADD"]
-            for i, expr in enumerate(p.parser.indexing_depth[-1]):
-                factor = ["PUSHI 1"]
-                for dim in id_meta.array_shape[i+1:]:
-                    factor += [f"PUSHI {dim}", "MUL"]
-                op += [expr] + factor + ["MUL", "PADD"]
-            if len(p.parser.indexing_depth[-1]) < len(id_meta.array_shape):
-                p.parser.indexing_depth.pop()
+            if len(indices) < len(id_meta.array_shape):  # Leading dimensions only, the address of a sub array
                 p.parser.type_checker.push(("&"+id_meta.type[4:-1], p.lexer.lineno))
-                return std_message(op)
+                return ast.Index("&"+id_meta.type[4:-1], var, indices)
             else:
-                p.parser.indexing_depth.pop()
                 p.parser.type_checker.push((id_meta.type[4:-1], p.lexer.lineno))
-                return std_message(op + ["LOAD 0"])
+                return ast.Index(id_meta.type[4:-1], var, indices)
         elif id_meta.type.startswith("&"):
             p.parser.type_checker.push((id_meta.type[1:], p.lexer.lineno))
-            expr = p.parser.indexing_depth.pop()
-            return std_message([push_op, f"LOAD {id_meta.stack_position[0]}", f"{expr[0]}PADD", "LOAD 0"]) # Return the message
+            return ast.Index(id_meta.type[1:], var, indices)
 
     def _array_indexing_depth(self, p):
         """
@@ -139,7 +128,7 @@ class Primary:
         if idx != "int":
             compiler_error(p, 1, f"Index must be an integer, not {idx}")
             compiler_note("Called from Primary._array_indexing_depth")
-            sys.exit(1)
+            raise SemanticError()
 
         if len(p) == 5:
             p.parser.indexing_depth[-1].append(p[3])
@@ -1,10 +1,9 @@
 from __future__ import annotations
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Set
 from dataclasses import dataclass, field
 
-import sys
-
-from tox import compiler_warning, compiler_error, compiler_note, std_message
+from tox.utils.errors import SemanticError, compiler_warning, compiler_error, compiler_note
+from tox.semantics import _ast as ast
 
 @dataclass
 class FunctionData:
@@ -24,6 +23,7 @@ class Functions:
     """
     Table: Dict[str, FunctionData] = field(default_factory=dict)    # Table of functions
     current_function: Optional[FunctionData] = None                 # Current function
+    callees: Set[str] = field(default_factory=set)                  # Functions called so far
 
     def __post_init__(self):
         self.productions = {
@@ -52,14 +52,14 @@ class Functions:
         function_def : function_id ss '(' params ')' out_type es ';'
         """
         p.parser.num_params = 0
-        return p[1] + p[4]
+        return ast.Function(p[1], p[4])
 
     def _header(self, p):  # Declares a function
         """
         function_header : function_id ss '(' params ')' out_type
         """
         p.parser.num_params = 0
-        return p[1] + p[4]
+        return ast.Function(p[1], p[4])
 
     def _id(self, p):  # Adds the ID of a function
         """
@@ -69,38 +69,34 @@ class Functions:
         if func is not None and func.init:  # If the function is already defined, report an error
             compiler_error(p, 2, f"Redefinition of function '{p[2]}'")
             compiler_note("Called from Functions._id")
-            sys.exit(1)
+            raise SemanticError()
 
         p.parser.functions_handler.add(p[2], False)
         p.parser.functions_handler.current_function = p.parser.functions_handler.get(p[2])
-        return std_message([f"{p[2].replace('_', '')}:"])
+        return p.parser.functions_handler.current_function
 
     def _body(self, p):  # Adds the body of a function
         """
         function_body : '{' stmts '}' es
         """
         p.parser.functions_handler.current_function.init = True
-        if not p[2].endswith("RETURN\n"):
-            if p.parser.functions_handler.current_function.output_type is not None:
-                compiler_warning(p, 3, f"Reached end of function {p.parser.functions_handler.current_function.name} without an explicit return statement.")
-                compiler_note("Called from Functions._body")
-            else:
-                p[2] += "RETURN\n"
-
-        out = p[2]
+        if not ast.ends_with_return(p[2]) and p.parser.functions_handler.current_function.output_type is not None:
+            compiler_warning(p, 3, f"Reached end of function {p.parser.functions_handler.current_function.name} without an explicit return statement.")
+            compiler_note("Called from Functions._body")
+
         p.parser.functions_handler.current_function = None
-        return out
+        return ast.Block(p[2], p[4])
 
     def _parameter(self, p):  # Adds a parameter to the function
         """
         param : ID ':' type
             | ID ':' Ptype
         """
-        p.parser.current_scope.add(p[1], p[3], (p.parser.frame_count, p.parser.frame_count))
+        meta = p.parser.current_scope.add(p[1], p[3], (p.parser.frame_count, p.parser.frame_count))
         p.parser.functions_handler.current_function.input_types.append(p[3])
         p.parser.frame_count += 1
         p.parser.num_params += 1
-        return std_message(["PUSHI 0", "PUSHFP", f"LOAD {-p.parser.num_params}", f"STOREL {p.parser.num_params-1}"])
+        return ast.Symbol(p[1], meta, True)
 
     def _argument(self, p):  # Adds an argument to the function
         """
@@ -127,27 +123,24 @@ class Functions:
             compiler_error(p, 2, f"Function '{p[1]}' not declared")
             compiler_note(f"Error on Function '{p.parser.functions_handler.current_function.name}'")
             compiler_note("Called from Functions._call")
-            sys.exit(1)
+            raise SemanticError()
         if len(func.input_types) != p.parser.num_args[-1]:  # If the number of arguments doesn't match the number of parameters, report an error
             compiler_error(p, 2, f"Function '{p[1]}' expects {len(func.input_types)} arguments but got {p.parser.num_args[-1]}")
             compiler_note(f"Error on Function '{p.parser.functions_handler.current_function.name}'")
             compiler_note("Called from Functions._call")
-            sys.exit(1)
+            raise SemanticError()
         if len(func.input_types) > 0 and func.input_types != p.parser.type_checker[-len(func.input_types):]:
             compiler_error(p, 2, f"Function '{p[1]}' expects {func.input_types} but got {p.parser.type_checker[-len(func.input_types):]}")
             compiler_note("Called from Functions._call")
-            sys.exit(1)
+            raise SemanticError()
         for _ in func.input_types:
             p.parser.type_checker.pop()
         if func.output_type is not None:
             p.parser.type_checker.push((func.output_type, p.lexer.lineno-1))
 
         p.parser.num_args.pop()
-        out = ""
-        if func.output_type is not None:
-            out = std_message(["PUSHI -69"])
-        out += p[3] + std_message([f"PUSHA {func.name.replace('_', '')}", "CALL", f"POP {len(func.input_types)}"])    # If the function exists, return the assembly code
-        return out
+        self.callees.add(func.name)
+        return ast.Call(func.output_type, func, p[3])
 
     def _return(self, p):
         """
@@ -160,16 +153,14 @@ class Functions:
                 compiler_error(p, 1, f"Return type '{expr}' doesn't match function output type '{p.parser.functions_handler.current_function.output_type}'")
                 compiler_note(f"Error on Function '{p.parser.functions_handler.current_function.name}'")
                 compiler_note("Called from Functions._return")
-                sys.exit(1)
+                raise SemanticError()
 
-            return p[2] + std_message([
-                f"STOREL {-len(p.parser.functions_handler.current_function.input_types)-1}",
-                "RETURN"])
+            return ast.Return(p[2])
 
         if p.parser.functions_handler.current_function.output_type is not None:
             compiler_error(p, 1, f"Return type '{p.parser.functions_handler.current_function.output_type}' doesn't match function output type 'None'")
             compiler_note(f"Error on Function '{p.parser.functions_handler.current_function.name}'")
             compiler_note("Called from Functions._return")
-            sys.exit(1)
+            raise SemanticError()
 
-        return std_message(["RETURN"])
\ No newline at end of file
+        return ast.Return()
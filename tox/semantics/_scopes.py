@@ -1,9 +1,7 @@
 from __future__ import annotations
-from typing import Optional, Dict, Tuple, List
+from typing import Optional, Dict, Tuple, List, Set
 from dataclasses import dataclass, field
 
-from tox import std_message
-
 
 @dataclass
 class MetaData:
@@ -32,6 +30,7 @@ class Scope:
     parent: Optional[Scope] = None
     in_function: bool = False
     Table: Dict[str, MetaData] = field(default_factory=dict)
+    accessed: Set[str] = field(default_factory=set)     # Variables of this scope that have been looked up
 
     def __post_init__(self):
         self.productions = {
@@ -43,8 +42,9 @@ class Scope:
         return self.productions[production](p)
 
 
-    def add(self, key: str, type: str, stack_position: Tuple[int, int], array_shape: Optional[List[int]] = None, p_init: bool = True): # Adds a variable to the scope
-        self.Table[key] = MetaData(type, stack_position, array_shape, p_init)
+    def add(self, key: str, type: str, stack_position: Tuple[int, int], array_shape: Optional[List[int]] = None, p_init: bool = True) -> MetaData: # Adds a variable to the scope
+        meta = self.Table[key] = MetaData(type, stack_position, array_shape, p_init)
+        return meta
 
     def get(self, key: str) -> Tuple[Optional[MetaData], bool]:
         """
@@ -52,7 +52,10 @@ class Scope:
         Also returns whether or not the variable is in a function as well as the name of the scope it is in.
         """
         if self.parent == None:
-            return self.Table.get(key), self.in_function, self.name
+            metadata = self.Table.get(key)
+            if metadata is not None:
+                self.accessed.add(key)
+            return metadata, self.in_function, self.name
 
         metadata = self.Table.get(key)
         if metadata is not None:
@@ -73,15 +76,17 @@ class Scope:
             in_function=False if p.parser.functions_handler.current_function is None else True
         )
 
-    def _end_scope(self, p):
+    def _end_scope(self, p) -> int:
         """
         es :
+
+        Returns the number of cells the variables of the scope take.
         """
+        size = p.parser.current_scope.num_alloced()
         if p.parser.functions_handler.current_function is not None:
-            p.parser.frame_count -= p.parser.current_scope.num_alloced() 
+            p.parser.frame_count -= size
         else:
-            p.parser.global_count -= p.parser.current_scope.num_alloced()
-        out = std_message([f"POP {p.parser.current_scope.num_alloced()}"])
+            p.parser.global_count -= size
         p.parser.current_scope = p.parser.current_scope.parent
-        return out
+        return size
 
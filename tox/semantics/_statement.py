@@ -1,8 +1,7 @@
 from copy import copy
 
-import sys
-
-from tox import compiler_error, compiler_note,  std_message
+from tox.utils.errors import SemanticError, compiler_error, compiler_note
+from tox.semantics import _ast as ast
 
 
 class IO:
@@ -26,54 +25,43 @@ class IO:
         """
         print : PRINT '(' multiple_prints ')'
         """
-        return p[3] # Whatever the multiple_prints production returns
+        return ast.Print(p[3])
 
     def _multiple(self, p) -> str: # printing many things
         """
         multiple_prints : multiple_prints ',' expression
         """
         top = p.parser.type_checker.pop() # Get the top of the stack
-        if top == "string": # If the top is a string, print it
-            push_op = std_message(["WRITES"])
-        elif top == "int": # If the top is an expression, print it
-            push_op = std_message(["WRITEI"])
-        elif top == "float": # If the top is an expression, print it
-            push_op = std_message(["WRITEF"])
-        elif top.startswith("&"):
+        if top not in ("string", "int", "float"):   # Arrays and pointers
             compiler_error(p, 2, f"Can't print array. Not implemented yet.")
             compiler_note("Called from Print._single")
-            sys.exit(1)
+            raise SemanticError()
 
-        return p[1] + p[3] + push_op # Whatever the multiple_prints production returns + the expression + the print operation
+        p[1].append(p[3])
+        return p[1]
 
     def _single(self, p) -> str: # printing a single thing
         """
         multiple_prints : expression
         """
-        top = p.parser.type_checker.pop() # Get the top of the stack<<
-        if top == "string": # If the top is a string, print it
-            push_op = std_message(["WRITES"])
-        elif top == "int": # If the top is an expression, print it
-            push_op = std_message(["WRITEI"])
-        elif top == "float": # If the top is an expression, print it
-            push_op = std_message(["WRITEF"])
-        elif top.startswith("&"):
+        top = p.parser.type_checker.pop() # Get the top of the stack
+        if top not in ("string", "int", "float"):   # Arrays and pointers
             compiler_error(p, 1, f"Can't print array. Not implemented yet.")
             compiler_note("Called from Print._single")
-            sys.exit(1)
-        return p[1] + push_op # Whatever the expression production returns + the print operation
+            raise SemanticError()
+        return [p[1]]
 
     def _empty(self, p) -> str: # printing nothing
         """
         multiple_prints :
         """
-        return ""
+        return []
 
     def _read(self, p):
         """
         read : read_type '(' multiple_prints ')'
         """
-        return p[3] + std_message(["READ"]) + p[1]
+        return ast.Read(p[1], p[3])
 
     def _read_type(self, p):
         """
@@ -81,16 +69,9 @@ class IO:
                 | READ_FLOAT
                 | READ_STRING
         """
-        if p[1][-1] == "i":
-            p.parser.type_checker.push(("int", p.lexer.lineno))
-            push_op = std_message(["ATOI"])
-        elif p[1][-1] == "f":
-            p.parser.type_checker.push(("float", p.lexer.lineno))
-            push_op = std_message(["ATOF"])
-        elif p[1][-1] == "s":
-            p.parser.type_checker.push(("string", p.lexer.lineno))
-            push_op = std_message([""])
-        return push_op
+        type = {"i": "int", "f": "float", "s": "string"}[p[1][-1]]
+        p.parser.type_checker.push((type, p.lexer.lineno))
+        return type
 
 
 class Assignment:
@@ -115,37 +96,25 @@ class Assignment:
         if id_meta is None: # If the variable doesn't exist, report an error
             compiler_error(p, 1, f"Assignment to undeclared variable {p[1]}")
             compiler_note("Called from Assignment._array_index")
-            sys.exit(1)
+            raise SemanticError()
         if not id_meta.type.startswith("vec") and not id_meta.type.startswith("&"):
             compiler_error(p, 1, f"Indexing not allowed on variable of type '{id_meta.type}'")
             compiler_note("Called from Assignment._array_index")
-            sys.exit(1)
+            raise SemanticError()
         if id_meta.type[1:] != expr and id_meta.type[4:-1] != expr:
-            compiler_error(p, 5, f"Assignment of '{expr}' to variable of type '{id_meta.type}'")
+            compiler_error(p, 4, f"Assignment of '{expr}' to variable of type '{id_meta.type}'")
             compiler_note("Called from Assignment._array_index")
-            sys.exit(1)
+            raise SemanticError()
         if len(p.parser.indexing_depth[-1]) > 1 and id_meta.type.startswith("&"):
             compiler_error(p, 1, f"Can't index pointer with more than one dimension")
             compiler_note("Called from Primary._indexing")
-            sys.exit(1)
+            raise SemanticError()
         if id_meta.array_shape and len(p.parser.indexing_depth[-1]) != len(id_meta.array_shape):
             compiler_error(p, 1, f"Assignment to arrays only allowed with the same number of dimensions. Expected {len(id_meta.array_shape)} got {len(p.parser.indexing_depth[-1])}")
             compiler_note("Called from Assignment._array_index")
-            sys.exit(1)
+            raise SemanticError()
 
-        push_op = "PUSHGP" if not in_function else "PUSHFP" # Get the correct push operation
-        if id_meta.type.startswith("vec"):
-            op = [push_op, f"PUSHI {id_meta.stack_position[0]}", "PADD"]
-            for i, expr in enumerate(p.parser.indexing_depth[-1]):
-                factor = ["PUSHI 1"]
-                for dim in id_meta.array_shape[i+1:]:
-                    factor += [f"PUSHI {dim}", "MUL"]
-                op += [expr] + factor + ["MUL", "PADD"]
-            p.parser.indexing_depth.pop()
-            return std_message(op + [f"{p[4]}STORE 0"])
-        elif id_meta.type.startswith("&"):
-            expr = p.parser.indexing_depth.pop()
-            return std_message([push_op, f"LOAD {id_meta.stack_position[0]}", f"{expr[0]}PADD", f"{p[4]}STORE 0"])
+        return ast.IndexAssign(ast.Symbol(p[1], id_meta, in_function), p.parser.indexing_depth.pop(), p[4])
 
     def _variable(self, p) -> str: # Assigning to a variable
         """
@@ -156,20 +125,19 @@ class Assignment:
         if id_meta is None: # If the variable doesn't exist, report an error
             compiler_error(p, 1, f"Assignment to undeclared variable {p[1]}")
             compiler_note("Called from Assignment._expression")
-            sys.exit(1)
+            raise SemanticError()
         if id_meta.type.startswith("vec"):
             compiler_error(p, 1, f"Assignment to array not allowed. Use indexing instead.")
             compiler_note("Called from Assignment._expression")
-            sys.exit(1)
+            raise SemanticError()
         if id_meta.type.startswith("&") and expr.startswith("vec") and id_meta.type[1:] == expr[4:-1]:
             pass # If ID is of type &T and expr is of type vec<T>, then it's fine
         elif id_meta.type != expr: # If the types don't match, report an error
             compiler_error(p, 1, f"Assignment of '{expr}' to variable of type '{id_meta.type}'")
             compiler_note("Called from Assignment._variable")
-            sys.exit(1)
+            raise SemanticError()
 
-        store_op = "STOREG" if not in_function else "STOREL"    # Get the correct store operation
-        return std_message([f"{p[3]}{store_op} {id_meta.stack_position[0]}"])
+        return ast.Assign(ast.Symbol(p[1], id_meta, in_function), p[3])
 
 
 class Declaration:
@@ -194,22 +162,17 @@ class Declaration:
         if p[1] in p.parser.current_scope.Table: # If the variable already exists in the current scope table, report an error
             compiler_error(p, 1, f"Variable {p[1]} is already defined")
             compiler_note("Called from Declaration._variable_declaration")
-            sys.exit(1)
+            raise SemanticError()
 
         p[3] = p[3].replace(" ", "") # Remove the spaces from the type
         if p.parser.current_scope.level == 0:   # If the variable is declared in the global scope, add it to the global scope
-            p.parser.current_scope.add(p[1], p[3], (p.parser.global_count, p.parser.global_count))
+            meta = p.parser.current_scope.add(p[1], p[3], (p.parser.global_count, p.parser.global_count))
             p.parser.global_count += 1
         else:   # If the variable is declared in a function scope, add it to the function scope
-            p.parser.current_scope.add(p[1], p[3], (p.parser.frame_count, p.parser.frame_count))
+            meta = p.parser.current_scope.add(p[1], p[3], (p.parser.frame_count, p.parser.frame_count))
             p.parser.frame_count += 1
 
-        if p[3] == 'int':
-            return std_message(["PUSHI 0"])
-        elif p[3] == 'float':
-            return std_message(["PUSHF 0.0"])
-        elif p[3] == 'string':
-            return std_message(['PUSHS ""'])
+        return ast.Declare(ast.Symbol(p[1], meta, p.parser.current_scope.level != 0))
 
     def _pointer_declaration(self, p):
         """
@@ -218,25 +181,17 @@ class Declaration:
         if p[1] in p.parser.current_scope.Table:
             compiler_error(p, 1, f"Variable {p[1]} is already defined")
             compiler_note("Called from Declaration._pointer_declaration")
-            sys.exit(1)
+            raise SemanticError()
 
         p[3] = p[3].replace(" ", "") # Remove the spaces from the type
         if p.parser.current_scope.level == 0:   # If the variable is declared in the global scope, add it to the global scope
-            push_op = std_message(["PUSHGP", f"PUSHI {p.parser.global_count}", "PADD"]) # Get the correct push operation
-            p.parser.current_scope.add(p[1], p[3], (p.parser.global_count, p.parser.global_count), False)
+            meta = p.parser.current_scope.add(p[1], p[3], (p.parser.global_count, p.parser.global_count), False)
             p.parser.global_count += 1
         else:   # If the variable is declared in a function scope, add it to the function scope
-            push_op = std_message(["PUSHFP", f"PUSHI {p.parser.frame_count}", "PADD"]) # Get the correct push operation
-            p.parser.current_scope.add(p[1], p[3], (p.parser.frame_count, p.parser.frame_count), False)
+            meta = p.parser.current_scope.add(p[1], p[3], (p.parser.frame_count, p.parser.frame_count), False)
             p.parser.frame_count += 1
 
-        # Uninitialized pointers point to themselves
-        if p[3] == '&int':
-            return push_op
-        elif p[3] == '&float':
-            return push_op
-        elif p[3] == '&string':
-            return push_op
+        return ast.Declare(ast.Symbol(p[1], meta, p.parser.current_scope.level != 0))  # Uninitialized pointers point to themselves
 
     def _array_declaration(self, p) -> str: # Declaring 0 initialized array of size INT
         """
@@ -245,32 +200,26 @@ class Declaration:
         if p[1] in p.parser.current_scope.Table:
             compiler_error(p, 1, f"Variable {p[1]} is already defined")
             compiler_note("Called from Declaration._array_declaration")
-            sys.exit(1)
+            raise SemanticError()
         for i, dim in enumerate(p.parser.arr_dim):
             if dim == 0:
                 compiler_error(p, 1, f"Array {p[1]} initialized with dimension of size 0 in dimension {i+1}")
                 compiler_note("Called from Declaration._array_declaration")
-                sys.exit(1)
+                raise SemanticError()
 
         array_size = 1
         for dim in p.parser.arr_dim:
             array_size *= dim
         p[3] = p[3].replace(" ", "") # Remove the spaces from the type
         if p.parser.current_scope.level == 0:   # If the variable is declared in the global scope, add it to the global scope
-            p.parser.current_scope.add(p[1], p[3], (p.parser.global_count, p.parser.global_count+array_size-1), array_shape=copy(p.parser.arr_dim))
+            meta = p.parser.current_scope.add(p[1], p[3], (p.parser.global_count, p.parser.global_count+array_size-1), array_shape=copy(p.parser.arr_dim))
             p.parser.global_count += array_size
         else:   # If the variable is declared in a function scope, add it to the function scope
-            p.parser.current_scope.add(p[1], p[3], (p.parser.frame_count, p.parser.frame_count+array_size-1), array_shape=copy(p.parser.arr_dim))
+            meta = p.parser.current_scope.add(p[1], p[3], (p.parser.frame_count, p.parser.frame_count+array_size-1), array_shape=copy(p.parser.arr_dim))
             p.parser.frame_count += array_size
 
         p.parser.arr_dim = [] # Reset the array dimension
-        if p[3] == 'vec<int>':
-            return std_message([f"PUSHN {array_size}"])
-        elif p[3] == 'vec<float>':
-            return std_message([f"PUSHF 0.0" for i in range(array_size)])
-        elif p[3] == 'vec<string>':
-            return std_message([f"PUSHS ''" for i in range(array_size)])
-        assert False, "Invalid type in Declaration._array_declaration"
+        return ast.Declare(ast.Symbol(p[1], meta, p.parser.current_scope.level != 0))
 
     def _array_dimension(self, p) -> str:
         """
@@ -308,7 +257,7 @@ class DeclarationAssignment:
         if p[1] in p.parser.current_scope.Table:    # If the variable already exists in the current scope table, report an error
             compiler_error(p, 1, f"Variable {p[1]} is already defined")
             compiler_note("Called from DeclarationAssignment._array_literal_init")
-            sys.exit(1)
+            raise SemanticError()
         array_shape = [p.parser.array_assign_items]
         if len(p) == 9:
             array_size = 1
@@ -318,24 +267,24 @@ class DeclarationAssignment:
             if array_size != p.parser.array_assign_items:
                 compiler_error(p, 1, f"Initialization of array of type '{p[3]}' with {p.parser.array_assign_items} items. Expected {array_size}")
                 compiler_note("Called from DeclarationAssignment._array_literal_init")
-                sys.exit(1)
+                raise SemanticError()
         for i in range(p.parser.array_assign_items):
             item = p.parser.type_checker.pop()
             if item != p[3][4:-1]:
                 compiler_error(p, 5, f"Initialization of array of type '{p[3]}' with item of type '{item}'. Look at item {p.parser.array_assign_items-i}")
                 compiler_note("Called from DeclarationAssignment._array_literal_init")
-                sys.exit(1)
+                raise SemanticError()
 
         p[3] = p[3].replace(" ", "") # Remove the spaces from the type
         if p.parser.current_scope.level == 0:   # If the variable is declared in the global scope, add it to the global scope
-            p.parser.current_scope.add(p[1], p[3], (p.parser.global_count, p.parser.global_count+p.parser.array_assign_items-1), array_shape=copy(array_shape))
+            meta = p.parser.current_scope.add(p[1], p[3], (p.parser.global_count, p.parser.global_count+p.parser.array_assign_items-1), array_shape=copy(array_shape))
             p.parser.global_count += p.parser.array_assign_items
         else:   # If the variable is declared in a function scope, add it to the function scope
-            p.parser.current_scope.add(p[1], p[3], (p.parser.frame_count, p.parser.frame_count+p.parser.array_assign_items-1), array_shape=copy(array_shape))
+            meta = p.parser.current_scope.add(p[1], p[3], (p.parser.frame_count, p.parser.frame_count+p.parser.array_assign_items-1), array_shape=copy(array_shape))
             p.parser.frame_count += p.parser.array_assign_items
         p.parser.arr_dim = [] # Reset the array dimension
         p.parser.array_assign_items = 0 # Reset the array assign items counter
-        return p[len(p)-2]
+        return ast.ArrayInit(ast.Symbol(p[1], meta, p.parser.current_scope.level != 0), p[len(p)-2])
 
     def _array_range_init(self, p) -> str: # Declaring and initializing an array with a range TODO: turn int into expression if possible
         """
@@ -344,23 +293,23 @@ class DeclarationAssignment:
         if p[1] in p.parser.current_scope.Table:    # If the variable already exists in the current scope table, report an error
             compiler_error(p, 1, f"Variable {p[1]} is already defined")
             compiler_note("Called from DeclarationAssignment._array_range_init")
-            sys.exit(1)
+            raise SemanticError()
         if p[3] != 'vec<int>':    # If the variable is not an integer array, report an error
             compiler_error(p, 1, f"Array of type '{p[3]}' cannot be initialized with a range")
             compiler_note("Called from DeclarationAssignment._array_range_init")
-            sys.exit(1)
+            raise SemanticError()
 
         start = int(p[6])
         end = int(p[8])
         p[3] = p[3].replace(" ", "") # Remove the spaces from the type
         if p.parser.current_scope.level == 0:   # If the variable is declared in the global scope, add it to the global scope
-            p.parser.current_scope.add(p[1], p[3], (p.parser.global_count, p.parser.global_count+end-start), array_shape=[end-start+1])
+            meta = p.parser.current_scope.add(p[1], p[3], (p.parser.global_count, p.parser.global_count+end-start), array_shape=[end-start+1])
             p.parser.global_count += end-start + 1
         else:   # If the variable is declared in a function scope, add it to the function scope
-            p.parser.current_scope.add(p[1], p[3], (p.parser.frame_count, p.parser.frame_count+end-start), array_shape=[end-start+1])
+            meta = p.parser.current_scope.add(p[1], p[3], (p.parser.frame_count, p.parser.frame_count+end-start), array_shape=[end-start+1])
             p.parser.frame_count += end-start + 1
 
-            return std_message([f"PUSHI {i}" for i in range(start, end + 1)])
+        return ast.RangeInit(ast.Symbol(p[1], meta, p.parser.current_scope.level != 0), start, end)
 
     def _pointer_init(self, p) -> str: # Declaring and initializing a pointer
         """
@@ -370,21 +319,21 @@ class DeclarationAssignment:
         if p[1] in p.parser.current_scope.Table:    # If the variable already exists in the current scope table, report an error
             compiler_error(p, 1, f"Variable {p[1]} is already defined")
             compiler_note("Called from DeclarationAssignment._pointer_init")
-            sys.exit(1)
+            raise SemanticError()
         if not expr.startswith("vec") and expr != p[3]: # Cam only assign vectors and pointers to pointer
             compiler_error(p, 5, f"Initialization of pointer of type '{p[3]}' with expression of type '{expr}'")
             compiler_note("Called from DeclarationAssignment._pointer_init")
-            sys.exit(1)
+            raise SemanticError()
 
         p[3] = p[3].replace(" ", "") # Remove the spaces from the type
         if p.parser.current_scope.level == 0:
-            p.parser.current_scope.add(p[1], p[3], (p.parser.global_count, p.parser.global_count))
+            meta = p.parser.current_scope.add(p[1], p[3], (p.parser.global_count, p.parser.global_count))
             p.parser.global_count += 1
         else:
-            p.parser.current_scope.add(p[1], p[3], (p.parser.frame_count, p.parser.frame_count))
+            meta = p.parser.current_scope.add(p[1], p[3], (p.parser.frame_count, p.parser.frame_count))
             p.parser.frame_count += 1
 
-        return p[5]
+        return ast.Init(ast.Symbol(p[1], meta, p.parser.current_scope.level != 0), p[5])
 
     def _variable_init(self, p) -> str:     # Declaring and initializing a variable
         """
@@ -394,21 +343,21 @@ class DeclarationAssignment:
         if p[1] in p.parser.current_scope.Table:    # If the variable already exists in the current scope table, report an error
             compiler_error(p, 1, f"Redeclaration of variable '{p[1]}'")
             compiler_note("Called from DeclarationAssignment._variable_init")
-            sys.exit(1)
+            raise SemanticError()
         if p[3] != expr:    # If the variable type and the expression type do not match, report an error
             compiler_error(p, 4, f"Initialization of variable of type '{p[3]}' with expression of type '{expr}'")
             compiler_note("Called from DeclarationAssignment._variable_init")
-            sys.exit(1)
+            raise SemanticError()
 
         p[3] = p[3].replace(" ", "") # Remove the spaces from the type
         if p.parser.current_scope.level == 0:   # If the variable is declared in the global scope, add it to the global scope
-            p.parser.current_scope.add(p[1], p[3], (p.parser.global_count, p.parser.global_count))
+            meta = p.parser.current_scope.add(p[1], p[3], (p.parser.global_count, p.parser.global_count))
             p.parser.global_count += 1  # Increment the global count
         else:   # If the variable is declared in a function scope, add it to the function scope
-            p.parser.current_scope.add(p[1], p[3], (p.parser.frame_count, p.parser.frame_count))
+            meta = p.parser.current_scope.add(p[1], p[3], (p.parser.frame_count, p.parser.frame_count))
             p.parser.frame_count += 1   # Increment the frame count
 
-        return p[5]
+        return ast.Init(ast.Symbol(p[1], meta, p.parser.current_scope.level != 0), p[5])
 
     def _array_items(self, p) -> str:  # Handles the array items
         """
@@ -417,8 +366,9 @@ class DeclarationAssignment:
         """
         p.parser.array_assign_items += 1    # Increment the array assign items counter
         if len(p) == 4:
-            return p[1] + p[3]
-        return p[1]
+            p[1].append(p[3])
+            return p[1]
+        return [p[1]]
 
 
 class If:
@@ -443,58 +393,34 @@ class If:
         if expr != 'int':
             compiler_error(p, 1, f"Condition type must be 'int', not '{expr}'")
             compiler_note("Called from If._if")
-            sys.exit(1)
-
-        current_if_count = p.parser.if_count                        # Get the current if count
-        out = p[2]                                                  # Push condition to the stack
-        out += std_message([f"JZ IFLABEL{current_if_count}END"])    # Jump to the end label if the expression is false
-        out += p[5]                                                 # Push the statements
-        out += p[7]                                                 # Get out of if scope
-        out += std_message([f"JUMP FINISHIF{p.parser.rel_if_count}"])  # Skip the else if statements
-        out += std_message([f"IFLABEL{current_if_count}END:"])      # Add the end label
-        out += p[8]                                                 # Push the else if statements
-        p.parser.if_count += 1                                      # Increment the if count
 
-        return out
+        branches, orelse = p[8]
+        return ast.If([(p[2], ast.Block(p[5], p[7]))] + branches, orelse)
 
     def _else_if(self, p) -> str:
         """
         else_if : ELSE IF expression ss '{' stmts '}' es else_if
                 | else
+
+        Returns the else if branches and the else block.
         """
-        if len(p) == 2: return p[1] # There are no else if's
+        if len(p) == 2: return [], p[1] # There are no else if's
 
         expr = p.parser.type_checker.pop()
         if expr != 'int':
             compiler_error(p, 2, f"Condition type must be 'int', not '{expr}'")
             compiler_note("Called from If._if_else")
-            sys.exit(1)
-
-        current_if_count = p.parser.if_count                                # Get the current if count
-        out = p[3]                                                          # Push condition to the stack
-        out += std_message([f"JZ ELSEIFLABEL{current_if_count}END"])        # Jump to the end of this else if if the expression is false
-        out += p[6]                                                         # Push the statements
-        out += p[8]                                                         # Get out of else if scope
-        out += std_message([f"JUMP FINISHIF{p.parser.rel_if_count}"])       # Skip the else if statements
-        out += std_message([f"ELSEIFLABEL{current_if_count}END:"])          # Add the end else if label
-        out += p[9]                                                         # Push the else if statements
-        p.parser.if_count += 1                                              # Increment the if count
 
-        return out
+        branches, orelse = p[9]
+        return [(p[3], ast.Block(p[6], p[8]))] + branches, orelse
 
     def _else(self, p) -> str:
         """
         else : ELSE ss '{' stmts '}' es
             |
         """
-        p.parser.rel_if_count += 1                                      # Increment the relative if count
-        if len(p) == 1: return std_message([f"FINISHIF{p.parser.rel_if_count}:"])    # If there is no else, return an empty string
-
-        out = p[4]                                                      # Push the statements
-        out += p[6]                                                     # Get out of else scope
-        out += std_message([f"FINISHIF{p.parser.rel_if_count}:"])       # Add the finish if label
-
-        return out
+        if len(p) == 1: return None  # There is no else
+        return ast.Block(p[4], p[6])
 
 
 class Match:
@@ -519,58 +445,38 @@ class Match:
         if expr == 'string': # Strings cannot be compared
             compiler_error(p, 3, "Cannot use 'match' with 'string' type")
             compiler_note("Called from match._match")
-            sys.exit(1)
         p.parser.type_checker.push((expr, p.lexer.lineno))                # Push the expression type back on the stack
 
-        current_match_count = p.parser.match_count                        # Get the current match count
-        out = p[2]                                                      # Push the expression to the stack
-        out += p[4]                                                     # Push the cases
-        out += std_message(["POP 1"])                                     # Pop the expression off the stack
-        p.parser.match_count += 1                                        # Increment the match count
-
         p.parser.frame_count -= 1                                      # Decrement the global count
         p.parser.type_checker.pop()                                     # Pop the case type off the stack
-        return out
+        cases, default = p[4]
+        return ast.Match(p[2], cases, default)
 
     def _cases(self, p) -> str:
         """
         cases : expression RARROW ss '{' stmts '}' es cases
             | default
+
+        Returns the cases and the default block.
         """
-        if len(p) == 2: return p[1] # There are no cases
+        if len(p) == 2: return [], p[1] # There are no cases
 
         expr = p.parser.type_checker.pop()
         case = p.parser.type_checker.pop()
         if expr != case:
             compiler_error(p, 2, f"Incompatible types in 'match' statement. Expected '{case}', got '{expr}'")
             compiler_note("Called from match._cases")
-            sys.exit(1)
         p.parser.type_checker.push((case, p.lexer.lineno))                # Push the case type back on the stack
 
-        current_match_count = p.parser.match_count                        # Get the current match count
-        out = std_message(["DUP 1", p[1], "EQUAL"])                     # Compare the case to the expression
-        out += std_message([f"JZ matchLABEL{current_match_count}END"])    # Jump to the end label if the expression is false
-        out += p[5]                                                     # Push the statements
-        out += p[7]                                                     # Get out of match scope
-        out += std_message([f"JUMP FINISHmatch{p.parser.rel_match_count}"])  # Skip all the other cases
-        out += std_message([f"matchLABEL{current_match_count}END:"])      # Add the end label
-        out += p[8]                                                     # Push the other cases
-        p.parser.match_count += 1                                        # Increment the match count
-
-        return out
+        cases, default = p[8]
+        return [(p[1], ast.Block(p[5], p[7]))] + cases, default
 
 
     def _default(self, p) -> str:
         """
         default : DEFAULT RARROW ss '{' stmts '}' es
         """
-        p.parser.rel_match_count += 1                                    # Increment the relative if count
-
-        out = p[5]                                                      # Push the statements
-        out += p[7]                                                     # Get out of else scope
-        out += std_message([f"FINISHmatch{p.parser.rel_match_count}:"])   # Add the finish if label
-
-        return out
+        return ast.Block(p[5], p[7])
 
 class Loop:
     """
@@ -598,21 +504,9 @@ class Loop:
         if expr != 'int':
             compiler_error(p, 1, f"Condition type must be 'int', not '{expr}'")
             compiler_note("Called from Loop._while")
-            sys.exit(1)
-
-        current_while_count = p.parser.loop_count
-        out = std_message([f"LOOP{current_while_count}START:"])             # Start of the while loop
-        out += p[2]                                                         # Condition
-        out += std_message([f"JZ LOOP{current_while_count}END"])            # End of the while loop
-        out += p[5]                                                         # Perform the statements
-        out += std_message([f"NEXTLOOP{current_while_count}:"])
-        out += p[7]                                                         # Close the scope
-        out += std_message([f"JUMP LOOP{current_while_count}START"])        # Jump to start of the while loop
-        out += std_message([f"LOOP{current_while_count}END:"])              # End of the while loop
-        p.parser.loop_count += 1                                            # Increment the loop count
-        p.parser.current_loops.pop()                                        # Pop the current loop off the stack
 
-        return out
+        p.parser.current_loops.pop()                                        # Pop the current loop off the stack
+        return ast.While(p[2], ast.Block(p[5], p[7]))
 
     def _do_while(self, p) -> str:
         """
@@ -622,21 +516,9 @@ class Loop:
         if expr != 'int':
             compiler_error(p, 1, f"Condition type must be 'int', not '{expr}'")
             compiler_note("Called from Loop._do_while")
-            sys.exit(1)
-
-        current_do_while_count = p.parser.loop_count
-        out = std_message([f"LOOP{current_do_while_count}START:"])          # Start of the do while loop
-        out += p[4]                                                         # Perform the statements
-        out += std_message([f"NEXTLOOP{current_do_while_count}:"])          # Next loop label (continue statement jumps here)
-        out += p[6]                                                         # Close the scope
-        out += p[9]                                                         # Condition
-        out += std_message([f"JZ LOOP{current_do_while_count}END"])         # Jump to end of do while loop if condition is false
-        out += std_message([f"JUMP LOOP{current_do_while_count}START"])     # Jump to start of do while loop
-        out += std_message([f"LOOP{current_do_while_count}END:"])           # End of the do while loop
-        p.parser.loop_count += 1                                            # Increment the loop count
-        p.parser.current_loops.pop()                                        # Pop the current loop off the stack
 
-        return out
+        p.parser.current_loops.pop()                                        # Pop the current loop off the stack
+        return ast.DoWhile(ast.Block(p[4], p[6]), p[9])
 
     def _for(self, p) -> str:
         """
@@ -646,24 +528,9 @@ class Loop:
         if expr != 'int':
             compiler_error(p, 1, f"Condition type must be 'int', not '{expr}'")
             compiler_note("Called from Loop._for")
-            sys.exit(1)
-
-        current_for = p.parser.loop_count
-        out =  p[4]                                             # Perform the for_inits
-        out += std_message([f"LOOP{current_for}START:"])        # Start of the for loop
-        out += p[6]                                             # Condition
-        out += std_message([f"JZ LOOP{current_for}END"])        # Jump to end of for loop if condition is false
-        out += p[12]                                            # Execute the for loop
-        out += std_message([f"NEXTLOOP{current_for}:"])         # Next loop label (continue statements jump here)
-        out += p[8]                                             # Perform the for_updates
-        out += p[14]                                            # Close the for_inner scope             
-        out += std_message([f"JUMP LOOP{current_for}START"])    # Jump back to the start of the for loop
-        out += std_message([f"LOOP{current_for}END:"])          # End of the for loop
-        out += p[15]                                            # Close the for_outer scope
-        p.parser.loop_count += 1                                # Increment the loop count
-        p.parser.current_loops.pop()                            # Pop the current loop off the stack
 
-        return out
+        p.parser.current_loops.pop()                            # Pop the current loop off the stack
+        return ast.For(p[4], p[6], p[8], ast.Block(p[12], p[14]), p[15])
 
     def __for_updates(self, p) -> str: # Handle all the for updates
         """
@@ -671,9 +538,10 @@ class Loop:
                 | for_update
         """
         if len(p) == 4:
-            return p[1] + p[3]
-        else:
+            p[1].append(p[3])
             return p[1]
+        else:
+            return [p[1]]
 
     def __for_update(self, p) -> str:
         """
@@ -687,9 +555,11 @@ class Loop:
             | for_init
         """
         if len(p) == 4:
-            return p[1] + p[3]
-        else:
+            if p[3] is not None:
+                p[1].append(p[3])
             return p[1]
+        else:
+            return [p[1]] if p[1] is not None else []
 
     def __for_init(self, p) -> str:
         """
@@ -701,7 +571,7 @@ class Loop:
         if len(p) == 2:
             return p[1]
         else:
-            return ""
+            return None # Nothing to initialize
 
 
 class BreakContinue:
@@ -724,9 +594,9 @@ class BreakContinue:
         if len(p.parser.current_loops) == 0:
             compiler_error(p, 1, "'break' statement not allowed outside of a loop")
             compiler_note("Called from BreakContinue._break.")
-            sys.exit(1)
+            raise SemanticError()
 
-        return std_message([f"JUMP LOOP{p.parser.loop_count}END"])
+        return ast.Break()
 
     def _continue(self, p) -> str: # Handle the continue statement
         """
@@ -735,10 +605,10 @@ class BreakContinue:
         if len(p.parser.current_loops) == 0:
             compiler_error(p, 1, "'continue' statement not allowed outside of a loop")
             compiler_note("Called from BreakContinue._break.")
-            sys.exit(1)
+            raise SemanticError()
         if p.parser.current_loops[-1] == "DO":
             compiler_error(p, 1, "'continue' statement not allowed inside of do-while loop")
             compiler_note("Called from BreakContinue._break.")
-            sys.exit(1)
+            raise SemanticError()
 
-        return std_message([f"JUMP NEXTLOOP{p.parser.loop_count}"])
\ No newline at end of file
+        return ast.Continue()
\ No newline at end of file
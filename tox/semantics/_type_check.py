@@ -1,9 +1,8 @@
 from typing import List, Tuple
 from dataclasses import dataclass, field
 
-import sys
-
-from tox import compiler_error, std_message
+from tox.utils.errors import SemanticError, compiler_error
+from tox.semantics import _ast as ast
 
 @dataclass
 class TypeCheck:
@@ -53,10 +52,10 @@ class TypeCheck:
         right_operand = self.pop()
         if right_operand in ("int", "float"):
             self.push((right_operand, p.lexer.lineno))
-            return p[2] + std_message(["NOT"])
+            return ast.Unary(right_operand, "not", p[2])
         else:
             compiler_error(p, 2, f"Operation 'not' not supported for type '{right_operand}'")
-            sys.exit(1)
+            raise SemanticError()
 
     def _neg(self, p):
         """
@@ -65,13 +64,13 @@ class TypeCheck:
         right_operand = self.pop()
         if right_operand == "int":
             self.push(("int", p.lexer.lineno))
-            return p[2] + std_message(["PUSHI -1", "MUL"])
+            return ast.Unary("int", "neg", p[2])
         elif right_operand == "float":
             self.push(("float", p.lexer.lineno))
-            return p[2] + std_message(["PUSHF -1.0", "FMUL"])
+            return ast.Unary("float", "neg", p[2])
         else:
             compiler_error(p, 2, f"Operation 'neg' not supported for type '{right_operand}'")
-            sys.exit(1)
+            raise SemanticError()
 
     def _mul(self, p):
         """
@@ -81,13 +80,13 @@ class TypeCheck:
         left_operand = self.pop()
         if right_operand == left_operand == "int":
             self.push(("int", p.lexer.lineno))
-            return p[1] + p[3] + std_message(["MUL"])
+            return ast.Binary("int", "mul", p[1], p[3])
         elif right_operand == left_operand == "float":
             self.push(("float", p.lexer.lineno))
-            return p[1] + p[3] + std_message(["FMUL"])
+            return ast.Binary("float", "mul", p[1], p[3])
         else:
             compiler_error(p, 2, f"Operation 'mul' not supported for types '{left_operand}' and '{right_operand}'")
-            sys.exit(1)
+            raise SemanticError()
 
     def _div(self, p):
         """
@@ -97,13 +96,13 @@ class TypeCheck:
         left_operand = self.pop()
         if right_operand == left_operand == "int":
             self.push(("int", p.lexer.lineno))
-            return p[1] + p[3] + std_message(["DIV"])
+            return ast.Binary("int", "div", p[1], p[3])
         elif right_operand == left_operand == "float":
             self.push(("float", p.lexer.lineno))
-            return p[1] + p[3] + std_message(["FDIV"])
+            return ast.Binary("float", "div", p[1], p[3])
         else:
             compiler_error(p, 2, f"Operation 'div' not supported for types '{left_operand}' and '{right_operand}'")
-            sys.exit(1)
+            raise SemanticError()
 
     def _mod(self, p):
         """
@@ -113,10 +112,10 @@ class TypeCheck:
         left_operand = self.pop()
         if right_operand == left_operand == "int":
             self.push(("int", p.lexer.lineno))
-            return p[1] + p[3] + std_message(["MOD"])
+            return ast.Binary("int", "mod", p[1], p[3])
         else:
             compiler_error(p, 2, f"Operation 'mod' not supported for types '{left_operand}' and '{right_operand}'")
-            sys.exit(1)
+            raise SemanticError()
 
     def _add(self, p):
         """
@@ -127,19 +126,19 @@ class TypeCheck:
         assert not left_operand.startswith("vec"), "vector type cannot appear in this stage"
         if right_operand == left_operand == "int":
             self.push(("int", p.lexer.lineno))
-            return p[1] + p[3] + std_message(["ADD"])
+            return ast.Binary("int", "add", p[1], p[3])
         elif right_operand == left_operand == "float":
             self.push(("float", p.lexer.lineno))
-            return p[1] + p[3] + std_message(["FADD"])
+            return ast.Binary("float", "add", p[1], p[3])
         elif left_operand.startswith("&") and right_operand == "int":
             self.push((left_operand, p.lexer.lineno))
-            return p[1] + p[3] + std_message(["PADD"])
+            return ast.Binary(left_operand, "add", p[1], p[3])
         elif right_operand == left_operand == "string":
             self.push(("string", p.lexer.lineno))
-            return p[3] + p[1] + std_message(["CONCAT"])
+            return ast.Binary("string", "add", p[1], p[3])
         else:
             compiler_error(p, 2, f"Operation 'add' not supported for types '{left_operand}' and '{right_operand}'")
-            sys.exit(1)
+            raise SemanticError()
 
     def _sub(self, p):
         """
@@ -150,16 +149,16 @@ class TypeCheck:
         assert not left_operand.startswith("vec"), "vector type cannot appear in this stage"
         if (right_operand, left_operand) in [("int", "int"), ("&int", "&int")]:
             self.push(("int", p.lexer.lineno))
-            return p[1] + p[3] + std_message(["SUB"])
+            return ast.Binary("int", "sub", p[1], p[3])
         elif right_operand == left_operand == "float":
             self.push(("float", p.lexer.lineno))
-            return p[1] + p[3] + std_message(["FSUB"])
+            return ast.Binary("float", "sub", p[1], p[3])
         elif left_operand.startswith("&") and right_operand == "int":
             self.push((left_operand, p.lexer.lineno))
-            return p[1] + p[3] + std_message(["PUSHI -1", "MUL", "PADD"])
+            return ast.Binary(left_operand, "sub", p[1], p[3])
         else:
             compiler_error(p, 2, f"Operation 'sub' not supported for types '{left_operand}' and '{right_operand}'")
-            sys.exit(1)
+            raise SemanticError()
 
     def _lt(self, p):
         """
@@ -168,15 +167,12 @@ class TypeCheck:
         right_operand = self.pop()
         left_operand = self.pop()
         assert not left_operand.startswith("vec"), "vector type cannot appear in this stage"
-        if right_operand == left_operand and left_operand not in ("string", "float"):
-            self.push(("int", p.lexer.lineno))
-            return p[1] + p[3] + std_message(["INF"])
-        elif right_operand == left_operand == "float":
+        if right_operand == left_operand and left_operand != "string":
             self.push(("int", p.lexer.lineno))
-            return p[1] + p[3] + std_message(["FINF", "FTOI"])
+            return ast.Binary("int", "lt", p[1], p[3])
         else:
             compiler_error(p, 2, f"Operation 'lt' not supported for types '{left_operand}' and '{right_operand}'")
-            sys.exit(1)
+            raise SemanticError()
 
     def _gt(self, p):
         """
@@ -185,15 +181,12 @@ class TypeCheck:
         right_operand = self.pop()
         left_operand = self.pop()
         assert not left_operand.startswith("vec"), "vector type cannot appear in this stage"
-        if right_operand == left_operand and left_operand not in ("string", "float"):
-            self.push(("int", p.lexer.lineno))
-            return p[1] + p[3] + std_message(["SUP"])
-        elif right_operand == left_operand == "float":
+        if right_operand == left_operand and left_operand != "string":
             self.push(("int", p.lexer.lineno))
-            return p[1] + p[3] + std_message(["FSUP", "FTOI"])
+            return ast.Binary("int", "gt", p[1], p[3])
         else:
             compiler_error(p, 2, f"Operation 'gt' not supported for types '{left_operand}' and '{right_operand}'")
-            sys.exit(1)
+            raise SemanticError()
 
     def _lte(self, p):
         """
@@ -202,15 +195,12 @@ class TypeCheck:
         right_operand = self.pop()
         left_operand = self.pop()
         assert not left_operand.startswith("vec"), "vector type cannot appear in this stage"
-        if right_operand == left_operand and left_operand not in ("string", "float"):
-            self.push(("int", p.lexer.lineno))
-            return p[1] + p[3] + std_message(["INFEQ"])
-        elif right_operand == left_operand == "float":
+        if right_operand == left_operand and left_operand != "string":
             self.push(("int", p.lexer.lineno))
-            return p[1] + p[3] + std_message(["FINFEQ", "FTOI"])
+            return ast.Binary("int", "lte", p[1], p[3])
         else:
             compiler_error(p, 2, f"Operation 'lte' not supported for types '{left_operand}' and '{right_operand}'")
-            sys.exit(1)
+            raise SemanticError()
 
     def _gte(self, p):
         """
@@ -219,15 +209,12 @@ class TypeCheck:
         right_operand = self.pop()
         left_operand = self.pop()
         assert not left_operand.startswith("vec"), "vector type cannot appear in this stage"
-        if right_operand == left_operand and left_operand not in ("string", "float"):
-            self.push(("int", p.lexer.lineno))
-            return p[1] + p[3] + std_message(["SUPEQ"])
-        elif right_operand == left_operand == "float":
+        if right_operand == left_operand and left_operand != "string":
             self.push(("int", p.lexer.lineno))
-            return p[1] + p[3] + std_message(["FSUPEQ", "FTOI"])
+            return ast.Binary("int", "gte", p[1], p[3])
         else:
             compiler_error(p, 2, f"Operation 'gte' not supported for types '{left_operand}' and '{right_operand}'")
-            sys.exit(1)
+            raise SemanticError()
 
     def _eq(self, p):
         """
@@ -238,10 +225,10 @@ class TypeCheck:
         assert not left_operand.startswith("vec"), "vector type cannot appear in this stage"
         if right_operand == left_operand and left_operand != "string":
             self.push(("int", p.lexer.lineno))
-            return p[1] + p[3] + std_message(["EQUAL"])
+            return ast.Binary("int", "eq", p[1], p[3])
         else:
             compiler_error(p, 2, f"Operation 'eq' not supported for types '{left_operand}' and '{right_operand}'")
-            sys.exit(1)
+            raise SemanticError()
 
     def _neq(self, p):
         """
@@ -252,10 +239,10 @@ class TypeCheck:
         assert not left_operand.startswith("vec"), "vector type cannot appear in this stage"
         if right_operand == left_operand and left_operand != "string":
             self.push(("int", p.lexer.lineno))
-            return p[1] + p[3] + std_message(["EQUAL", "NOT"])
+            return ast.Binary("int", "neq", p[1], p[3])
         else:
             compiler_error(p, 2, f"Operation 'neq' not supported for types '{left_operand}' and '{right_operand}'")
-            sys.exit(1)
+            raise SemanticError()
 
     def _and(self, p):
         """
@@ -266,10 +253,10 @@ class TypeCheck:
         assert not left_operand.startswith("vec"), "vector type cannot appear in this stage"
         if right_operand == left_operand == "int":
             self.push(("int", p.lexer.lineno))
-            return p[1] + p[3] + std_message(["AND"])
+            return ast.Binary("int", "and", p[1], p[3])
         else:
             compiler_error(p, 2, f"Operation 'and' not supported for types '{left_operand}' and '{right_operand}'")
-            sys.exit(1)
+            raise SemanticError()
 
     def _or(self, p):
         right_operand = self.pop()
@@ -277,40 +264,21 @@ class TypeCheck:
         assert not left_operand.startswith("vec"), "vector type cannot appear in this stage"
         if right_operand == left_operand == "int":
             self.push(("int", p.lexer.lineno))
-            return p[1] + p[3] + std_message(["OR"])
+            return ast.Binary("int", "or", p[1], p[3])
         else:
             compiler_error(p, 2, f"Operation 'or' not supported for types '{left_operand}' and '{right_operand}'")
-            sys.exit(1)
-
-    @staticmethod
-    def _get_first_part_of_casting(type: str):
-        if type == "int":
-            return "ITO"
-        elif type == "float":
-            return "FTO"
-        elif type == "string":
-            return "ATO"
-
-    @staticmethod
-    def _get_second_part_of_casting(type: str):
-        if type == "int":
-            return "I"
-        elif type == "float":
-            return "F"
-        elif type == "string":
-            return "A"
+            raise SemanticError()
 
     def _cast(self, p):
         """
         unary : '(' type ')' unary
         """
         expr_type = self.pop()
+        if expr_type not in ("int", "float", "string"):
+            compiler_error(p, 2, f"Cast from '{expr_type}' to '{p[2]}' not supported")
+            raise SemanticError()
 
+        self.push((p[2], p.lexer.lineno))
         if expr_type == p[2]:
-            self.push((expr_type, p.lexer.lineno))
             return p[4]
-
-        cast_expr = self._get_first_part_of_casting(expr_type) + self._get_second_part_of_casting(p[2])
-
-        self.push((p[2], p.lexer.lineno))
-        return p[4] + std_message([cast_expr])
\ No newline at end of file
+        return ast.Cast(p[2], p[4])
@@ -0,0 +1,106 @@
+from typing import Dict, Optional
+
+import os
+import sys
+import json
+import signal
+import socket
+import tempfile
+import subprocess
+
+from tox.utils.colors import *
+
+# Requests and responses are single JSON objects, one per line. A request looks like
+#   {"op": "build", "source": "...", "filename": "a.tox", "options": {"max_errors": 20, "peephole": false}}
+#   {"op": "run", "source": "...", "filename": "a.tox", "stdin": "..."}
+# and gets back
+#   {"ok": true, "code": "...", "diagnostics": ["..."]}
+# "options" holds any field of CompileOptions but the filename (see CompileOptions.settings), max_errors
+# included, and the ones left out keep their default. "run" requests also get the "stdout", "stderr" and
+# "returncode" of the program.
+
+def default_socket_path() -> str:
+    """
+    Return the socket the compile server listens on.
+    """
+    return os.environ.get("TOX_SOCKET") or os.path.join(tempfile.gettempdir(), f"tox-{os.getuid()}.sock")
+
+def handle_request(request: Dict) -> Dict:
+    """
+    Compile (and optionally run) a single request. Each request gets its own compilation context.
+    """
+    from tox.parsing._compiler import compile_source, CompileOptions
+
+    op = request.get("op", "build")
+    if op == "ping":
+        return {"ok": True}
+    if op not in ("build", "run"):
+        return {"ok": False, "diagnostics": [f"Unknown operation '{op}'"]}
+
+    options = CompileOptions(filename=request.get("filename", "<string>"), **request.get("options", {}))
+    result = compile_source(request.get("source", ""), options)
+    response = {"ok": result.ok, "code": result.code, "diagnostics": [str(diagnostic) for diagnostic in result.diagnostics]}
+    if op == "run" and result.ok:
+        with tempfile.NamedTemporaryFile("w", suffix=".vms", delete=False) as f:
+            f.write(result.code)
+        try:
+            completed_process = subprocess.run(["vms", f.name], input=request.get("stdin", ""), capture_output=True, text=True)
+        finally:
+            os.unlink(f.name)
+        response.update(stdout=completed_process.stdout, stderr=completed_process.stderr, returncode=completed_process.returncode)
+    return response
+
+def serve(socket_path: Optional[str] = None):
+    """
+    Keep the compiler warm and answer requests on a Unix socket until interrupted.
+    """
+    import socketserver
+    from tox.parsing._compiler import compile_source
+
+    socket_path = socket_path or default_socket_path()
+    if os.path.exists(socket_path):
+        try:
+            request(socket_path, {"op": "ping"})
+        except OSError:
+            os.unlink(socket_path)  # Left behind by a server that did not shut down cleanly
+        else:
+            print(f"{COLOR_RED}[ERROR]{RESET_COLOR} A compile server is already listening on {socket_path}")
+            sys.exit(1)
+
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))   # Still remove the socket on `kill`
+    compile_source("func main() {}")    # Build the tables and warm every code path before the first request
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for line in self.rfile:
+                try:
+                    response = handle_request(json.loads(line))
+                except Exception as e:
+                    response = {"ok": False, "diagnostics": [f"{COLOR_RED}Server Error:{RESET_COLOR} {e}\n"]}
+                self.wfile.write(json.dumps(response).encode() + b"\n")
+                self.wfile.flush()
+
+    class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+    with Server(socket_path, Handler) as server:
+        print(f"{COLOR_BLUE}[INFO]{RESET_COLOR} Compile server listening on {socket_path}", flush=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.unlink(socket_path)
+
+def request(socket_path: Optional[str], payload: Dict) -> Dict:
+    """
+    Send one request to the compile server and wait for its response.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(socket_path or default_socket_path())
+        client.sendall(json.dumps(payload).encode() + b"\n")
+        with client.makefile("rb") as f:
+            line = f.readline()
+    if not line:
+        raise ConnectionError("The compile server closed the connection")
+    return json.loads(line)
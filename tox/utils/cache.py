@@ -0,0 +1,216 @@
+from typing import Dict, List, Optional, Tuple
+
+import os
+import json
+import hashlib
+import tempfile
+
+DEFAULT_MAX_SIZE = 64 * 1024 * 1024     # Bytes kept on disk before the least recently used entries are evicted
+EVICT_TO = 0.9      # Fraction of the limit an eviction brings the cache down to, so the next one is a while away
+EVENTS = ["hits", "misses", "functions_compiled", "functions_reused"]    # Counted in the cache directory
+SIZE_ESTIMATE = "size_estimate"     # Bytes written since the cache size was last measured, plus that size
+
+# Sources the generated code and diagnostics depend on, relative to the tox package. The CLI,
+# the server and the cache itself are left out, so editing them keeps the cached programs.
+COMPILER_SOURCES = ["lexing", "parsing", "semantics", "codegen", "utils/errors.py", "utils/source.py", "utils/colors.py"]
+
+_compiler_version = None
+
+def compiler_version() -> str:
+    """
+    Fingerprint of the compiler sources, so that any change to the compiler invalidates the cache.
+
+    Only the name, size and modification time of each file are hashed, which takes a few stat
+    calls instead of reading the whole compiler on every cold start.
+    """
+    global _compiler_version
+    if _compiler_version is None:
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        digest = hashlib.sha256()
+        for source in COMPILER_SOURCES:
+            path = os.path.join(root, source)
+            files = sorted(os.path.join(path, file) for file in os.listdir(path) if file.endswith(".py")) if os.path.isdir(path) else [path]
+            for file in files:
+                stat = os.stat(file)
+                digest.update(f"{os.path.relpath(file, root)}\0{stat.st_size}\0{stat.st_mtime_ns}\0".encode())
+        _compiler_version = digest.hexdigest()
+    return _compiler_version
+
+def default_cache_dir() -> str:
+    """
+    Return the directory the compilation cache lives in.
+    """
+    return os.environ.get("TOX_CACHE_DIR") or os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "tox")
+
+class CompilationCache:
+    """
+    Class that stores compiled programs on disk, addressed by the hash of everything that determines the output.
+
+    Entries are written atomically, so concurrent builds never see a partial entry, and the
+    least recently used entries are evicted once the cache grows past `max_size` bytes.
+
+    Counters, such as the hits and misses and the running estimate of the cache size, are small files
+    holding one integer. Each update replaces the file atomically. Concurrent builds may lose an update
+    now and then, which only makes the statistics slightly low and the size estimate is corrected the
+    next time the cache is measured.
+    """
+    def __init__(self, directory: Optional[str] = None, max_size: Optional[int] = None):
+        self.directory = directory or default_cache_dir()
+        self.max_size = max_size if max_size is not None else int(os.environ.get("TOX_CACHE_SIZE", DEFAULT_MAX_SIZE))
+
+    def key(self, source: str, options) -> str:
+        digest = hashlib.sha256()
+        for part in (compiler_version(), options.cache_key(), source):
+            digest.update(part.encode())
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + ".json")
+
+    def get(self, key: str) -> Optional[Tuple[str, List[str]]]:
+        """
+        Return the code and diagnostics stored under `key`, or None on a miss.
+        """
+        path = self.path(key)
+        try:
+            with open(path, "r") as f:
+                entry = json.load(f)
+            os.utime(path)  # Mark the entry as recently used
+        except (OSError, ValueError):
+            self.count("misses")
+            return None
+        self.count("hits")
+        return entry["code"], entry["diagnostics"]
+
+    def put(self, key: str, code: str, diagnostics: List[str]):
+        self.write_entry(self.path(key), {"code": code, "diagnostics": diagnostics})
+
+    def record_path(self, filename: str, options) -> str:
+        key = hashlib.sha256(f"{os.path.abspath(filename)}\0{options.cache_key()}".encode()).hexdigest()
+        return os.path.join(self.directory, "incremental", key + ".json")
+
+    def get_record(self, filename: str, options) -> Optional[Dict]:
+        """
+        Return the incremental build record of the last build of `filename`, if any.
+        """
+        path = self.record_path(filename, options)
+        try:
+            with open(path, "r") as f:
+                record = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return record if record.get("compiler") == compiler_version() else None
+
+    def put_record(self, filename: str, options, record: Dict):
+        self.write_entry(self.record_path(filename, options), dict(record, compiler=compiler_version()))
+
+    def write_entry(self, path: str, data: Dict):
+        """
+        Write an entry, then evict entries if the estimated size of the cache is past `max_size`.
+
+        The whole cache is only walked when the estimate goes past the limit, or when there is no estimate yet.
+        """
+        size = self.write(path, data)
+        if size is None:
+            return
+        estimate = self.read(SIZE_ESTIMATE)
+        if estimate is not None and estimate + size <= self.max_size:
+            self.write(self.counter_path(SIZE_ESTIMATE), estimate + size)
+        else:
+            self.write(self.counter_path(SIZE_ESTIMATE), self.evict())
+
+    def write(self, path: str, data) -> Optional[int]:
+        """
+        Atomically write a JSON file into the cache and return its size.
+        """
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f)
+                size = f.tell()
+            os.replace(tmp, path)
+        except OSError:
+            return None     # A cache that cannot be written to is just a cache that always misses
+        return size
+
+    def entries(self) -> List[Tuple[float, int, str]]:
+        """
+        Return (last use, size, path) of every entry.
+        """
+        entries = []
+        for directory, _, files in os.walk(self.directory):
+            for file in files:
+                if file.endswith(".json"):
+                    path = os.path.join(directory, file)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def evict(self) -> int:
+        """
+        Remove the least recently used entries until the cache fits in EVICT_TO of `max_size` bytes, and return its size.
+        """
+        entries = self.entries()
+        size = sum(entry[1] for entry in entries) + self.counters_size()
+        for _, entry_size, path in sorted(entries):
+            if size <= self.max_size * EVICT_TO:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+            size -= entry_size
+        return size
+
+    def counter_path(self, counter: str) -> str:
+        return os.path.join(self.directory, counter)
+
+    def read(self, counter: str) -> Optional[int]:
+        """
+        Return the value of a counter, or None if it was never written.
+        """
+        try:
+            with open(self.counter_path(counter), "r") as f:
+                value = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return value if isinstance(value, int) else None
+
+    def count(self, event: str, count: int = 1):
+        """
+        Count an event, e.g. a hit or a miss.
+        """
+        if count == 0:
+            return
+        self.write(self.counter_path(event), (self.read(event) or 0) + count)
+
+    def counters_size(self) -> int:
+        size = 0
+        for counter in EVENTS + [SIZE_ESTIMATE]:
+            try:
+                size += os.path.getsize(self.counter_path(counter))
+            except OSError:
+                pass
+        return size
+
+    def stats(self) -> Dict[str, int]:
+        stats = {event: self.read(event) or 0 for event in EVENTS}
+        entries = self.entries()
+        stats["entries"] = len(entries)
+        stats["size"] = sum(entry[1] for entry in entries) + self.counters_size()
+        return stats
+
+    def clear(self):
+        for _, _, path in self.entries():
+            os.unlink(path)
+        for counter in EVENTS + [SIZE_ESTIMATE]:
+            try:
+                os.unlink(self.counter_path(counter))
+            except OSError:
+                pass
@@ -1,23 +1,101 @@
-from typing import List
+from typing import List, Optional
+from dataclasses import dataclass
+from contextvars import ContextVar
 
 import sys
 
-import tox
+from tox.utils.colors import *
+from tox.utils.source import Source
+from tox.codegen._program import Instruction, Code
+
+class CompilationError(Exception):
+    """
+    Raised to abort a compilation once its errors have been reported.
+    """
+
+class SemanticError(CompilationError, SyntaxError):
+    """
+    Raised by a grammar rule once its error has been reported. PLY takes it for a syntax
+    error, drops the rule and resumes at the enclosing statement, function or global declaration.
+
+    Rules that close a block (if, match, loops) only report their errors: PLY would resume
+    inside the block they close.
+    """
+
+@dataclass
+class Diagnostic:
+    """
+    Class that represents an error, warning or note reported while compiling.
+    """
+    kind: str
+    message: str
+    line: Optional[int] = None
+    column: Optional[int] = None
+
+    @property
+    def is_error(self) -> bool:
+        return self.kind.endswith("Error")
+
+    def __str__(self) -> str:
+        if self.kind == "Compiler Note":
+            return f"{COLOR_BLUE}{self.kind}:{RESET_COLOR} {self.message}\n"
+        color = COLOR_RED if self.is_error else COLOR_YELLOW
+        if self.line is None:
+            return f"{color}{self.kind}:{RESET_COLOR} {self.message}\n"
+        return f"{color}{self.kind}:{COLOR_YELLOW}{self.line}:{COLOR_GREEN}{self.column}:{RESET_COLOR} {self.message}\n"
+
+class Diagnostics(list):
+    """
+    Class that collects the diagnostics of a compilation.
+
+    Compilation goes on after an error so that a single run reports all of them. Once
+    `max_errors` errors have been collected (0 means no limit) the next one stops it.
+    """
+    def __init__(self, max_errors: int = 0):
+        super().__init__()
+        self.max_errors = max_errors
+        self.error_count = 0
+
+    def add(self, diagnostic: Diagnostic):
+        if diagnostic.is_error:
+            if self.max_errors and self.error_count >= self.max_errors:
+                self.append(Diagnostic("Compiler Note", f"Stopping after {self.error_count} errors"))
+                raise CompilationError()
+            self.error_count += 1
+        self.append(diagnostic)
+
+# Diagnostics of the compilation running in the current thread. Outside of a compilation they go straight to stderr.
+diagnostics_sink: ContextVar[Optional[Diagnostics]] = ContextVar("diagnostics_sink", default=None)
+
+def report(diagnostic: Diagnostic):
+    """
+    Record a diagnostic in the current compilation.
+    """
+    sink = diagnostics_sink.get()
+    if sink is None:
+        sys.stderr.write(str(diagnostic))
+    else:
+        sink.add(diagnostic)
+
+def _source(input) -> Source:
+    return input if isinstance(input, Source) else Source(input)
+
+def _lexer_source(lexer) -> Source:
+    source = getattr(lexer, "source", None)    # The PLY reference lexer has none
+    return source if source is not None else Source(lexer.lexdata)
 
 def find_column(input, token):
     """
     Compute the column of a given token.
     """
-    last_cr = input.rfind('\n', 0, token.lexpos) + 1
-    return (token.lexpos - last_cr) + 1
+    return _source(input).column(token.lexpos)
 
 def find_column_comp(input, token, n):
     """
     Compute the column of a given token.
     """
     try:
-        last_cr = input.rfind('\n', 0, token.lexpos(n)) + 1
-        return (token.lexpos(n) - last_cr) + 1
+        return _source(input).column(token.lexpos(n))
     except Exception:
         return -1
 
@@ -25,19 +103,19 @@ def lex_error(p, msg: str):
     """
     Report a lex error.
     """
-    sys.stderr.write(f"{tox.COLOR_RED}Lex Error:{tox.COLOR_YELLOW}{p.lineno}:{tox.COLOR_GREEN}{find_column(p.lexer.lexdata, p)}:{tox.RESET_COLOR} {msg}\n")
+    report(Diagnostic("Lex Error", msg, p.lineno, find_column(_lexer_source(p.lexer), p)))
 
 def syntax_error(p, msg: str):
     """
     Report a syntax error.
     """
-    sys.stderr.write(f"{tox.COLOR_RED}Syntax Error:{tox.COLOR_YELLOW}{p.lineno}:{tox.COLOR_GREEN}{find_column(p.lexer.lexdata, p)}:{tox.RESET_COLOR} {msg}\n")
+    report(Diagnostic("Syntax Error", msg, p.lineno, find_column(_lexer_source(p.lexer), p)))
 
 def compiler_error(p, n: int, msg: str):
     """
     Report a compiler error.
     """
-    sys.stderr.write(f"{tox.COLOR_RED}Compiler Error:{tox.COLOR_YELLOW}{p.lineno(n)}:{tox.COLOR_GREEN}{find_column_comp(p.parser.input, p, n)}:{tox.RESET_COLOR} {msg}\n")
+    report(Diagnostic("Compiler Error", msg, p.lineno(n), find_column_comp(p.parser.source, p, n)))
 
 def compiler_warning(p, n: int, msg: str):
     """
@@ -47,16 +125,16 @@ def compiler_warning(p, n: int, msg: str):
         line = p.lineno(n)
     except IndexError:
         line = n
-    sys.stderr.write(f"{tox.COLOR_YELLOW}Compiler Warning:{tox.COLOR_YELLOW}{n}:{tox.COLOR_GREEN}{find_column_comp(p.parser.input, p, n)}:{tox.RESET_COLOR} {msg}\n")
+    report(Diagnostic("Compiler Warning", msg, line, find_column_comp(p.parser.source, p, n)))
 
 def compiler_note(msg):
     """
     Report a compiler note.
     """
-    sys.stderr.write(f"{tox.COLOR_BLUE}Compiler Note:{tox.RESET_COLOR} {msg}\n")
+    report(Diagnostic("Compiler Note", msg))
 
-def std_message(msg: List[str]):
+def std_message(msg: List[str]) -> Code:
     """
-    Helper function to print an operation message.
+    Helper function to build a code fragment out of textual instructions.
     """
-    return "\n".join(msg) + "\n"
\ No newline at end of file
+    return Code([Instruction.parse(line) for line in msg])
\ No newline at end of file
@@ -0,0 +1,47 @@
+from typing import List, Optional
+from itertools import accumulate
+
+import bisect
+
+class Source:
+    """
+    Class that holds the text being compiled and maps positions in it to lines and columns.
+
+    The table of line starts is only built on the first lookup, so a compilation without
+    diagnostics never pays for it. Lookups are a binary search in that table.
+    """
+    def __init__(self, text: str, filename: str = "<string>"):
+        self.text = text
+        self.filename = filename
+        self._starts: Optional[List[int]] = None
+
+    @property
+    def starts(self) -> List[int]:
+        """
+        Position of the first character of every line.
+        """
+        if self._starts is None:
+            self._starts = list(accumulate((len(line) + 1 for line in self.text.split("\n")), initial=0))[:-1]
+        return self._starts
+
+    def line_of(self, pos: int) -> int:
+        """
+        Line of a position, starting at 1.
+        """
+        return bisect.bisect_right(self.starts, pos)
+
+    def column(self, pos: int) -> int:
+        """
+        Column of a position, starting at 1.
+        """
+        return pos - self.starts[self.line_of(pos) - 1] + 1
+
+    def line(self, n: int) -> str:
+        """
+        Text of line `n`, starting at 1, without its line break. Lines outside the text are empty.
+        """
+        starts = self.starts
+        if not 1 <= n <= len(starts):
+            return ""
+        end = starts[n] - 1 if n < len(starts) else len(self.text)
+        return self.text[starts[n-1]:end].rstrip("\r")